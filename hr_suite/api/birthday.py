@@ -0,0 +1,112 @@
+import calendar
+
+import frappe
+from frappe.utils import today, add_days, getdate
+
+# Birthday lookup
+#
+# Employee.birthday_key stores the month and day of birth as MMDD (e.g. 1225)
+# in an indexed column, so "birthdays between two dates" becomes an index range
+# scan instead of a date function evaluated on every row.
+
+def get_birthday_key(date):
+    date = getdate(date)
+    return date.month * 100 + date.day
+
+def set_birthday_key(doc, method=None):
+    """
+    Triggered on Employee validate
+    """
+    doc.birthday_key = get_birthday_key(doc.date_of_birth) if doc.date_of_birth else None
+
+def backfill_birthday_keys():
+    """Set birthday_key on every Employee from their date of birth"""
+    frappe.db.sql("""
+        UPDATE `tabEmployee`
+        SET birthday_key = MONTH(date_of_birth) * 100 + DAY(date_of_birth)
+        WHERE date_of_birth IS NOT NULL
+    """)
+
+def get_birthday_key_ranges(from_date, days):
+    """
+    Inclusive birthday_key ranges covering from_date .. from_date + days
+
+    Feb 29 birthdays are observed on Feb 28 in non-leap years, and windows that
+    cross the new year are split in two.
+    """
+    from_date = getdate(from_date)
+    if days >= 365:
+        return [(101, 1231)]
+
+    to_date = getdate(add_days(from_date, days))
+    start, end = get_birthday_key(from_date), get_birthday_key(to_date)
+
+    if end == 228 and not calendar.isleap(to_date.year):
+        end = 229
+
+    if start <= end:
+        return [(start, end)]
+
+    return [(start, 1231), (101, end)]
+
+def get_next_birthday(date_of_birth, from_date):
+    """
+    Next occurrence of a birthday on or after from_date
+    """
+    date_of_birth = getdate(date_of_birth)
+
+    for year in (from_date.year, from_date.year + 1):
+        try:
+            birthday = date_of_birth.replace(year=year)
+        except ValueError:
+            birthday = date_of_birth.replace(year=year, day=28)
+
+        if birthday >= from_date:
+            return birthday
+
+    return birthday
+
+def get_birthday_condition(from_date, days, params):
+    """
+    SQL condition on birthday_key for the window, filling its values into params
+    """
+    conditions = []
+    for i, (start, end) in enumerate(get_birthday_key_ranges(from_date, days)):
+        params[f"birthday_start_{i}"] = start
+        params[f"birthday_end_{i}"] = end
+        conditions.append(f"birthday_key BETWEEN %(birthday_start_{i})s AND %(birthday_end_{i})s")
+
+    return "({0})".format(" OR ".join(conditions))
+
+def get_birthdays(from_date=None, days=0, fields=None, employees=None):
+    """
+    Active employees with a birthday within `days` of from_date, optionally
+    only among `employees`
+
+    Each row carries `birthday_date` and `days_until`, sorted by the latter.
+    """
+    from_date = getdate(from_date or today())
+    fields = fields or ["name", "employee_name", "department"]
+    params = {}
+    condition = get_birthday_condition(from_date, days, params)
+
+    if employees is not None:
+        if not employees:
+            return []
+        params["employees"] = tuple(employees)
+        condition += " AND name IN %(employees)s"
+
+    employees = frappe.db.sql("""
+        SELECT {fields}, date_of_birth
+        FROM `tabEmployee`
+        WHERE status = 'Active'
+        AND {condition}
+    """.format(fields=", ".join(f"`{field}`" for field in fields), condition=condition), params, as_dict=True)
+
+    for emp in employees:
+        emp.birthday_date = get_next_birthday(emp.date_of_birth, from_date)
+        emp.days_until = (emp.birthday_date - from_date).days
+
+    employees.sort(key=lambda emp: emp.days_until)
+
+    return employees
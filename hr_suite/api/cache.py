@@ -0,0 +1,88 @@
+import time
+
+import frappe
+from frappe.utils import today, cint
+
+# Dashboard stats cache
+#
+# Each section of the stats payload is cached in the site's Redis cache on its
+# own key, so a write only drops the sections that read the changed table.
+# Keys carry the date so counters roll over at midnight without a flush.
+
+DEFAULT_TTL = 300
+LOCK_TIMEOUT = 10
+LOCK_POLL_INTERVAL = 0.05
+
+# doctype -> stats sections that read it
+SECTIONS_BY_DOCTYPE = {
+    "Employee": ("employee",),
+    "Leave Application": ("leave",),
+    "Attendance": ("attendance",),
+}
+
+def get_ttl():
+    """Cache TTL in seconds, configurable through `hr_suite_stats_cache_ttl` in site config"""
+    return cint(frappe.conf.get("hr_suite_stats_cache_ttl")) or DEFAULT_TTL
+
+def get_section_key(section):
+    return f"hr_suite:stats:{section}:{today()}"
+
+def get_cached_section(section, generator):
+    """
+    Return a cached section, computing it with `generator` on a miss
+
+    Only one worker recomputes an expired section: the others wait on the
+    lock for the fresh value instead of all hitting the database at once.
+    """
+    cache = frappe.cache()
+    key = get_section_key(section)
+
+    value = cache.get_value(key)
+    if value is not None:
+        return value
+
+    lock_key = cache.make_key(f"{key}:lock")
+    if cache.set(lock_key, 1, nx=True, ex=LOCK_TIMEOUT):
+        try:
+            value = generator()
+            cache.set_value(key, value, expires_in_sec=get_ttl())
+        finally:
+            cache.delete(lock_key)
+        return value
+
+    deadline = time.monotonic() + LOCK_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(LOCK_POLL_INTERVAL)
+        value = cache.get_value(key)
+        if value is not None:
+            return value
+
+    # The lock holder died or is too slow, compute without caching
+    return generator()
+
+def invalidate_sections(sections):
+    """Drop cached sections now and again once the transaction commits"""
+    keys = [get_section_key(section) for section in sections]
+
+    def delete():
+        frappe.cache().delete_value(keys)
+
+    delete()
+
+    # A reader may repopulate from pre-commit data in between
+    after_commit = getattr(frappe.db, "after_commit", None)
+    if after_commit is not None:
+        after_commit.add(delete)
+
+def invalidate_stats_cache(doc, method=None):
+    """
+    Triggered on changes to Employee, Leave Application and Attendance
+    """
+    sections = SECTIONS_BY_DOCTYPE.get(doc.doctype)
+    if sections:
+        invalidate_sections(sections)
+
+def clear_stats_cache():
+    """Drop every cached section"""
+    sections = {section for sections in SECTIONS_BY_DOCTYPE.values() for section in sections}
+    invalidate_sections(sections)
@@ -0,0 +1,208 @@
+import csv
+import os
+
+import frappe
+from frappe import _
+from frappe.utils import today, add_days, get_first_day, get_last_day, getdate, now_datetime
+from hr_suite.api.performance import instrument
+
+# Dataset export
+#
+# Exports run as background jobs. Rows are streamed from an unbuffered cursor
+# straight into a file under the site's private files, a chunk at a time, so
+# memory stays flat however many rows the dataset has. The user is notified
+# once the File is ready.
+
+CHUNK_SIZE = 1000
+FORMATS = ("csv", "xlsx")
+
+def get_datasets():
+    """Exportable datasets as name -> (doctype read, columns, query builder)"""
+    return {
+        "new_joinings": ("Employee", ["Employee", "Employee Name", "Designation", "Department", "Date of Joining"], new_joinings_query),
+        "probation_ending": ("Employee", ["Employee", "Employee Name", "Designation", "Department", "Final Confirmation Date"], probation_ending_query),
+        "department_wise_count": ("Employee", ["Department", "Count"], department_wise_count_query),
+        "attendance_summary": ("Attendance", ["Status", "Count"], attendance_summary_query),
+        "attendance": ("Attendance", ["Attendance", "Employee", "Employee Name", "Department", "Attendance Date", "Status"], attendance_query)
+    }
+
+def new_joinings_query(from_date=None, to_date=None):
+    return """
+        SELECT name, employee_name, designation, department, date_of_joining
+        FROM `tabEmployee`
+        WHERE status = 'Active'
+        AND date_of_joining BETWEEN %(from_date)s AND %(to_date)s
+        ORDER BY date_of_joining DESC
+    """, {
+        "from_date": getdate(from_date or get_first_day(today())),
+        "to_date": getdate(to_date or get_last_day(today()))
+    }
+
+def probation_ending_query(from_date=None, to_date=None):
+    return """
+        SELECT name, employee_name, designation, department, final_confirmation_date
+        FROM `tabEmployee`
+        WHERE status = 'Active'
+        AND final_confirmation_date BETWEEN %(from_date)s AND %(to_date)s
+        ORDER BY final_confirmation_date ASC
+    """, {
+        "from_date": getdate(from_date or today()),
+        "to_date": getdate(to_date or add_days(today(), 30))
+    }
+
+def department_wise_count_query(from_date=None, to_date=None):
+    return """
+        SELECT department, COUNT(*) AS count
+        FROM `tabEmployee`
+        WHERE status = 'Active'
+        GROUP BY department
+        ORDER BY count DESC
+    """, {}
+
+def attendance_summary_query(from_date=None, to_date=None):
+    return """
+        SELECT status, COUNT(*) AS count
+        FROM `tabAttendance`
+        WHERE docstatus = 1
+        AND attendance_date BETWEEN %(from_date)s AND %(to_date)s
+        GROUP BY status
+    """, {
+        "from_date": getdate(from_date or add_days(today(), -30)),
+        "to_date": getdate(to_date or today())
+    }
+
+def attendance_query(from_date=None, to_date=None):
+    return """
+        SELECT name, employee, employee_name, department, attendance_date, status
+        FROM `tabAttendance`
+        WHERE docstatus = 1
+        AND attendance_date BETWEEN %(from_date)s AND %(to_date)s
+        ORDER BY attendance_date ASC, employee ASC
+    """, {
+        "from_date": getdate(from_date or add_days(today(), -30)),
+        "to_date": getdate(to_date or today())
+    }
+
+@frappe.whitelist()
+@instrument
+def export_dataset(dataset, file_format="csv", from_date=None, to_date=None):
+    """
+    Queue an export of a dashboard dataset to CSV or XLSX
+    """
+    datasets = get_datasets()
+    if dataset not in datasets:
+        frappe.throw(_("Unknown dataset {0}").format(dataset))
+
+    if not frappe.has_permission(datasets[dataset][0], "read"):
+        frappe.throw(_("Not permitted"), frappe.PermissionError)
+
+    if file_format not in FORMATS:
+        frappe.throw(_("Format must be one of {0}").format(", ".join(FORMATS)))
+
+    frappe.enqueue(
+        "hr_suite.api.export.run_export",
+        queue="long",
+        timeout=3600,
+        dataset=dataset,
+        file_format=file_format,
+        from_date=from_date,
+        to_date=to_date,
+        user=frappe.session.user
+    )
+
+    return {"dataset": dataset, "file_format": file_format, "queued": True}
+
+@instrument
+def run_export(dataset, file_format, from_date=None, to_date=None, user=None):
+    """Background job: write the dataset to a private File and notify the user"""
+    _doctype, columns, query_builder = get_datasets()[dataset]
+    query, params = query_builder(from_date, to_date)
+
+    file_name = f"{dataset}-{now_datetime().strftime('%Y%m%d-%H%M%S')}-{frappe.generate_hash(length=6)}.{file_format}"
+    path = frappe.get_site_path("private", "files", file_name)
+
+    writer = write_xlsx if file_format == "xlsx" else write_csv
+    row_count = writer(path, columns, iter_rows(query, params))
+
+    file_doc = frappe.get_doc({
+        "doctype": "File",
+        "file_name": file_name,
+        "file_url": f"/private/files/{file_name}",
+        "is_private": 1,
+        "file_size": os.path.getsize(path)
+    }).insert(ignore_permissions=True)
+    frappe.db.commit()
+
+    notify_export_ready(user, dataset, file_doc, row_count)
+
+    return file_doc.name
+
+def iter_rows(query, params):
+    """
+    Yield result rows one by one, from an unbuffered cursor when available
+    """
+    unbuffered_cursor = getattr(frappe.db, "unbuffered_cursor", None)
+    if unbuffered_cursor is None:
+        yield from frappe.db.sql(query, params)
+        return
+
+    with unbuffered_cursor():
+        yield from frappe.db.sql(query, params, as_iterator=True)
+
+def write_csv(path, columns, rows):
+    """Write rows to a CSV file in chunks, returning the row count"""
+    count = 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= CHUNK_SIZE:
+                writer.writerows(chunk)
+                count += len(chunk)
+                chunk = []
+
+        writer.writerows(chunk)
+        count += len(chunk)
+
+    return count
+
+def write_xlsx(path, columns, rows):
+    """Write rows to an XLSX file with a write-only workbook, returning the row count"""
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(columns)
+
+    count = 0
+    for row in rows:
+        sheet.append(list(row))
+        count += 1
+
+    workbook.save(path)
+    return count
+
+def notify_export_ready(user, dataset, file_doc, row_count):
+    if not user:
+        return
+
+    subject = _("Export of {0} is ready ({1} rows)").format(dataset, row_count)
+
+    frappe.get_doc({
+        "doctype": "Notification Log",
+        "for_user": user,
+        "type": "Alert",
+        "subject": subject,
+        "document_type": "File",
+        "document_name": file_doc.name
+    }).insert(ignore_permissions=True)
+    frappe.db.commit()
+
+    frappe.publish_realtime("hr_suite_export_ready", {
+        "dataset": dataset,
+        "file_url": file_doc.file_url,
+        "rows": row_count
+    }, user=user)
@@ -0,0 +1,187 @@
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+import frappe
+from frappe import _
+from frappe.utils import now
+from hr_suite.api.performance import instrument
+
+# Group-wide stats
+#
+# Computes the HR Suite stats of every site on the bench in a process pool,
+# each worker initialising and connecting to its own site, and merges them
+# into one report with per-site breakdowns. The merged report is cached in a
+# bench-level JSON file under sites/, which the whitelisted API reads; a stale
+# report is refreshed by a background job instead of within the request.
+
+CACHE_FILE = "hr_suite_group_stats.json"
+DEFAULT_TTL = 900
+MAX_PROCESSES = 8
+
+# Metrics summed across sites
+SCALAR_METRICS = [
+    "total_employees",
+    "active_employees",
+    "on_leave_today",
+    "present_today",
+    "pending_leave_applications"
+]
+# List metrics of which only the count is summed
+COUNT_METRICS = [
+    "new_joinings_this_month",
+    "upcoming_birthdays",
+    "probation_ending"
+]
+
+def get_ttl():
+    return frappe.conf.get("hr_suite_group_stats_ttl") or DEFAULT_TTL
+
+def get_cache_path(sites_path=None):
+    return os.path.join(sites_path or frappe.local.sites_path, CACHE_FILE)
+
+def collect_site_stats(site, sites_path):
+    """
+    Pool worker: stats of one site, as plain JSON data
+    """
+    start = time.monotonic()
+    try:
+        frappe.init(site=site, sites_path=sites_path)
+        frappe.connect()
+        frappe.set_user("Administrator")
+
+        if "hr_suite" not in frappe.get_installed_apps():
+            return {"site": site, "skipped": "hr_suite not installed"}
+
+        from hr_suite.api.metrics import get_metrics
+        from hr_suite.hr_suite_dashboard.doctype.hr_suite_counter.hr_suite_counter import DEPARTMENT_HEADCOUNT, get_counters
+
+        metrics = get_metrics(SCALAR_METRICS + COUNT_METRICS + ["leave_type_usage", "attendance_summary"])
+        stats = {name: metrics[name] for name in SCALAR_METRICS}
+        stats.update({name: metrics[name]["count"] for name in COUNT_METRICS})
+        stats["leave_type_usage"] = metrics["leave_type_usage"]
+        stats["attendance_summary"] = metrics["attendance_summary"]
+        stats["department_wise_count"] = {
+            department or "": count for department, count in get_counters(DEPARTMENT_HEADCOUNT).items() if count
+        }
+
+        return json.loads(frappe.as_json({
+            "site": site,
+            "stats": stats,
+            "elapsed": round(time.monotonic() - start, 3)
+        }))
+    except Exception as e:
+        return {"site": site, "error": str(e)}
+    finally:
+        frappe.destroy()
+
+def collect_group_stats(sites=None, sites_path=None, processes=None):
+    """
+    Stats of many sites computed in parallel, merged into one report
+    """
+    sites_path = sites_path or frappe.local.sites_path
+    sites = sites or frappe.utils.get_sites(sites_path)
+    processes = min(processes or MAX_PROCESSES, len(sites)) or 1
+
+    # Spawned workers start without the parent's connections
+    with ProcessPoolExecutor(max_workers=processes, mp_context=get_context("spawn")) as executor:
+        results = list(executor.map(collect_site_stats, sites, [sites_path] * len(sites)))
+
+    report = merge_site_stats(results)
+    write_cache(report, sites_path)
+    return report
+
+def merge_site_stats(results):
+    """Consolidated totals plus the per-site breakdown"""
+    totals = {name: 0 for name in SCALAR_METRICS + COUNT_METRICS}
+    departments = {}
+    leave_types = {}
+    attendance = {}
+
+    for result in results:
+        stats = result.get("stats")
+        if not stats:
+            continue
+
+        for name in totals:
+            totals[name] += stats.get(name) or 0
+
+        for department, count in stats["department_wise_count"].items():
+            departments[department] = departments.get(department, 0) + count
+
+        for row in stats["leave_type_usage"]:
+            usage = leave_types.setdefault(row["leave_type"], {"leave_type": row["leave_type"], "applications": 0, "total_days": 0})
+            usage["applications"] += row.get("applications") or 0
+            usage["total_days"] += row.get("total_days") or 0
+
+        for row in stats["attendance_summary"]:
+            attendance[row["status"]] = attendance.get(row["status"], 0) + (row.get("count") or 0)
+
+    totals["department_wise_count"] = sorted(
+        ({"department": department or None, "count": count} for department, count in departments.items()),
+        key=lambda row: row["count"], reverse=True
+    )
+    totals["leave_type_usage"] = sorted(leave_types.values(), key=lambda row: row["total_days"], reverse=True)
+    totals["attendance_summary"] = [{"status": status, "count": count} for status, count in sorted(attendance.items())]
+
+    return {
+        "generated_on": now(),
+        "sites": len([result for result in results if result.get("stats")]),
+        "totals": totals,
+        "by_site": {result["site"]: result for result in results}
+    }
+
+def write_cache(report, sites_path=None):
+    path = get_cache_path(sites_path)
+    with open(path + ".tmp", "w") as f:
+        json.dump(report, f, default=str)
+    os.replace(path + ".tmp", path)
+
+def read_cache(sites_path=None, ttl=None):
+    """The cached report and whether it is older than ttl seconds, or (None, True)"""
+    path = get_cache_path(sites_path)
+    if not os.path.exists(path):
+        return None, True
+
+    with open(path) as f:
+        report = json.load(f)
+
+    age = time.time() - os.path.getmtime(path)
+    return report, age > (ttl or get_ttl())
+
+def refresh_group_stats():
+    """Background job: recompute the cached group report"""
+    collect_group_stats(processes=frappe.conf.get("hr_suite_group_stats_processes"))
+
+@frappe.whitelist()
+@instrument
+def get_group_stats(refresh=0):
+    """
+    Get the group-wide HR stats across all sites of the bench
+
+    Served from the cached report; a stale or missing report is recomputed in
+    the background and the response says so with `refreshing`.
+    """
+    frappe.only_for("System Manager")
+
+    # The report holds every site's data, so only the sites set up as the group's view may serve it
+    if not frappe.conf.get("hr_suite_group_stats"):
+        frappe.throw(_("Group stats are not enabled on this site"), frappe.PermissionError)
+
+    report, stale = read_cache()
+    refreshing = bool(stale or frappe.utils.cint(refresh))
+    if refreshing:
+        frappe.enqueue(
+            "hr_suite.api.group_stats.refresh_group_stats",
+            queue="long",
+            timeout=1800,
+            job_id="hr_suite_group_stats",
+            deduplicate=True
+        )
+
+    if not report:
+        return {"refreshing": True, "message": _("Group stats are being computed, try again shortly")}
+
+    return {**report, "refreshing": refreshing}
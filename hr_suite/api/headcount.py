@@ -0,0 +1,429 @@
+import json
+from bisect import bisect_left, bisect_right, insort
+from datetime import date as datetime_date
+
+import frappe
+from frappe import _
+from frappe.utils import getdate, today, add_months, add_days, get_last_day, cint, flt
+from hr_suite.api.performance import instrument
+
+# Headcount history
+#
+# Every employee is a joining date and, once relieved, a relieving date. Per
+# company and department the two are kept as sorted arrays of day ordinals, so
+# the headcount at the end of any date is two bisects (joined on or before it,
+# minus relieved on or before it) and hires or exits in a period are the
+# difference of two bisects on one array. Each group's arrays are cached in
+# their own Redis key, listed in an index set, next to a hash of the entry
+# each employee was counted with. Employee changes are queued after commit
+# and applied by whoever holds the write lock: the employee's old dates are
+# removed and the new ones inserted, rewriting only the groups they touch.
+# A missing index or group key is a miss, and the history is rebuilt.
+# Employees who left without a relieving date count as leaving on the date
+# their record was last modified.
+
+GROUPS_KEY = "hr_suite:headcount:groups"
+GROUP_KEY = "hr_suite:headcount:group"
+EMPLOYEES_KEY = "hr_suite:headcount:employees"
+PENDING_KEY = "hr_suite:headcount:pending"
+LOCK_KEY = "hr_suite:headcount:lock"
+VERSION_KEY = "hr_suite:headcount:version"
+CACHE_TTL = 86400
+LOCK_TIMEOUT = 10
+MAX_PERIODS = 1000
+
+PERIODICITIES = {
+    "Daily": None,
+    "Weekly": None,
+    "Monthly": 1,
+    "Quarterly": 3,
+    "Yearly": 12
+}
+
+def get_entry(row):
+    """(company, department), joining ordinal, relieving ordinal or None of an employee row"""
+    if not row.date_of_joining:
+        return None
+
+    relieving_date = row.relieving_date
+    if not relieving_date and row.status == "Left":
+        relieving_date = row.last_modified
+
+    return (
+        (row.company or "", row.department or ""),
+        getdate(row.date_of_joining).toordinal(),
+        getdate(relieving_date).toordinal() if relieving_date else None
+    )
+
+def get_employee_rows(employees=None):
+    condition = "WHERE name IN %(employees)s" if employees else ""
+    return frappe.db.sql(f"""
+        SELECT name, company, department, date_of_joining, relieving_date, status,
+            DATE(modified) AS last_modified
+        FROM `tabEmployee`
+        {condition}
+    """, {"employees": tuple(employees or ())}, as_dict=True)
+
+@instrument
+def build_history():
+    """Joining and relieving arrays per (company, department) from the Employee table"""
+    employees = {}
+    groups = {}
+
+    for row in get_employee_rows():
+        entry = get_entry(row)
+        if not entry:
+            continue
+        employees[row.name] = entry
+        group = groups.setdefault(entry[0], {"joins": [], "exits": []})
+        group["joins"].append(entry[1])
+        if entry[2] is not None:
+            group["exits"].append(entry[2])
+
+    for group in groups.values():
+        group["joins"].sort()
+        group["exits"].sort()
+
+    return {"employees": employees, "groups": groups}
+
+def get_group_id(group):
+    return json.dumps(list(group), separators=(",", ":"))
+
+def get_group_key(cache, group_id):
+    return cache.make_key(f"{GROUP_KEY}:{group_id}")
+
+def dump_entry(entry):
+    return json.dumps([list(entry[0]), entry[1], entry[2]], separators=(",", ":"))
+
+def load_entry(value):
+    group, joining, relieving = json.loads(value)
+    return tuple(group), joining, relieving
+
+def match_group(group, department=None, company=None):
+    return (not company or group[0] == company) and (not department or group[1] == department)
+
+def load_groups(department=None, company=None):
+    """Cached arrays of the matching groups, None when the history is not cached"""
+    cache = frappe.cache()
+    group_ids = [
+        frappe.safe_decode(group_id)
+        for group_id in cache.pipeline().smembers(cache.make_key(GROUPS_KEY)).execute()[0]
+    ]
+    if not group_ids:
+        return None
+
+    groups = [tuple(json.loads(group_id)) for group_id in group_ids]
+    groups = [group for group in groups if match_group(group, department, company)]
+
+    pipeline = cache.pipeline()
+    for group in groups:
+        pipeline.get(get_group_key(cache, get_group_id(group)))
+    values = pipeline.execute()
+
+    if any(value is None for value in values):
+        return None
+    return {group: json.loads(value) for group, value in zip(groups, values)}
+
+def store_history(history):
+    """Replace the cached history with a built one"""
+    cache = frappe.cache()
+    groups_key = cache.make_key(GROUPS_KEY)
+    employees_key = cache.make_key(EMPLOYEES_KEY)
+
+    pipeline = cache.pipeline()
+    pipeline.delete(groups_key, employees_key)
+    for group, arrays in history["groups"].items():
+        group_id = get_group_id(group)
+        pipeline.set(get_group_key(cache, group_id), json.dumps(arrays), ex=CACHE_TTL)
+        pipeline.sadd(groups_key, group_id)
+    if history["employees"]:
+        pipeline.hset(employees_key, mapping={
+            employee: dump_entry(entry) for employee, entry in history["employees"].items()
+        })
+    pipeline.expire(groups_key, CACHE_TTL)
+    pipeline.expire(employees_key, CACHE_TTL)
+    pipeline.execute()
+
+def get_history(department=None, company=None):
+    """Arrays of the groups of a department and company (any when not given), built on a miss"""
+    groups = load_groups(department, company)
+    if groups is not None:
+        return groups
+
+    cache = frappe.cache()
+    lock_key = cache.make_key(LOCK_KEY)
+    version = cache.get(cache.make_key(VERSION_KEY))
+    history = build_history()
+
+    # A change committed during the build may be missing from it
+    if cache.set(lock_key, 1, nx=True, ex=LOCK_TIMEOUT):
+        try:
+            if cache.get(cache.make_key(VERSION_KEY)) == version:
+                store_history(history)
+        finally:
+            cache.delete(lock_key)
+
+    return {
+        group: arrays for group, arrays in history["groups"].items()
+        if match_group(group, department, company)
+    }
+
+def remove_entry(groups, entry):
+    group = groups.get(entry[0])
+    if not group:
+        return
+    for key, ordinal in (("joins", entry[1]), ("exits", entry[2])):
+        if ordinal is None:
+            continue
+        values = group[key]
+        index = bisect_left(values, ordinal)
+        if index < len(values) and values[index] == ordinal:
+            values.pop(index)
+
+def add_entry(groups, entry):
+    group = groups.setdefault(entry[0], {"joins": [], "exits": []})
+    insort(group["joins"], entry[1])
+    if entry[2] is not None:
+        insort(group["exits"], entry[2])
+
+def apply_employee_changes(employees):
+    """Replace the cached entries of the given employees with their current rows"""
+    cache = frappe.cache()
+    groups_key = cache.make_key(GROUPS_KEY)
+    employees_key = cache.make_key(EMPLOYEES_KEY)
+
+    pipeline = cache.pipeline()
+    pipeline.exists(groups_key)
+    pipeline.hmget(employees_key, employees)
+    cached, old_values = pipeline.execute()
+    if not cached:
+        # Nothing to update, the next read builds from the table
+        return
+
+    rows = {row.name: row for row in get_employee_rows(employees)}
+    changes = {}
+    for employee, old_value in zip(employees, old_values):
+        old_entry = load_entry(old_value) if old_value else None
+        entry = get_entry(rows[employee]) if employee in rows else None
+        if entry != old_entry:
+            changes[employee] = (old_entry, entry)
+
+    if not changes:
+        return
+
+    touched = sorted({entry[0] for pair in changes.values() for entry in pair if entry})
+    pipeline = cache.pipeline()
+    for group in touched:
+        group_id = get_group_id(group)
+        pipeline.get(get_group_key(cache, group_id))
+        pipeline.sismember(groups_key, group_id)
+    values = pipeline.execute()
+
+    groups = {}
+    for group, value, indexed in zip(touched, values[::2], values[1::2]):
+        if value is not None:
+            groups[group] = json.loads(value)
+        elif indexed:
+            # The group expired before the index, its other employees are gone
+            clear_headcount_history()
+            return
+        else:
+            groups[group] = {"joins": [], "exits": []}
+
+    for old_entry, entry in changes.values():
+        if old_entry:
+            remove_entry(groups, old_entry)
+        if entry:
+            add_entry(groups, entry)
+
+    pipeline = cache.pipeline()
+    for group, arrays in groups.items():
+        group_id = get_group_id(group)
+        pipeline.set(get_group_key(cache, group_id), json.dumps(arrays), ex=CACHE_TTL)
+        pipeline.sadd(groups_key, group_id)
+    for employee, (_old_entry, entry) in changes.items():
+        if entry:
+            pipeline.hset(employees_key, employee, dump_entry(entry))
+        else:
+            pipeline.hdel(employees_key, employee)
+    pipeline.expire(groups_key, CACHE_TTL)
+    pipeline.expire(employees_key, CACHE_TTL)
+    pipeline.execute()
+
+def update_headcount_history(doc, method=None):
+    """
+    Triggered on Employee changes
+
+    The employee is applied to the cached history once the transaction
+    commits; rolled back changes are dropped.
+    """
+    pending = frappe.flags.hr_suite_headcount_employees
+    if pending is None:
+        pending = frappe.flags.hr_suite_headcount_employees = set()
+        frappe.db.after_commit.add(flush_headcount_changes)
+        frappe.db.after_rollback.add(discard_headcount_changes)
+
+    pending.add(doc.name)
+
+def discard_headcount_changes():
+    frappe.flags.hr_suite_headcount_employees = None
+
+def flush_headcount_changes():
+    """After commit: queue the changed employees and apply the queue"""
+    employees = frappe.flags.hr_suite_headcount_employees
+    frappe.flags.hr_suite_headcount_employees = None
+    if not employees:
+        return
+
+    cache = frappe.cache()
+    try:
+        pipeline = cache.pipeline()
+        pipeline.incr(cache.make_key(VERSION_KEY))
+        pipeline.sadd(cache.make_key(PENDING_KEY), *employees)
+        pipeline.expire(cache.make_key(PENDING_KEY), CACHE_TTL)
+        pipeline.execute()
+
+        apply_pending_changes()
+    except Exception:
+        clear_headcount_history()
+        frappe.log_error(title="HR Suite headcount history")
+
+def apply_pending_changes():
+    """Apply queued employees, unless another writer holds the lock and will apply them"""
+    cache = frappe.cache()
+    lock_key = cache.make_key(LOCK_KEY)
+    pending_key = cache.make_key(PENDING_KEY)
+
+    while cache.set(lock_key, 1, nx=True, ex=LOCK_TIMEOUT):
+        try:
+            while True:
+                pipeline = cache.pipeline()
+                pipeline.smembers(pending_key)
+                pipeline.delete(pending_key)
+                employees, _deleted = pipeline.execute()
+                if not employees:
+                    break
+                apply_employee_changes(sorted(frappe.safe_decode(employee) for employee in employees))
+        finally:
+            cache.delete(lock_key)
+
+        # Employees queued by a writer that found the lock taken just before release
+        if not cache.exists(pending_key):
+            break
+
+def clear_headcount_history():
+    """Drop the cached history; group keys left behind expire on their own"""
+    cache = frappe.cache()
+    cache.delete(cache.make_key(GROUPS_KEY), cache.make_key(EMPLOYEES_KEY))
+
+def count_headcount(groups, ordinal):
+    """Employees at the end of a date: joined on or before it and not relieved on or before it"""
+    return sum(bisect_right(group["joins"], ordinal) - bisect_right(group["exits"], ordinal) for group in groups)
+
+def count_between(groups, key, after, until):
+    """Joinings or relievings after one date, up to and including another"""
+    return sum(bisect_right(group[key], until) - bisect_right(group[key], after) for group in groups)
+
+def get_attrition_rate(exits, opening, closing):
+    average = (opening + closing) / 2
+    return flt(exits * 100 / average, 2) if average else 0.0
+
+def get_headcount(date=None, department=None, company=None):
+    """Headcount at the end of a date (today by default)"""
+    groups = get_history(department, company).values()
+    return count_headcount(groups, getdate(date or today()).toordinal())
+
+def get_period_ends(from_date, to_date, periodicity="Monthly"):
+    """Last day of each period between two dates, the final one cut at to_date"""
+    from_date, to_date = getdate(from_date), getdate(to_date)
+    if periodicity not in PERIODICITIES:
+        frappe.throw(_("Periodicity must be one of {0}").format(", ".join(PERIODICITIES)))
+
+    ends = []
+    if periodicity == "Daily":
+        end = from_date
+    elif periodicity == "Weekly":
+        end = add_days(from_date, 6 - from_date.weekday())
+    else:
+        months = PERIODICITIES[periodicity]
+        # Periods are aligned to the calendar: quarters end in Mar, Jun, Sep, Dec
+        end_month = ((from_date.month - 1) // months + 1) * months
+        end = get_last_day(datetime_date(from_date.year, end_month, 1))
+
+    while True:
+        ends.append(min(getdate(end), to_date))
+        if getdate(end) >= to_date or len(ends) > MAX_PERIODS:
+            break
+        if periodicity == "Daily":
+            end = add_days(end, 1)
+        elif periodicity == "Weekly":
+            end = add_days(end, 7)
+        else:
+            end = get_last_day(add_months(end, PERIODICITIES[periodicity]))
+
+    if len(ends) > MAX_PERIODS:
+        frappe.throw(_("The range cannot have more than {0} periods").format(MAX_PERIODS))
+
+    return ends
+
+def get_series(groups, from_date, period_ends):
+    """Headcount at each period end with hires, exits and attrition over each period"""
+    series = {"headcount": [], "hires": [], "exits": [], "attrition_rate": []}
+    previous = getdate(from_date).toordinal() - 1
+    opening = count_headcount(groups, previous)
+
+    for period_end in period_ends:
+        ordinal = period_end.toordinal()
+        closing = count_headcount(groups, ordinal)
+        exits = count_between(groups, "exits", previous, ordinal)
+
+        series["headcount"].append(closing)
+        series["hires"].append(count_between(groups, "joins", previous, ordinal))
+        series["exits"].append(exits)
+        series["attrition_rate"].append(get_attrition_rate(exits, opening, closing))
+
+        previous, opening = ordinal, closing
+
+    return series
+
+@frappe.whitelist()
+@instrument
+def get_headcount_history(from_date=None, to_date=None, periodicity="Monthly", department=None, company=None, by_department=0):
+    """
+    Get headcount, hires, exits and attrition rate per period
+
+    Covers the last 12 months by default. Headcount is taken at each period
+    end; the attrition rate is exits over the average of the opening and
+    closing headcount, in percent. With `by_department` set, the series of
+    each department are added as well.
+    """
+    if not frappe.has_permission("Employee", "read"):
+        frappe.throw(_("Not permitted"), frappe.PermissionError)
+
+    to_date = getdate(to_date or today())
+    from_date = getdate(from_date) if from_date else add_days(add_months(to_date, -12), 1)
+    if to_date < from_date:
+        frappe.throw(_("To Date cannot be before From Date"))
+
+    period_ends = get_period_ends(from_date, to_date, periodicity)
+    groups = get_history(department, company)
+
+    result = {
+        "from_date": from_date,
+        "to_date": to_date,
+        "periodicity": periodicity,
+        "periods": period_ends,
+        **get_series(groups.values(), from_date, period_ends)
+    }
+
+    if cint(by_department):
+        departments = {}
+        for (group_company, group_department), group in groups.items():
+            departments.setdefault(group_department, []).append(group)
+
+        result["departments"] = [
+            {"department": name or None, **get_series(groups, from_date, period_ends)}
+            for name, groups in sorted(departments.items())
+        ]
+
+    return result
@@ -0,0 +1,140 @@
+import frappe
+
+# Index manager
+#
+# Composite indexes the HR Suite queries rely on, declared per doctype.
+# `ensure_indexes` creates the missing ones online (in place, without locking
+# writes) and is safe to run repeatedly. `check_queries` runs the dashboard
+# functions, EXPLAINs every SELECT they issue and reports the ones reading a
+# large table with a full scan.
+
+MIN_SCAN_ROWS = 10000
+
+def get_indexes():
+    """Required indexes as doctype -> [(index name, columns)]"""
+    return {
+        "Attendance": [
+            ("hr_suite_date_status", ["attendance_date", "status"])
+        ],
+        "Leave Application": [
+            ("hr_suite_status_dates", ["status", "docstatus", "from_date", "to_date"])
+        ],
+        "Employee": [
+            ("hr_suite_status_joining", ["status", "date_of_joining"]),
+            ("hr_suite_status_confirmation", ["status", "final_confirmation_date"])
+        ],
+        "HR Suite Leave Day": [
+            ("hr_suite_date_department", ["leave_date", "department"])
+        ]
+    }
+
+def get_existing_indexes(table):
+    """Index name -> ordered columns of a table"""
+    indexes = {}
+    for row in frappe.db.sql(f"SHOW INDEX FROM `{table}`", as_dict=True):
+        indexes.setdefault(row.Key_name, []).append((row.Seq_in_index, row.Column_name))
+    return {name: [column for _seq, column in sorted(columns)] for name, columns in indexes.items()}
+
+def ensure_indexes(dry_run=False):
+    """
+    Create missing indexes, returning a row per declared index with its state
+
+    An index counts as present when any index starts with the declared columns,
+    whatever its name. Doctypes whose table does not exist yet are skipped.
+    """
+    report = []
+    for doctype, indexes in get_indexes().items():
+        table = f"tab{doctype}"
+
+        # Doctypes added by a later patch are indexed once they are synced
+        if not frappe.db.table_exists(doctype):
+            report.extend({"doctype": doctype, "index": index_name, "columns": columns, "state": "skipped: missing table"}
+                for index_name, columns in indexes)
+            continue
+
+        existing = get_existing_indexes(table)
+
+        for index_name, columns in indexes:
+            row = {"doctype": doctype, "index": index_name, "columns": columns}
+            missing_columns = [column for column in columns if not frappe.db.has_column(doctype, column)]
+
+            if missing_columns:
+                row["state"] = "skipped: missing " + ", ".join(missing_columns)
+            elif any(existing_columns[:len(columns)] == columns for existing_columns in existing.values()):
+                row["state"] = "exists"
+            elif dry_run:
+                row["state"] = "missing"
+            else:
+                add_index(table, index_name, columns)
+                row["state"] = "created"
+
+            report.append(row)
+
+    return report
+
+def add_index(table, index_name, columns):
+    """Add an index without blocking writes, falling back to the default algorithm"""
+    column_list = ", ".join(f"`{column}`" for column in columns)
+    try:
+        frappe.db.sql_ddl(f"ALTER TABLE `{table}` ADD INDEX `{index_name}` ({column_list}), ALGORITHM=INPLACE, LOCK=NONE")
+    except Exception:
+        # Older servers refuse the online clauses for some column types
+        frappe.db.sql_ddl(f"ALTER TABLE `{table}` ADD INDEX `{index_name}` ({column_list})")
+
+def capture_queries(fn):
+    """SELECT statements (query, values) issued by `fn`, in order, without duplicates"""
+    captured = {}
+    original_sql = frappe.db.sql
+
+    def sql(query, values=(), *args, **kwargs):
+        if query.lstrip().upper().startswith("SELECT"):
+            captured.setdefault(query, values)
+        return original_sql(query, values, *args, **kwargs)
+
+    frappe.db.sql = sql
+    try:
+        fn()
+    finally:
+        frappe.db.sql = original_sql
+
+    return list(captured.items())
+
+def explain(query, values=()):
+    return frappe.db.sql(f"EXPLAIN {query}", values, as_dict=True)
+
+def check_queries(min_rows=MIN_SCAN_ROWS, only=None):
+    """
+    Full scans of large tables in the queries behind the dashboard
+
+    Returns one row per offending table access, with the function that issued
+    the query and the estimated rows read.
+    """
+    from hr_suite.benchmark import WRITING_BENCHMARKS, clear_caches, get_benchmarks
+
+    frappe.set_user("Administrator")
+    findings = []
+    seen = set()
+
+    for name, fn in get_benchmarks().items():
+        if name in WRITING_BENCHMARKS or (only and not any(pattern in name for pattern in only)):
+            continue
+
+        clear_caches()
+        for query, values in capture_queries(fn):
+            if query in seen:
+                continue
+            seen.add(query)
+
+            for row in explain(query, values):
+                if row.type == "ALL" and (row.rows or 0) >= min_rows and not (row.table or "").startswith("<"):
+                    findings.append({
+                        "function": name,
+                        "table": row.table,
+                        "rows": row.rows,
+                        "possible_keys": row.possible_keys,
+                        "query": " ".join(query.split())
+                    })
+
+        frappe.db.rollback()
+
+    return findings
@@ -3,14 +3,37 @@ from frappe import _
 
 def on_leave_submit(doc, method):
     """
-    Triggered when leave application is submitted
+    Triggered when leave application is submitted for approval
     """
-    # Send notification to leave approver
-    send_leave_notification(doc)
+    from hr_suite.api.leave_notification import queue_leave_notification
+    
+    # Notify leave approver, batched into a digest unless urgent
+    try:
+        queue_leave_notification(doc)
+    except Exception as e:
+        frappe.log_error(f"Failed to queue leave notification: {str(e)}")
     
     # Update leave balance
     update_leave_balance(doc)
 
+def on_leave_update(doc, method=None):
+    """
+    Triggered on Leave Application update
+
+    A draft whose approver is set or changed after insert goes to the new
+    approver; the old approver's pending digest entry is dropped.
+    """
+    from hr_suite.api.leave_notification import queue_leave_notification
+    
+    if doc.docstatus != 0 or not doc.get_doc_before_save() or not doc.has_value_changed("leave_approver"):
+        return
+    
+    try:
+        frappe.db.delete("HR Suite Leave Notification", {"leave_application": doc.name, "status": "Pending"})
+        queue_leave_notification(doc)
+    except Exception as e:
+        frappe.log_error(f"Failed to queue leave notification: {str(e)}")
+
 def send_leave_notification(leave_app):
     """
     Send leave application notification to approver
@@ -19,25 +42,58 @@ def send_leave_notification(leave_app):
         return
     
     try:
-        message = f"""
-        <p>A new leave application requires your approval.</p>
-        <p><strong>Employee:</strong> {leave_app.employee_name}</p>
-        <p><strong>Leave Type:</strong> {leave_app.leave_type}</p>
-        <p><strong>From:</strong> {leave_app.from_date} <strong>To:</strong> {leave_app.to_date}</p>
-        <p><strong>Total Days:</strong> {leave_app.total_leave_days}</p>
-        <p><strong>Reason:</strong> {leave_app.description or 'Not specified'}</p>
-        """
-        
         frappe.sendmail(
             recipients=leave_app.leave_approver,
             subject=f"Leave Approval Required - {leave_app.employee_name}",
-            message=message,
+            template="leave_approval_required",
+            args={
+                "employee_name": leave_app.employee_name,
+                "leave_type": leave_app.leave_type,
+                "from_date": leave_app.from_date,
+                "to_date": leave_app.to_date,
+                "total_leave_days": leave_app.total_leave_days,
+                "reason": leave_app.description
+            },
             reference_doctype="Leave Application",
             reference_name=leave_app.name
         )
     except Exception as e:
         frappe.log_error(f"Failed to send leave notification: {str(e)}")
 
+def notify_leave_status(doc, method=None):
+    """
+    Triggered when a leave application is submitted as Approved or Rejected
+    
+    Tells the employee the outcome. HRMS would send this itself, but its
+    per-application approver emails are switched off in favour of the
+    approver digest, and the same HR Settings flag covers both.
+    """
+    if doc.status not in ("Approved", "Rejected"):
+        return
+    
+    user = frappe.db.get_value("Employee", doc.employee, "user_id")
+    if not user:
+        return
+    
+    try:
+        frappe.sendmail(
+            recipients=user,
+            subject=f"Leave Application {doc.status} - {doc.leave_type}",
+            template="leave_status_notification",
+            args={
+                "employee_name": doc.employee_name,
+                "status": doc.status.lower(),
+                "leave_type": doc.leave_type,
+                "from_date": doc.from_date,
+                "to_date": doc.to_date,
+                "total_leave_days": doc.total_leave_days
+            },
+            reference_doctype="Leave Application",
+            reference_name=doc.name
+        )
+    except Exception as e:
+        frappe.log_error(f"Failed to send leave status notification: {str(e)}")
+
 def update_leave_balance(leave_app):
     """
     Update leave balance after approval/rejection
@@ -0,0 +1,168 @@
+import frappe
+from frappe.utils import getdate, today, flt, date_diff
+
+# Bulk leave allocation
+#
+# Existing allocations for the whole employee x leave type set are read in a
+# single query, only the missing pairs are planned, and the plan is either
+# returned as a diff (dry run) or created batch by batch. Allocations still go
+# through the Leave Allocation controller so the leave ledger stays correct.
+
+BATCH_SIZE = 100
+
+def allocate_leaves_bulk(employees, from_date=None, to_date=None, leave_types=None,
+        prorate=True, dry_run=False, batch_size=BATCH_SIZE, commit=False,
+        description="Auto-allocated by HR Suite"):
+    """
+    Allocate every active leave type an employee does not have yet for the period
+
+    The period defaults to the current calendar year. With `prorate`, employees
+    joining inside the period are allocated from their joining date, with the
+    leave type's maximum scaled to the part of the period they work.
+
+    Returns {"planned": [...], "existing": n, "created": [...], "failed": [...]}.
+    """
+    from_date, to_date = get_allocation_period(from_date, to_date)
+    leave_types = get_allocatable_leave_types(leave_types)
+    employees = get_employee_details(employees)
+
+    existing = get_existing_allocations([emp.name for emp in employees], [lt.name for lt in leave_types], from_date, to_date)
+    planned = plan_allocations(employees, leave_types, existing, from_date, to_date, prorate)
+
+    result = {
+        "from_date": from_date,
+        "to_date": to_date,
+        "existing": len(existing),
+        "planned": planned,
+        "created": [],
+        "failed": []
+    }
+
+    if dry_run:
+        return result
+
+    for start in range(0, len(planned), batch_size):
+        for row in planned[start:start + batch_size]:
+            create_allocation(row, description, result)
+
+        if commit:
+            frappe.db.commit()
+
+    return result
+
+def get_allocation_period(from_date=None, to_date=None):
+    from_date = getdate(from_date or getdate(today()).replace(month=1, day=1))
+    to_date = getdate(to_date or from_date.replace(month=12, day=31))
+    return from_date, to_date
+
+def get_allocatable_leave_types(leave_types=None):
+    """Active leave types with something to allocate"""
+    filters = {"is_active": 1, "max_leaves_allowed": [">", 0]}
+    if leave_types:
+        filters["name"] = ["in", leave_types]
+
+    return frappe.get_all("Leave Type", filters=filters, fields=["name", "max_leaves_allowed"])
+
+def get_employee_details(employees):
+    if not employees:
+        return []
+
+    return frappe.get_all("Employee",
+        filters={"name": ["in", list(employees)]},
+        fields=["name", "date_of_joining", "relieving_date"],
+        order_by="name asc"
+    )
+
+def get_existing_allocations(employees, leave_types, from_date, to_date):
+    """(employee, leave_type) pairs already allocated for an overlapping period"""
+    if not employees or not leave_types:
+        return set()
+
+    rows = frappe.db.sql("""
+        SELECT DISTINCT employee, leave_type
+        FROM `tabLeave Allocation`
+        WHERE docstatus < 2
+        AND employee IN %(employees)s
+        AND leave_type IN %(leave_types)s
+        AND from_date <= %(to_date)s
+        AND to_date >= %(from_date)s
+    """, {
+        "employees": tuple(employees),
+        "leave_types": tuple(leave_types),
+        "from_date": from_date,
+        "to_date": to_date
+    })
+
+    return set(rows)
+
+def plan_allocations(employees, leave_types, existing, from_date, to_date, prorate=True):
+    """Allocations to create for the missing employee x leave type pairs"""
+    period_days = date_diff(to_date, from_date) + 1
+    planned = []
+
+    for emp in employees:
+        allocation_from = from_date
+        if prorate and emp.date_of_joining:
+            allocation_from = max(from_date, getdate(emp.date_of_joining))
+
+        allocation_to = to_date
+        if emp.relieving_date:
+            allocation_to = min(to_date, getdate(emp.relieving_date))
+
+        if allocation_from > allocation_to:
+            continue
+
+        ratio = (date_diff(allocation_to, allocation_from) + 1) / period_days if prorate else 1
+
+        for lt in leave_types:
+            if (emp.name, lt.name) in existing:
+                continue
+
+            leaves = round_to_half(flt(lt.max_leaves_allowed) * ratio)
+            if not leaves:
+                continue
+
+            planned.append({
+                "employee": emp.name,
+                "leave_type": lt.name,
+                "from_date": allocation_from,
+                "to_date": allocation_to,
+                "new_leaves_allocated": leaves
+            })
+
+    return planned
+
+def round_to_half(value):
+    return round(value * 2) / 2
+
+def create_allocation(row, description, result):
+    """Insert and submit one planned allocation, recording the outcome"""
+    savepoint = "hr_suite_leave_allocation"
+    frappe.db.savepoint(savepoint)
+
+    try:
+        allocation = frappe.get_doc({
+            "doctype": "Leave Allocation",
+            "description": description,
+            **row
+        })
+        allocation.insert(ignore_permissions=True)
+        allocation.submit()
+        result["created"].append({**row, "name": allocation.name})
+
+    except Exception as e:
+        frappe.db.rollback(save_point=savepoint)
+        result["failed"].append({**row, "error": str(e)})
+
+def allocate_company_leaves(company, year=None, dry_run=False):
+    """Allocate the leave year for every active employee of a company"""
+    year = int(year or getdate(today()).year)
+    employees = frappe.get_all("Employee", filters={"company": company, "status": "Active"}, pluck="name")
+
+    return allocate_leaves_bulk(
+        employees,
+        from_date=f"{year}-01-01",
+        to_date=f"{year}-12-31",
+        dry_run=dry_run,
+        commit=not dry_run
+    )
@@ -0,0 +1,202 @@
+import calendar
+from bisect import bisect_right
+from datetime import date as datetime_date
+
+import frappe
+from frappe import _
+from frappe.utils import getdate, today, cint
+from hr_suite.api.performance import instrument
+
+# Leave usage analytics
+#
+# Approved leave overlapping a range is loaded in one query as compact
+# columns: leave type, department, and start and end as day offsets from the
+# start of the range, computed by the database. Each application's days are
+# then spread over the months it touches in proportion to the calendar days it
+# spends in each (so holidays inside a leave are prorated, not located), and
+# summed per leave type x month x department. With NumPy the overlap of every
+# application with every month is one array operation per chunk; without it
+# each application walks only the months it spans.
+
+CHUNK_SIZE = 100000
+MAX_MONTHS = 60
+
+def get_month_bounds(from_date, to_date):
+    """(label, start offset, end offset exclusive) of each month of the range, clipped to it"""
+    from_date, to_date = getdate(from_date), getdate(to_date)
+    bounds = []
+    year, month = from_date.year, from_date.month
+
+    while datetime_date(year, month, 1) <= to_date:
+        first_day = max(datetime_date(year, month, 1), from_date)
+        last_day = min(datetime_date(year, month, calendar.monthrange(year, month)[1]), to_date)
+        bounds.append((f"{year}-{month:02d}", (first_day - from_date).days, (last_day - from_date).days + 1))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+    return bounds
+
+def load_leave_columns(from_date, to_date, company=None, department=None):
+    """
+    Approved leave overlapping the range as columns
+    (leave types, departments, start offsets, end offsets inclusive, leave days)
+    """
+    params = {"from_date": getdate(from_date), "to_date": getdate(to_date)}
+    conditions = ""
+    if company:
+        conditions += " AND company = %(company)s"
+        params["company"] = company
+    if department:
+        conditions += " AND department = %(department)s"
+        params["department"] = department
+
+    rows = frappe.db.sql(f"""
+        SELECT
+            leave_type,
+            IFNULL(department, ''),
+            DATEDIFF(from_date, %(from_date)s),
+            DATEDIFF(to_date, %(from_date)s),
+            total_leave_days
+        FROM `tabLeave Application`
+        WHERE status = 'Approved'
+        AND docstatus = 1
+        AND from_date <= %(to_date)s
+        AND to_date >= %(from_date)s{conditions}
+    """, params)
+
+    if not rows:
+        return [], [], [], [], []
+
+    return [list(column) for column in zip(*rows)]
+
+@instrument
+def compute_usage(columns, bounds):
+    """
+    Prorated leave days and applications per leave type x month x department
+
+    Uses NumPy when it is installed.
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        np = None
+
+    if np is not None:
+        return compute_usage_numpy(np, columns, bounds)
+
+    types, departments, starts, ends, days = columns
+    leave_types = sorted(set(types))
+    department_list = sorted(set(departments))
+    type_index = {leave_type: i for i, leave_type in enumerate(leave_types)}
+    department_index = {department: i for i, department in enumerate(department_list)}
+    month_starts = [start for _label, start, _end in bounds]
+
+    usage = [[[0.0] * len(department_list) for _bound in bounds] for _type in leave_types]
+    applications = [[[0] * len(department_list) for _bound in bounds] for _type in leave_types]
+
+    for leave_type, department, start, end, leave_days in zip(types, departments, starts, ends, days):
+        end += 1
+        rate = float(leave_days or 0) / max(end - start, 1)
+        t, d = type_index[leave_type], department_index[department]
+
+        month = max(bisect_right(month_starts, start) - 1, 0)
+        while month < len(bounds) and bounds[month][1] < end:
+            overlap = min(end, bounds[month][2]) - max(start, bounds[month][1])
+            if overlap > 0:
+                usage[t][month][d] += overlap * rate
+                applications[t][month][d] += 1
+            month += 1
+
+    return leave_types, department_list, usage, applications
+
+def compute_usage_numpy(np, columns, bounds):
+    types, departments, starts, ends, days = columns
+    if not types:
+        return [], [], [], []
+
+    leave_types, type_codes = np.unique(np.asarray(types, dtype=str), return_inverse=True)
+    department_list, department_codes = np.unique(np.asarray(departments, dtype=str), return_inverse=True)
+    starts = np.asarray(starts, dtype=np.int64)
+    ends = np.asarray(ends, dtype=np.int64) + 1
+    rates = np.asarray(days, dtype=float) / np.maximum(ends - starts, 1)
+
+    months = len(bounds)
+    month_starts = np.array([start for _label, start, _end in bounds], dtype=np.int64)[:, None]
+    month_ends = np.array([end for _label, _start, end in bounds], dtype=np.int64)[:, None]
+    month_offsets = np.arange(months, dtype=np.int64)[:, None]
+    size = len(leave_types) * months * len(department_list)
+
+    usage = np.zeros(size)
+    applications = np.zeros(size)
+    for offset in range(0, len(starts), CHUNK_SIZE):
+        chunk = slice(offset, offset + CHUNK_SIZE)
+        # months x applications matrix of days inside each month
+        overlap = np.minimum(ends[chunk], month_ends) - np.maximum(starts[chunk], month_starts)
+        np.clip(overlap, 0, None, out=overlap)
+
+        cells = ((type_codes[chunk] * months + month_offsets) * len(department_list) + department_codes[chunk]).ravel()
+        usage += np.bincount(cells, weights=(overlap * rates[chunk]).ravel(), minlength=size)
+        applications += np.bincount(cells, weights=(overlap > 0).ravel(), minlength=size)
+
+    shape = (len(leave_types), months, len(department_list))
+    return (
+        leave_types.tolist(),
+        department_list.tolist(),
+        usage.reshape(shape).tolist(),
+        applications.reshape(shape).astype(int).tolist()
+    )
+
+def get_usage_matrix(from_date, to_date, company=None, department=None):
+    """
+    Prorated leave usage over a range as a leave type x month x department matrix
+
+    Returns the month labels, leave types and departments with `days` and
+    `applications` indexed [leave type][month][department], plus totals per
+    leave type and month and per month.
+    """
+    bounds = get_month_bounds(from_date, to_date)
+    columns = load_leave_columns(from_date, to_date, company=company, department=department)
+    leave_types, departments, usage, applications = compute_usage(columns, bounds)
+
+    by_leave_type = [[round(sum(cell), 2) for cell in months] for months in usage]
+    by_month = [round(sum(row[month] for row in by_leave_type), 2) for month in range(len(bounds))]
+
+    return {
+        "from_date": getdate(from_date),
+        "to_date": getdate(to_date),
+        "months": [label for label, _start, _end in bounds],
+        "leave_types": leave_types,
+        "departments": [department or None for department in departments],
+        "days": [[[round(cell, 2) for cell in row] for row in months] for months in usage],
+        "applications": applications,
+        "totals": {
+            "by_leave_type": by_leave_type,
+            "by_month": by_month
+        }
+    }
+
+@frappe.whitelist()
+@instrument
+def get_leave_usage(year=None, from_date=None, to_date=None, company=None, department=None):
+    """
+    Get prorated leave usage per leave type, month and department
+
+    Covers a calendar year (this year by default) or a date range; leave
+    crossing the range or a month boundary counts in each month for the days
+    it spends there.
+    """
+    if not frappe.has_permission("Leave Application", "read"):
+        frappe.throw(_("Not permitted"), frappe.PermissionError)
+
+    if from_date or to_date:
+        from_date = getdate(from_date or today())
+        to_date = getdate(to_date or today())
+    else:
+        year = cint(year) or getdate(today()).year
+        from_date, to_date = datetime_date(year, 1, 1), datetime_date(year, 12, 31)
+
+    if to_date < from_date:
+        frappe.throw(_("To Date cannot be before From Date"))
+    if len(get_month_bounds(from_date, to_date)) > MAX_MONTHS:
+        frappe.throw(_("The range cannot span more than {0} months").format(MAX_MONTHS))
+
+    return get_usage_matrix(from_date, to_date, company=company, department=department)
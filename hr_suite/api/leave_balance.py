@@ -0,0 +1,143 @@
+import frappe
+from frappe import _
+from frappe.utils import today, getdate, flt, cint
+from hr_suite.api.performance import instrument
+
+# Bulk leave balances
+#
+# Balances are read straight from the Leave Ledger Entry table: for every
+# employee and leave type, the entries inside the allocation period that
+# contains the date are summed in one grouped query.
+
+@frappe.whitelist()
+@instrument
+def get_leave_balances(employees=None, department=None, company=None, date=None, aggregate=0):
+    """
+    Get the leave balance matrix for many employees at once
+
+    Employees are given as a list, or selected by department and/or company.
+    Returns leave types, employees and a balance row per employee; with
+    `aggregate` set, per leave type totals are added as well.
+    """
+    if not frappe.has_permission("Employee", "read"):
+        frappe.throw(_("Not permitted"), frappe.PermissionError)
+
+    date = getdate(date or today())
+    employees = get_employee_list(frappe.parse_json(employees) if employees else None, department, company)
+    leave_types = get_active_leave_types()
+
+    balances = get_balance_map(employees, date)
+    matrix = [
+        [balances.get((employee, lt.name), 0.0) for lt in leave_types]
+        for employee in employees
+    ]
+
+    result = {
+        "date": date,
+        "leave_types": [lt.name for lt in leave_types],
+        "employees": employees,
+        "balances": matrix
+    }
+
+    if cint(aggregate):
+        result["summary"] = summarize_balances(result["leave_types"], matrix)
+
+    return result
+
+def get_employee_list(employees=None, department=None, company=None):
+    """Resolve the employees to report on"""
+    if employees:
+        return list(dict.fromkeys(employees))
+
+    if not department and not company:
+        frappe.throw(_("Pass employees, a department or a company"))
+
+    filters = {"status": "Active"}
+    if department:
+        filters["department"] = department
+    if company:
+        filters["company"] = company
+
+    return frappe.get_all("Employee", filters=filters, pluck="name", order_by="name asc")
+
+def get_active_leave_types():
+    return frappe.get_all("Leave Type",
+        filters={"is_active": 1},
+        fields=["name", "leave_type_name"],
+        order_by="name asc"
+    )
+
+@instrument
+def get_balance_map(employees, date):
+    """
+    Leave balances on `date` as {(employee, leave_type): balance}
+
+    Only ledger entries starting on or before the date count, so leaves
+    approved for later dates do not reduce today's balance.
+    """
+    if not employees:
+        return {}
+
+    rows = frappe.db.sql("""
+        SELECT
+            entry.employee,
+            entry.leave_type,
+            SUM(entry.leaves) AS balance
+        FROM `tabLeave Ledger Entry` entry
+        INNER JOIN (
+            SELECT employee, leave_type, MIN(from_date) AS from_date, MAX(to_date) AS to_date
+            FROM `tabLeave Ledger Entry`
+            WHERE transaction_type = 'Leave Allocation'
+            AND docstatus = 1
+            AND from_date <= %(date)s
+            AND to_date >= %(date)s
+            AND employee IN %(employees)s
+            GROUP BY employee, leave_type
+        ) period
+            ON period.employee = entry.employee
+            AND period.leave_type = entry.leave_type
+        WHERE entry.docstatus = 1
+        AND entry.employee IN %(employees)s
+        AND entry.from_date >= period.from_date
+        AND entry.from_date <= %(date)s
+        AND entry.to_date <= period.to_date
+        GROUP BY entry.employee, entry.leave_type
+    """, {"date": date, "employees": tuple(employees)}, as_dict=True)
+
+    return {(row.employee, row.leave_type): flt(row.balance) for row in rows}
+
+@instrument
+def summarize_balances(leave_types, matrix):
+    """
+    Total, average, minimum and maximum balance per leave type
+
+    Uses NumPy when it is installed.
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        np = None
+
+    if not matrix:
+        return {lt: {"total": 0.0, "average": 0.0, "min": 0.0, "max": 0.0} for lt in leave_types}
+
+    if np is not None:
+        values = np.asarray(matrix, dtype=float)
+        totals, averages = values.sum(axis=0), values.mean(axis=0)
+        minimums, maximums = values.min(axis=0), values.max(axis=0)
+    else:
+        columns = list(zip(*matrix))
+        totals = [sum(column) for column in columns]
+        averages = [sum(column) / len(column) for column in columns]
+        minimums = [min(column) for column in columns]
+        maximums = [max(column) for column in columns]
+
+    return {
+        lt: {
+            "total": float(totals[i]),
+            "average": float(averages[i]),
+            "min": float(minimums[i]),
+            "max": float(maximums[i])
+        }
+        for i, lt in enumerate(leave_types)
+    }
@@ -0,0 +1,42 @@
+import frappe
+from frappe import _
+from frappe.utils import getdate, today, cint
+from hr_suite.api.performance import instrument
+from hr_suite.hr_suite_dashboard.doctype.hr_suite_leave_day.hr_suite_leave_day import (
+    get_employees_on_leave, get_absence_heatmap
+)
+
+@frappe.whitelist()
+@instrument
+def get_on_leave(date=None, from_date=None, to_date=None, department=None, company=None):
+    """
+    Get who is on leave on a date (today by default) or over a date range
+
+    Read from the leave calendar, optionally for one department or company
+    """
+    if not frappe.has_permission("Leave Application", "read"):
+        frappe.throw(_("Not permitted"), frappe.PermissionError)
+
+    from_date = getdate(from_date or date or today())
+    to_date = getdate(to_date) if to_date else from_date
+    if to_date < from_date:
+        frappe.throw(_("To Date cannot be before From Date"))
+
+    return get_employees_on_leave(from_date, to_date, department=department, company=company)
+
+@frappe.whitelist()
+@instrument
+def get_team_absence_heatmap(year=None, month=None, department=None, company=None):
+    """
+    Get employees on leave per day of a month (this month by default), per department
+    """
+    if not frappe.has_permission("Leave Application", "read"):
+        frappe.throw(_("Not permitted"), frappe.PermissionError)
+
+    current_date = getdate(today())
+    year = cint(year) or current_date.year
+    month = cint(month) or current_date.month
+    if not 1 <= month <= 12:
+        frappe.throw(_("Month must be between 1 and 12"))
+
+    return get_absence_heatmap(year, month, department=department, company=company)
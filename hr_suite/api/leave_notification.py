@@ -0,0 +1,146 @@
+import frappe
+from frappe.utils import cint, getdate, today, now_datetime, add_to_date, get_url_to_form
+from hr_suite.api.performance import instrument
+
+# Approver digests
+#
+# Leave applications needing approval are buffered as "HR Suite Leave
+# Notification" rows. A scheduler tick collects the approvers whose digest is
+# due and hands them to a single background job, which sends one email per
+# approver. Leaves starting today (or earlier) skip the buffer and go out at
+# once. Delivery state per approver lives in "HR Suite Approver Digest".
+# HRMS's own per-application approver email is switched off in HR Settings
+# (send_leave_notification) so approvers only get these.
+
+DEFAULT_INTERVAL_MINUTES = 60
+
+def get_digest_interval():
+    """Minutes between digests, configurable through `hr_suite_leave_digest_interval` in site config"""
+    return cint(frappe.conf.get("hr_suite_leave_digest_interval")) or DEFAULT_INTERVAL_MINUTES
+
+def is_urgent(leave_app):
+    return getdate(leave_app.from_date) <= getdate(today())
+
+def queue_leave_notification(leave_app):
+    """Buffer an approval request, or send it now when the leave starts today"""
+    if not leave_app.leave_approver or leave_app.status != "Open":
+        return
+
+    notification = frappe.get_doc({
+        "doctype": "HR Suite Leave Notification",
+        "leave_application": leave_app.name,
+        "approver": leave_app.leave_approver,
+        "employee_name": leave_app.employee_name,
+        "leave_type": leave_app.leave_type,
+        "from_date": leave_app.from_date,
+        "to_date": leave_app.to_date,
+        "total_leave_days": leave_app.total_leave_days,
+        "reason": leave_app.description,
+        "status": "Pending"
+    }).insert(ignore_permissions=True)
+
+    if is_urgent(leave_app):
+        from hr_suite.api.leave import send_leave_notification
+
+        send_leave_notification(leave_app)
+        notification.db_set({"status": "Sent", "sent_on": now_datetime()}, update_modified=False)
+
+@instrument
+def enqueue_leave_digests():
+    """
+    Scheduler tick: enqueue one job for every approver whose digest is due
+    """
+    approvers = get_due_approvers()
+    if approvers:
+        # A tick overlapping a running job leaves its approvers to the next tick
+        frappe.enqueue(
+            "hr_suite.api.leave_notification.send_leave_digests",
+            queue="short",
+            job_id="hr_suite_leave_digests",
+            deduplicate=True,
+            approvers=approvers
+        )
+
+def get_due_approvers():
+    """Approvers with pending notifications whose last digest is older than the interval"""
+    return frappe.db.sql_list("""
+        SELECT DISTINCT notification.approver
+        FROM `tabHR Suite Leave Notification` notification
+        LEFT JOIN `tabHR Suite Approver Digest` digest
+            ON digest.name = notification.approver
+        WHERE notification.status = 'Pending'
+        AND (digest.last_sent_on IS NULL OR digest.last_sent_on <= %s)
+    """, add_to_date(now_datetime(), minutes=-get_digest_interval()))
+
+@instrument
+def send_leave_digests(approvers):
+    """Background job: send one digest per approver"""
+    pending = frappe.db.sql("""
+        SELECT
+            notification.name, notification.approver, notification.leave_application,
+            notification.employee_name, notification.leave_type, notification.from_date,
+            notification.to_date, notification.total_leave_days, notification.reason,
+            application.status AS application_status, application.docstatus
+        FROM `tabHR Suite Leave Notification` notification
+        LEFT JOIN `tabLeave Application` application
+            ON application.name = notification.leave_application
+        WHERE notification.status = 'Pending'
+        AND notification.approver IN %s
+        ORDER BY notification.from_date ASC
+    """, (tuple(approvers),), as_dict=True)
+
+    by_approver = {}
+    decided = []
+    for row in pending:
+        # Approved, rejected or deleted in the meantime
+        if row.application_status != "Open" or row.docstatus != 0:
+            decided.append(row.name)
+            continue
+
+        row.url = get_url_to_form("Leave Application", row.leave_application)
+        by_approver.setdefault(row.approver, []).append(row)
+
+    sent_on = now_datetime()
+    for approver, applications in by_approver.items():
+        try:
+            frappe.sendmail(
+                recipients=approver,
+                subject=f"Leave Approval Required - {len(applications)} application(s)",
+                template="leave_approval_digest",
+                args={"applications": applications}
+            )
+        except Exception:
+            frappe.log_error(frappe.get_traceback(), f"Leave digest failed for {approver}")
+            continue
+
+        set_status([app.name for app in applications], "Sent", sent_on)
+        update_digest_state(approver, len(applications), sent_on)
+
+    set_status(decided, "Cancelled")
+    frappe.db.commit()
+
+def set_status(names, status, sent_on=None):
+    if not names:
+        return
+
+    frappe.db.sql("""
+        UPDATE `tabHR Suite Leave Notification`
+        SET status = %s, sent_on = %s
+        WHERE name IN %s
+    """, (status, sent_on, tuple(names)))
+
+def update_digest_state(approver, size, sent_on):
+    if frappe.db.exists("HR Suite Approver Digest", approver):
+        frappe.db.sql("""
+            UPDATE `tabHR Suite Approver Digest`
+            SET last_sent_on = %s, last_digest_size = %s, total_sent = total_sent + %s
+            WHERE name = %s
+        """, (sent_on, size, size, approver))
+    else:
+        frappe.get_doc({
+            "doctype": "HR Suite Approver Digest",
+            "approver": approver,
+            "last_sent_on": sent_on,
+            "last_digest_size": size,
+            "total_sent": size
+        }).insert(ignore_permissions=True)
@@ -0,0 +1,206 @@
+import base64
+import json
+
+import frappe
+from frappe import _
+from frappe.utils import today, add_days, get_first_day, get_last_day, getdate, cint
+
+from hr_suite.api.birthday import get_birthday_condition, get_next_birthday
+from hr_suite.api.performance import instrument
+
+# Paginated dashboard lists
+#
+# Every list is read with keyset pagination: rows are ordered by a fixed set of
+# sort expressions ending in a unique column, and the cursor handed back is the
+# sort values of the last row. The next page starts strictly after it, so a
+# page costs an index range read of `limit` rows however deep the caller is.
+
+PAGE_SIZE = 20
+MAX_PAGE_SIZE = 200
+
+def get_list_specs():
+    """
+    Paginated lists as name -> spec
+
+    A spec gives the table, selected fields, a function returning the WHERE
+    clause (filling its params), the ORDER BY expressions and an optional row
+    formatter.
+    """
+    return {
+        "new_joinings": {
+            "table": "tabEmployee",
+            "fields": ["name", "employee_name", "designation", "department", "date_of_joining"],
+            "conditions": new_joinings_conditions,
+            "order_by": [("date_of_joining", "desc"), ("name", "desc")]
+        },
+        "probation_ending": {
+            "table": "tabEmployee",
+            "fields": ["name", "employee_name", "designation", "department", "final_confirmation_date"],
+            "conditions": probation_ending_conditions,
+            "order_by": [("final_confirmation_date", "asc"), ("name", "asc")],
+            "format": format_probation_row
+        },
+        "upcoming_birthdays": {
+            "table": "tabEmployee",
+            "fields": ["name", "employee_name", "department", "date_of_birth"],
+            "conditions": upcoming_birthdays_conditions,
+            "order_by": [(BIRTHDAY_BUCKET, "asc"), ("birthday_key", "asc"), ("name", "asc")],
+            "format": format_birthday_row
+        },
+        "department_wise_count": {
+            "table": "tabHR Suite Counter",
+            "fields": ["counter_key AS department", "value AS count"],
+            "conditions": department_wise_count_conditions,
+            "order_by": [("value", "desc"), ("counter_key", "asc")],
+            "format": format_department_row
+        }
+    }
+
+# Birthdays later in the window than the year end sort after those before it
+BIRTHDAY_BUCKET = "CASE WHEN birthday_key >= %(birthday_start_0)s THEN 0 ELSE 1 END"
+
+def new_joinings_conditions(params):
+    params["first_day"] = get_first_day(today())
+    params["last_day"] = get_last_day(today())
+    return "status = 'Active' AND date_of_joining BETWEEN %(first_day)s AND %(last_day)s"
+
+def probation_ending_conditions(params, days=30):
+    params["today"] = getdate(today())
+    params["probation_end"] = getdate(add_days(today(), days))
+    return "status = 'Active' AND final_confirmation_date BETWEEN %(today)s AND %(probation_end)s"
+
+def upcoming_birthdays_conditions(params, days=7):
+    return "status = 'Active' AND " + get_birthday_condition(getdate(today()), days, params)
+
+def department_wise_count_conditions(params):
+    return "counter_type = 'department_headcount' AND value > 0"
+
+def format_probation_row(row):
+    row.days_until = (getdate(row.final_confirmation_date) - getdate(today())).days
+    return row
+
+def format_birthday_row(row):
+    current_date = getdate(today())
+    birthday_date = get_next_birthday(row.date_of_birth, current_date)
+    return frappe._dict({
+        "employee": row.name,
+        "employee_name": row.employee_name,
+        "department": row.department,
+        "date_of_birth": row.date_of_birth,
+        "birthday_date": birthday_date,
+        "days_until": (birthday_date - current_date).days
+    })
+
+def format_department_row(row):
+    row.department = row.department or None
+    return row
+
+def encode_cursor(values):
+    data = json.dumps(values, default=str, separators=(",", ":"))
+    return base64.urlsafe_b64encode(data.encode()).decode()
+
+def decode_cursor(cursor):
+    try:
+        return json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except Exception:
+        frappe.throw(_("Invalid cursor"))
+
+def get_keyset_condition(order_by, values, params):
+    """
+    WHERE clause selecting rows strictly after `values` in the ORDER BY
+
+    Expands to (a > x) OR (a = x AND b > y) OR ... so each branch can use an
+    index on the leading columns.
+    """
+    if len(values) != len(order_by):
+        frappe.throw(_("Invalid cursor"))
+
+    branches = []
+    for i, (expr, direction) in enumerate(order_by):
+        params[f"cursor_{i}"] = values[i]
+        operator = "<" if direction == "desc" else ">"
+        equals = [f"{order_by[j][0]} = %(cursor_{j})s" for j in range(i)]
+        branches.append("({0})".format(" AND ".join(equals + [f"{expr} {operator} %(cursor_{i})s"])))
+
+    return "({0})".format(" OR ".join(branches))
+
+def get_page_limit(limit=None):
+    return min(cint(limit) or PAGE_SIZE, MAX_PAGE_SIZE)
+
+@instrument
+def fetch_page(list_name, cursor=None, limit=None):
+    """
+    One page of a list as {"items": [...], "next_cursor": cursor or None}
+    """
+    spec = get_list_specs()[list_name]
+    limit = get_page_limit(limit)
+
+    params = {}
+    conditions = [spec["conditions"](params)]
+    if cursor:
+        conditions.append(get_keyset_condition(spec["order_by"], decode_cursor(cursor), params))
+
+    sort_fields = [f"{expr} AS sort_{i}" for i, (expr, _direction) in enumerate(spec["order_by"])]
+    order_by = ", ".join(f"{expr} {direction}" for expr, direction in spec["order_by"])
+
+    rows = frappe.db.sql("""
+        SELECT {fields}
+        FROM `{table}`
+        WHERE {conditions}
+        ORDER BY {order_by}
+        LIMIT {limit}
+    """.format(
+        fields=", ".join(spec["fields"] + sort_fields),
+        table=spec["table"],
+        conditions=" AND ".join(conditions),
+        order_by=order_by,
+        limit=limit + 1
+    ), params, as_dict=True)
+
+    return make_page(spec, rows, limit)
+
+def make_page(spec, rows, limit):
+    """Trim an over-fetched result to a page and derive the next cursor"""
+    sort_count = len(spec["order_by"])
+    next_cursor = None
+
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor([rows[-1][f"sort_{i}"] for i in range(sort_count)])
+
+    items = []
+    for row in rows:
+        for i in range(sort_count):
+            row.pop(f"sort_{i}", None)
+        items.append(spec["format"](row) if spec.get("format") else row)
+
+    return {"items": items, "next_cursor": next_cursor}
+
+@instrument
+def get_list_summary(list_name, limit=None):
+    """Total row count of a list plus its first page"""
+    spec = get_list_specs()[list_name]
+    params = {}
+    count = frappe.db.sql("""
+        SELECT COUNT(*)
+        FROM `{table}`
+        WHERE {conditions}
+    """.format(table=spec["table"], conditions=spec["conditions"](params)), params)[0][0]
+
+    return {"count": int(count), **fetch_page(list_name, limit=limit)}
+
+@frappe.whitelist()
+@instrument
+def get_list_page(list_name, cursor=None, limit=None):
+    """
+    Get a page of a dashboard list
+
+    Pass the `next_cursor` of the previous page to continue.
+    """
+    if not frappe.has_permission("Employee", "read"):
+        frappe.throw(_("Not permitted"), frappe.PermissionError)
+
+    if list_name not in get_list_specs():
+        frappe.throw(_("Unknown list {0}").format(list_name))
+
+    return fetch_page(list_name, cursor, limit)
@@ -0,0 +1,119 @@
+import frappe
+from frappe import _
+from frappe.utils import today, getdate
+
+from hr_suite.api.cache import get_cached_section
+from hr_suite.api.lists import fetch_page, get_list_summary
+from hr_suite.api.stats import get_employee_stats, get_leave_stats, get_attendance_stats
+from hr_suite.hr_suite_dashboard.doctype.hr_suite_counter.hr_suite_counter import (
+    ACTIVE_HEADCOUNT, ATTENDANCE, JOININGS, PENDING_LEAVES,
+    get_counter_name, get_attendance_key, get_joinings_key
+)
+from hr_suite.api.performance import instrument
+
+# Dashboard metric registry
+#
+# Every dashboard widget is a named provider. Providers are only called when
+# their metric is requested, and the stats sections they read are loaded (from
+# the stats cache) at most once per call, so a caller asking for four counters
+# never pays for birthday lists or leave usage. List metrics carry their count
+# and first page only, see `hr_suite.api.lists` for further pages.
+#
+# A full load costs seven database round-trips: one per cached stats section
+# (Employee, Leave Application, attendance rollup), one for the live counts,
+# one for the new joinings page and two for the department list. With the
+# sections cached it is four.
+
+SECTIONS = {
+    "employee": get_employee_stats,
+    "leave": get_leave_stats,
+    "attendance": get_attendance_stats
+}
+
+def get_live_counts():
+    """
+    Today's counters and on-leave count in one query
+
+    These move with every save, so they are read on each call rather than
+    from the stats cache.
+    """
+    current_date = getdate(today())
+    counters = {
+        "active_employees": get_counter_name(ACTIVE_HEADCOUNT),
+        "present_today": get_counter_name(ATTENDANCE, get_attendance_key(current_date, "Present")),
+        "pending_leave_applications": get_counter_name(PENDING_LEAVES),
+        "new_joinings_this_month": get_counter_name(JOININGS, get_joinings_key(current_date))
+    }
+
+    values = dict(frappe.db.sql("""
+        SELECT name, value
+        FROM `tabHR Suite Counter`
+        WHERE name IN %(counters)s
+        UNION ALL
+        SELECT 'on_leave_today', COUNT(DISTINCT employee)
+        FROM `tabHR Suite Leave Day`
+        WHERE leave_date = %(date)s
+    """, {"counters": tuple(counters.values()), "date": current_date}))
+
+    counts = {metric: int(values.get(name) or 0) for metric, name in counters.items()}
+    counts["on_leave_today"] = int(values.get("on_leave_today") or 0)
+    return counts
+
+# Sections read on every call
+LIVE_SECTIONS = {
+    "live": get_live_counts
+}
+
+def from_section(section, key):
+    """Provider reading one key of a stats section"""
+    return lambda load_section: load_section(section)[key]
+
+def get_new_joinings(load_section):
+    """This month's joinings from the counter, with the first page of the list"""
+    return {"count": load_section("live")["new_joinings_this_month"], **fetch_page("new_joinings")}
+
+METRICS = {
+    "total_employees": from_section("employee", "total_employees"),
+    "active_employees": from_section("live", "active_employees"),
+    "on_leave_today": from_section("live", "on_leave_today"),
+    "present_today": from_section("live", "present_today"),
+    "pending_leave_applications": from_section("live", "pending_leave_applications"),
+    "new_joinings_this_month": get_new_joinings,
+    "upcoming_birthdays": from_section("employee", "upcoming_birthdays"),
+    "probation_ending": from_section("employee", "probation_ending"),
+    "department_wise_count": lambda load_section: get_list_summary("department_wise_count"),
+    "leave_type_usage": from_section("leave", "leave_type_usage"),
+    "attendance_summary": from_section("attendance", "attendance_summary")
+}
+
+def parse_metrics(metrics=None):
+    """Metric names from a list, JSON list or comma separated string; all when empty"""
+    if not metrics:
+        return list(METRICS)
+
+    if isinstance(metrics, str):
+        metrics = frappe.parse_json(metrics) if metrics.startswith("[") else metrics.split(",")
+
+    metrics = [name.strip() for name in metrics if name and name.strip()]
+    unknown = [name for name in metrics if name not in METRICS]
+    if unknown:
+        frappe.throw(_("Unknown dashboard metric(s): {0}").format(", ".join(unknown)))
+
+    return metrics
+
+@instrument
+def get_metrics(metrics=None):
+    """
+    Compute the requested dashboard metrics
+    """
+    sections = {}
+
+    def load_section(section):
+        if section not in sections:
+            if section in LIVE_SECTIONS:
+                sections[section] = LIVE_SECTIONS[section]()
+            else:
+                sections[section] = get_cached_section(section, SECTIONS[section])
+        return sections[section]
+
+    return {name: METRICS[name](load_section) for name in parse_metrics(metrics)}
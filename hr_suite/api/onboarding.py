@@ -0,0 +1,177 @@
+import frappe
+from frappe.utils import add_to_date, now_datetime, cint
+from hr_suite.api.performance import instrument
+
+# Onboarding pipeline
+#
+# Inserting an Employee only records an "HR Suite Onboarding" row in the same
+# transaction and schedules one background job. The job claims queued rows in
+# chunks and runs each step in its own transaction, ticking the step off on
+# the row, so a retry only runs the steps that failed. A failing step does not
+# stop the others. Employees created by the same import are picked up together
+# by a single job.
+
+CHUNK_SIZE = 100
+MAX_ATTEMPTS = 3
+STALE_AFTER_MINUTES = 60
+SCHEDULED_KEY = "hr_suite:onboarding:scheduled"
+
+def queue_onboarding(employee):
+    """Record onboarding for a new employee and make sure a job will pick it up"""
+    if frappe.db.exists("HR Suite Onboarding", employee.name):
+        return
+
+    frappe.get_doc({
+        "doctype": "HR Suite Onboarding",
+        "employee": employee.name,
+        "status": "Queued"
+    }).insert(ignore_permissions=True)
+
+    schedule_onboarding_job()
+
+def schedule_onboarding_job():
+    """Enqueue the queue processor unless one is already waiting to run"""
+    cache = frappe.cache()
+    if cache.set(cache.make_key(SCHEDULED_KEY), 1, nx=True, ex=STALE_AFTER_MINUTES * 60):
+        frappe.enqueue(
+            "hr_suite.api.onboarding.process_onboarding_queue",
+            queue="long",
+            enqueue_after_commit=True
+        )
+
+@instrument
+def process_onboarding_queue(chunk_size=CHUNK_SIZE):
+    """
+    Background job: onboard every queued employee, one chunk at a time
+
+    Also runs hourly, which is when failed rows are retried.
+    """
+    # Rows queued from now on need a new job
+    frappe.cache().delete(frappe.cache().make_key(SCHEDULED_KEY))
+
+    requeue_onboarding()
+
+    while True:
+        names = claim_chunk(chunk_size)
+        if not names:
+            break
+        process_chunk(names)
+
+def requeue_onboarding():
+    """
+    Give failed rows with attempts left, and rows left In Progress by a killed
+    worker, back to the queue
+    """
+    frappe.db.sql("""
+        UPDATE `tabHR Suite Onboarding`
+        SET status = 'Queued', job_token = NULL
+        WHERE (status = 'Failed' AND attempts < %(max_attempts)s)
+        OR (status = 'In Progress' AND modified < %(stale_before)s)
+    """, {
+        "max_attempts": MAX_ATTEMPTS,
+        "stale_before": add_to_date(now_datetime(), minutes=-STALE_AFTER_MINUTES)
+    })
+    frappe.db.commit()
+
+def claim_chunk(chunk_size):
+    """Atomically take up to chunk_size queued rows for this worker"""
+    token = frappe.generate_hash(length=12)
+
+    frappe.db.sql("""
+        UPDATE `tabHR Suite Onboarding`
+        SET status = 'In Progress', job_token = %(token)s, modified = %(now)s
+        WHERE status = 'Queued'
+        ORDER BY creation
+        LIMIT {limit}
+    """.format(limit=cint(chunk_size)), {"token": token, "now": now_datetime()})
+    frappe.db.commit()
+
+    return frappe.get_all("HR Suite Onboarding",
+        filters={"job_token": token, "status": "In Progress"},
+        pluck="name",
+        order_by="creation asc"
+    )
+
+def get_steps():
+    """Onboarding steps as (flag fieldname, function taking an Employee doc)"""
+    from hr_suite.api.employee import send_welcome_email, create_user_account, allocate_leaves
+
+    return [
+        ("welcome_email_sent", send_welcome_email),
+        ("user_created", create_user_account),
+        ("leaves_allocated", allocate_leaves)
+    ]
+
+@instrument
+def process_chunk(names):
+    """Run the pending steps for a chunk of claimed onboarding rows"""
+    steps = get_steps()
+    records = frappe.get_all("HR Suite Onboarding",
+        filters={"name": ["in", names]},
+        fields=["name", "employee", "attempts"] + [flag for flag, step in steps]
+    )
+
+    for record in records:
+        try:
+            employee = frappe.get_doc("Employee", record.employee)
+        except Exception:
+            frappe.db.rollback()
+            mark_failed(record, [frappe.get_traceback()])
+            continue
+
+        errors = []
+        for flag, step in steps:
+            if record.get(flag):
+                continue
+
+            try:
+                step(employee)
+                frappe.db.set_value("HR Suite Onboarding", record.name, flag, 1, update_modified=False)
+                frappe.db.commit()
+            except Exception:
+                frappe.db.rollback()
+                errors.append(frappe.get_traceback())
+
+        if errors:
+            mark_failed(record, errors)
+            continue
+
+        frappe.db.set_value("HR Suite Onboarding", record.name, {
+            "status": "Completed",
+            "job_token": None,
+            "last_error": None
+        })
+        frappe.db.commit()
+
+def mark_failed(record, errors):
+    """Record a failed attempt, the next run of the queue retries the failed steps"""
+    attempts = cint(record.attempts) + 1
+    frappe.db.set_value("HR Suite Onboarding", record.name, {
+        "status": "Failed",
+        "attempts": attempts,
+        "job_token": None,
+        "last_error": "\n".join(errors)
+    })
+    frappe.db.commit()
+
+    if attempts >= MAX_ATTEMPTS:
+        frappe.log_error(f"Onboarding failed for {record.employee}", "HR Suite Onboarding")
+
+@frappe.whitelist()
+@instrument
+def retry_onboarding(employees=None):
+    """Queue failed onboarding again, for the given employees or all of them"""
+    frappe.only_for(["HR Manager", "HR Manager Suite", "System Manager"])
+
+    filters = {"status": "Failed"}
+    if employees:
+        filters["employee"] = ["in", frappe.parse_json(employees)]
+
+    names = frappe.get_all("HR Suite Onboarding", filters=filters, pluck="name")
+    for name in names:
+        frappe.db.set_value("HR Suite Onboarding", name, {"status": "Queued", "attempts": 0})
+
+    if names:
+        schedule_onboarding_job()
+
+    return len(names)
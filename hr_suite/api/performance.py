@@ -0,0 +1,168 @@
+import functools
+import json
+import math
+import time
+
+import frappe
+from frappe.utils import now
+
+# Endpoint instrumentation
+#
+# Functions wrapped with `instrument` record a sample per call: wall time, SQL
+# query count and time, and rows returned by those queries. Nested instrumented
+# calls get their own samples, so a slow endpoint can be traced down to the
+# helper responsible. The last SAMPLE_SIZE samples per function are kept in a
+# Redis list and percentiles are computed when read. Instrumentation is off
+# unless `hr_suite_instrumentation` is set in site config, and then costs one
+# Redis round trip per outermost call.
+
+SAMPLE_SIZE = 1000
+STATS_KEY = "hr_suite:performance"
+PERCENTILES = (50, 95, 99)
+
+def is_enabled():
+    return bool(frappe.conf.get("hr_suite_instrumentation"))
+
+def get_sample_key(name):
+    return f"{STATS_KEY}:{name}"
+
+def get_function_name(fn):
+    module = fn.__module__
+    if module.startswith("hr_suite."):
+        module = module[len("hr_suite."):]
+    return f"{module}.{fn.__qualname__}"
+
+def instrument(fn):
+    """
+    Record performance samples for `fn` when instrumentation is enabled
+    """
+    name = get_function_name(fn)
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        if not getattr(frappe.local, "conf", None) or not is_enabled():
+            return fn(*args, **kwargs)
+
+        spans = getattr(frappe.local, "hr_suite_spans", None)
+        outermost = not spans
+        if outermost:
+            spans = frappe.local.hr_suite_spans = []
+            frappe.local.hr_suite_samples = []
+            original_sql = frappe.db.sql
+            frappe.db.sql = get_counting_sql(original_sql)
+
+        span = {"name": name, "queries": 0, "query_time": 0.0, "rows": 0}
+        spans.append(span)
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            span["wall_time"] = time.perf_counter() - start
+            spans.pop()
+            frappe.local.hr_suite_samples.append(span)
+
+            if outermost:
+                frappe.db.sql = original_sql
+                frappe.local.hr_suite_spans = None
+                record_samples(frappe.local.hr_suite_samples)
+                frappe.local.hr_suite_samples = None
+
+    return wrapper
+
+def get_counting_sql(original_sql):
+    """frappe.db.sql charging every query to all open spans"""
+    def sql(*args, **kwargs):
+        start = time.perf_counter()
+        result = original_sql(*args, **kwargs)
+        elapsed = time.perf_counter() - start
+        rows = len(result) if isinstance(result, (list, tuple)) else 0
+
+        for span in frappe.local.hr_suite_spans or ():
+            span["queries"] += 1
+            span["query_time"] += elapsed
+            span["rows"] += rows
+
+        return result
+
+    return sql
+
+def record_samples(samples):
+    """Push samples to their Redis lists, trimming each to SAMPLE_SIZE"""
+    try:
+        cache = frappe.cache()
+        pipeline = cache.pipeline()
+        for sample in samples:
+            key = cache.make_key(get_sample_key(sample["name"]))
+            pipeline.lpush(key, json.dumps([
+                round(sample["wall_time"], 6),
+                sample["queries"],
+                round(sample["query_time"], 6),
+                sample["rows"]
+            ]))
+            pipeline.ltrim(key, 0, SAMPLE_SIZE - 1)
+        pipeline.sadd(cache.make_key(STATS_KEY), *[sample["name"] for sample in samples])
+        pipeline.execute()
+    except Exception:
+        # Losing samples must never fail the request being measured
+        frappe.log_error(title="HR Suite instrumentation")
+
+def percentile(values, pct):
+    """Nearest-rank percentile of sorted values"""
+    if not values:
+        return 0
+    index = max(0, math.ceil(pct / 100 * len(values)) - 1)
+    return values[index]
+
+def summarize_samples(samples):
+    wall_times = sorted(sample[0] for sample in samples)
+    count = len(samples)
+
+    summary = {"samples": count}
+    for pct in PERCENTILES:
+        summary[f"p{pct}"] = round(percentile(wall_times, pct) * 1000, 2)
+    summary["avg_queries"] = round(sum(sample[1] for sample in samples) / count, 1)
+    summary["avg_query_time"] = round(sum(sample[2] for sample in samples) / count * 1000, 2)
+    summary["avg_rows"] = round(sum(sample[3] for sample in samples) / count, 1)
+    return summary
+
+def get_stats():
+    """
+    Rolling stats per instrumented function, slowest p95 first
+
+    Times are in milliseconds.
+    """
+    cache = frappe.cache()
+    names = sorted(frappe.safe_decode(name) for name in cache.smembers(cache.make_key(STATS_KEY)))
+
+    pipeline = cache.pipeline()
+    for name in names:
+        pipeline.lrange(cache.make_key(get_sample_key(name)), 0, -1)
+
+    stats = []
+    for name, samples in zip(names, pipeline.execute()):
+        if samples:
+            stats.append({"function": name, **summarize_samples([json.loads(sample) for sample in samples])})
+
+    stats.sort(key=lambda row: row["p95"], reverse=True)
+    return stats
+
+def reset_stats():
+    cache = frappe.cache()
+    names = [frappe.safe_decode(name) for name in cache.smembers(cache.make_key(STATS_KEY))]
+    keys = [cache.make_key(get_sample_key(name)) for name in names] + [cache.make_key(STATS_KEY)]
+    cache.delete(*keys)
+    return len(names)
+
+@frappe.whitelist()
+def get_performance_stats():
+    """
+    Get rolling latency and query stats of instrumented HR Suite functions
+    """
+    frappe.only_for(("System Manager", "HR Manager", "HR Manager Suite"))
+
+    return {
+        "enabled": is_enabled(),
+        "sample_size": SAMPLE_SIZE,
+        "generated_on": now(),
+        "functions": get_stats()
+    }
@@ -0,0 +1,179 @@
+import hashlib
+
+import frappe
+from frappe import _
+from frappe.utils import today, getdate, add_days, cint
+from hr_suite.api.leave_balance import get_active_leave_types, get_balance_map
+from hr_suite.api.performance import instrument
+
+# Employee self-service portal
+#
+# Everything the portal shows a user (their Employee profile, leave balances,
+# upcoming and pending leave, recent attendance) is gathered in one call of a
+# fixed five queries, whatever the data. The result is cached in Redis per
+# user with an ETag, and dropped when one of that employee's documents
+# changes, so a login spike costs one computation per user. Clients that send
+# the ETag back get a 304 (or `not_modified`) instead of the payload.
+
+DEFAULT_TTL = 3600
+ATTENDANCE_DAYS = 30
+UPCOMING_LEAVE_LIMIT = 10
+
+PROFILE_FIELDS = ["name", "employee_name", "designation", "department", "company",
+    "date_of_joining", "company_email", "cell_number", "image", "reports_to", "status"]
+
+def get_ttl():
+    """Cache TTL in seconds, configurable through `hr_suite_portal_cache_ttl` in site config"""
+    return cint(frappe.conf.get("hr_suite_portal_cache_ttl")) or DEFAULT_TTL
+
+def get_cache_key(user):
+    return f"hr_suite:portal:{user}"
+
+@instrument
+def get_portal_data(user=None):
+    """
+    Portal context of a user as {"etag", "data"}, from the cache when fresh
+
+    Cached entries carry their date, so balances and "upcoming" roll over at
+    midnight without a flush.
+    """
+    user = user or frappe.session.user
+    cache = frappe.cache()
+    key = get_cache_key(user)
+
+    entry = cache.get_value(key)
+    if entry and entry.get("date") == today():
+        return entry
+
+    data = compute_portal_data(user)
+    entry = {
+        "date": today(),
+        "etag": get_etag(data),
+        "data": data
+    }
+    cache.set_value(key, entry, expires_in_sec=get_ttl())
+    return entry
+
+def get_etag(data):
+    return '"{0}"'.format(hashlib.md5(frappe.as_json(data).encode()).hexdigest())
+
+def compute_portal_data(user):
+    """Profile, leave balances, leave applications and attendance of the user's employee"""
+    employee = frappe.db.get_value("Employee", {"user_id": user, "status": "Active"}, PROFILE_FIELDS, as_dict=True)
+    if not employee:
+        return {"employee": None}
+
+    date = getdate(today())
+    leave_types = get_active_leave_types()
+    balances = get_balance_map([employee.name], date)
+
+    return {
+        "employee": employee,
+        "leave_balances": [
+            {
+                "leave_type": lt.name,
+                "leave_type_name": lt.leave_type_name,
+                "balance": balances.get((employee.name, lt.name), 0.0)
+            }
+            for lt in leave_types
+            if (employee.name, lt.name) in balances
+        ],
+        **get_leave_applications(employee.name, date),
+        **get_recent_attendance(employee.name, date)
+    }
+
+def get_leave_applications(employee, date):
+    """Upcoming approved leave and open applications, from one query"""
+    rows = frappe.db.sql("""
+        SELECT name, leave_type, from_date, to_date, total_leave_days, status, half_day
+        FROM `tabLeave Application`
+        WHERE employee = %(employee)s
+        AND to_date >= %(date)s
+        AND (
+            (status = 'Approved' AND docstatus = 1)
+            OR (status = 'Open' AND docstatus = 0)
+        )
+        ORDER BY from_date ASC
+    """, {"employee": employee, "date": date}, as_dict=True)
+
+    return {
+        "upcoming_leaves": [row for row in rows if row.status == "Approved"][:UPCOMING_LEAVE_LIMIT],
+        "pending_leaves": [row for row in rows if row.status == "Open"]
+    }
+
+def get_recent_attendance(employee, date, days=ATTENDANCE_DAYS):
+    """Submitted attendance of the last `days` days, newest first, with a count per status"""
+    rows = frappe.db.sql("""
+        SELECT attendance_date, status, leave_type, in_time, out_time
+        FROM `tabAttendance`
+        WHERE employee = %(employee)s
+        AND docstatus = 1
+        AND attendance_date BETWEEN %(from_date)s AND %(to_date)s
+        ORDER BY attendance_date DESC
+    """, {"employee": employee, "from_date": add_days(date, -days), "to_date": date}, as_dict=True)
+
+    summary = {}
+    for row in rows:
+        summary[row.status] = summary.get(row.status, 0) + 1
+
+    return {
+        "recent_attendance": rows,
+        "attendance_summary": [{"status": status, "count": count} for status, count in sorted(summary.items())]
+    }
+
+@frappe.whitelist()
+@instrument
+def get_portal_context(etag=None):
+    """
+    Get the self-service portal data of the logged in user
+
+    Sends an ETag header; a request whose If-None-Match header (or `etag`
+    argument) matches the current data gets a 304, or `not_modified` for
+    clients that cannot read status codes.
+    """
+    if frappe.session.user == "Guest":
+        frappe.throw(_("Not permitted"), frappe.PermissionError)
+
+    entry = get_portal_data()
+    response_headers = getattr(frappe.local, "response_headers", None)
+    if response_headers is not None:
+        response_headers["ETag"] = entry["etag"]
+        response_headers["Cache-Control"] = "private, no-cache"
+
+    if entry["etag"] in (etag, frappe.get_request_header("If-None-Match")):
+        frappe.local.response.http_status_code = 304
+        return {"etag": entry["etag"], "not_modified": True}
+
+    return {"etag": entry["etag"], **entry["data"]}
+
+def get_portal_users(doc):
+    """Users whose portal shows the document"""
+    if doc.doctype == "Employee":
+        users = {doc.user_id}
+        # A re-linked employee also leaves the previous user's portal
+        previous = doc.get_doc_before_save()
+        if previous:
+            users.add(previous.user_id)
+    else:
+        users = {frappe.db.get_value("Employee", doc.employee, "user_id")} if doc.get("employee") else set()
+
+    return {user for user in users if user}
+
+def invalidate_portal_cache(doc, method=None):
+    """
+    Triggered on changes to an employee's Employee, Leave Application,
+    Attendance, Leave Allocation and Leave Ledger Entry documents
+    """
+    keys = [get_cache_key(user) for user in get_portal_users(doc)]
+    if not keys:
+        return
+
+    def delete():
+        frappe.cache().delete_value(keys)
+
+    delete()
+
+    # A request may repopulate from pre-commit data in between
+    after_commit = getattr(frappe.db, "after_commit", None)
+    if after_commit is not None:
+        after_commit.add(delete)
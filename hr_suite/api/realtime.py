@@ -0,0 +1,98 @@
+import time
+
+import frappe
+from frappe.utils import today, getdate
+
+# Realtime dashboard deltas
+#
+# Document events add their effect on the dashboard cards (e.g.
+# {"pending_leave_applications": -1}) to a per-transaction buffer. When the
+# transaction commits the buffer is added to a Redis hash, and the first
+# commit of a window schedules one job that waits out the window, takes the
+# hash and publishes the summed deltas with `frappe.publish_realtime` to the
+# HR Suite Counter doctype room, which only users who can read the counters
+# (the dashboard's audience) can join. Open dashboards patch their cards from
+# it, so they cost nothing between changes and at most one message per window
+# while changes happen. Rolled back transactions publish nothing.
+
+EVENT = "hr_suite_dashboard_delta"
+ROOM_DOCTYPE = "HR Suite Counter"
+COALESCE_SECONDS = 1
+PENDING_KEY = "hr_suite:realtime:pending"
+SCHEDULED_KEY = "hr_suite:realtime:scheduled"
+
+def get_card_deltas(counter_deltas):
+    """Card deltas implied by HR Suite Counter deltas"""
+    from hr_suite.hr_suite_dashboard.doctype.hr_suite_counter.hr_suite_counter import (
+        ACTIVE_HEADCOUNT, ATTENDANCE, JOININGS, PENDING_LEAVES,
+        get_attendance_key, get_joinings_key
+    )
+
+    current_date = getdate(today())
+    cards = {
+        (ACTIVE_HEADCOUNT, None): "active_employees",
+        (PENDING_LEAVES, None): "pending_leave_applications",
+        (ATTENDANCE, get_attendance_key(current_date, "Present")): "present_today",
+        (JOININGS, get_joinings_key(current_date)): "new_joinings_this_month"
+    }
+
+    return {cards[key]: delta for key, delta in counter_deltas.items() if key in cards}
+
+def queue_counter_deltas(counter_deltas):
+    queue_dashboard_deltas(get_card_deltas(counter_deltas))
+
+def queue_dashboard_deltas(deltas):
+    """Buffer card deltas until the current transaction commits"""
+    deltas = {card: delta for card, delta in deltas.items() if delta}
+    if not deltas:
+        return
+
+    pending = frappe.flags.hr_suite_dashboard_deltas
+    if pending is None:
+        pending = frappe.flags.hr_suite_dashboard_deltas = {}
+        frappe.db.after_commit.add(flush_dashboard_deltas)
+        frappe.db.after_rollback.add(discard_dashboard_deltas)
+
+    for card, delta in deltas.items():
+        pending[card] = pending.get(card, 0) + delta
+
+def discard_dashboard_deltas():
+    frappe.flags.hr_suite_dashboard_deltas = None
+
+def flush_dashboard_deltas():
+    """After commit: move the buffered deltas to Redis and schedule a publish"""
+    deltas = frappe.flags.hr_suite_dashboard_deltas
+    frappe.flags.hr_suite_dashboard_deltas = None
+    if not deltas:
+        return
+
+    try:
+        cache = frappe.cache()
+        pipeline = cache.pipeline()
+        for card, delta in deltas.items():
+            pipeline.hincrby(cache.make_key(PENDING_KEY), card, delta)
+        pipeline.execute()
+
+        # One publish job per window, later commits of the window ride along
+        if cache.set(cache.make_key(SCHEDULED_KEY), 1, nx=True, ex=COALESCE_SECONDS * 10):
+            frappe.enqueue("hr_suite.api.realtime.publish_dashboard_deltas", queue="short")
+    except Exception:
+        # Dashboards fall back to a manual refresh, the commit itself stands
+        frappe.log_error(title="HR Suite realtime")
+
+def publish_dashboard_deltas():
+    """Background job: publish everything buffered during the window"""
+    time.sleep(COALESCE_SECONDS)
+
+    cache = frappe.cache()
+    # Commits from here on schedule the next window
+    cache.delete(cache.make_key(SCHEDULED_KEY))
+
+    pipeline = cache.pipeline()
+    pipeline.hgetall(cache.make_key(PENDING_KEY))
+    pipeline.delete(cache.make_key(PENDING_KEY))
+    pending, _deleted = pipeline.execute()
+
+    deltas = {frappe.safe_decode(card): int(delta) for card, delta in pending.items() if int(delta)}
+    if deltas:
+        frappe.publish_realtime(EVENT, {"date": today(), "deltas": deltas}, doctype=ROOM_DOCTYPE, after_commit=False)
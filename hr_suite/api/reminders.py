@@ -0,0 +1,199 @@
+import frappe
+from frappe.utils import add_to_date, now_datetime, now, getdate, today, cint
+from hr_suite.api.performance import instrument
+
+# Daily reminder fan-out
+#
+# The daily run splits active employees into shards of at most SHARD_SIZE
+# consecutive names per company and records one "HR Suite Reminder Shard" row
+# per shard, named "<date>:<shard>". That name is the per-day idempotency key:
+# planning the same day again inserts nothing. Each shard runs as its own job
+# on the long queue, a batch of employees at a time. The reminders of a batch
+# are queued (Email Queue rows) in the same transaction that moves the shard's
+# `last_employee` checkpoint forward, so a killed worker resumes after the last
+# committed batch without sending anything twice.
+
+SHARD_SIZE = 500
+BATCH_SIZE = 100
+MAX_ATTEMPTS = 3
+STALE_AFTER_MINUTES = 30
+
+def get_reminders():
+    """Reminder functions, each taking (date, employee names) and returning the number sent"""
+    from hr_suite.tasks import send_birthday_reminders, send_probation_reminders, send_leave_balance_reminders
+
+    return [send_birthday_reminders, send_probation_reminders, send_leave_balance_reminders]
+
+def get_shard_name(date, shard):
+    return f"{getdate(date)}:{shard:05d}"
+
+@instrument
+def dispatch_reminders(date=None):
+    """
+    Plan today's shards unless already planned, then enqueue the ones waiting
+    """
+    date = getdate(date or today())
+
+    if not frappe.db.exists("HR Suite Reminder Shard", {"reminder_date": date}):
+        plan_shards(date)
+
+    enqueue_shards(date)
+
+def plan_shards(date):
+    """Insert the shard rows for a day, duplicates of a concurrent run are ignored"""
+    employees = frappe.get_all("Employee",
+        filters={"status": "Active"},
+        fields=["name", "company"],
+        order_by="company asc, name asc"
+    )
+
+    by_company = {}
+    for emp in employees:
+        by_company.setdefault(emp.company, []).append(emp.name)
+
+    timestamp = now()
+    user = frappe.session.user
+    rows = []
+    for company, names in by_company.items():
+        for start in range(0, len(names), SHARD_SIZE):
+            # Ranges are half open (last_employee, to_employee], the first and
+            # last of a company unbounded so employees added meanwhile are covered
+            last_employee = names[start - 1] if start else None
+            to_employee = names[start + SHARD_SIZE - 1] if start + SHARD_SIZE < len(names) else None
+            rows.append((
+                get_shard_name(date, len(rows)), date, len(rows), company, "Queued", 0,
+                last_employee, to_employee, 0,
+                timestamp, timestamp, user, user
+            ))
+
+    frappe.db.bulk_insert("HR Suite Reminder Shard", [
+        "name", "reminder_date", "shard", "company", "status", "attempts",
+        "last_employee", "to_employee", "sent",
+        "creation", "modified", "owner", "modified_by"
+    ], rows, ignore_duplicates=True)
+    frappe.db.commit()
+
+    return len(rows)
+
+def enqueue_shards(date):
+    """One long queue job per waiting shard of the day"""
+    shards = frappe.get_all("HR Suite Reminder Shard",
+        filters={"reminder_date": date, "status": "Queued"},
+        pluck="name",
+        order_by="shard asc"
+    )
+
+    for shard in shards:
+        frappe.enqueue(
+            "hr_suite.api.reminders.run_shard",
+            queue="long",
+            timeout=3600,
+            shard=shard,
+            enqueue_after_commit=True
+        )
+
+    return len(shards)
+
+@instrument
+def resume_reminders():
+    """
+    Hourly: give today's failed shards with attempts left, and shards left In
+    Progress by a killed worker, back to the queue and enqueue them
+    """
+    date = getdate(today())
+
+    frappe.db.sql("""
+        UPDATE `tabHR Suite Reminder Shard`
+        SET status = 'Queued', job_token = NULL
+        WHERE reminder_date = %(date)s
+        AND ((status = 'Failed' AND attempts < %(max_attempts)s)
+            OR (status = 'In Progress' AND modified < %(stale_before)s))
+    """, {
+        "date": date,
+        "max_attempts": MAX_ATTEMPTS,
+        "stale_before": add_to_date(now_datetime(), minutes=-STALE_AFTER_MINUTES)
+    })
+    frappe.db.commit()
+
+    enqueue_shards(date)
+
+def claim_shard(shard):
+    """Take a queued shard for this worker, returning its row or None"""
+    token = frappe.generate_hash(length=12)
+
+    frappe.db.sql("""
+        UPDATE `tabHR Suite Reminder Shard`
+        SET status = 'In Progress', job_token = %(token)s, attempts = attempts + 1, modified = %(now)s
+        WHERE name = %(shard)s
+        AND status = 'Queued'
+    """, {"token": token, "shard": shard, "now": now_datetime()})
+    frappe.db.commit()
+
+    return frappe.db.get_value("HR Suite Reminder Shard",
+        {"name": shard, "job_token": token, "status": "In Progress"},
+        ["name", "reminder_date", "company", "last_employee", "to_employee", "attempts"],
+        as_dict=True
+    )
+
+@instrument
+def run_shard(shard, batch_size=BATCH_SIZE):
+    """Background job: send the day's reminders for one shard, from its checkpoint"""
+    record = claim_shard(shard)
+    if not record:
+        return
+
+    reminders = get_reminders()
+    last_employee = record.last_employee
+
+    try:
+        while True:
+            employees = get_batch(record, last_employee, batch_size)
+            if not employees:
+                break
+
+            sent = sum(cint(reminder(record.reminder_date, employees)) for reminder in reminders)
+            last_employee = employees[-1]
+
+            frappe.db.sql("""
+                UPDATE `tabHR Suite Reminder Shard`
+                SET last_employee = %(last_employee)s, sent = sent + %(sent)s, modified = %(now)s
+                WHERE name = %(shard)s
+            """, {"last_employee": last_employee, "sent": sent, "shard": shard, "now": now_datetime()})
+            frappe.db.commit()
+
+        frappe.db.set_value("HR Suite Reminder Shard", shard, {
+            "status": "Completed",
+            "job_token": None,
+            "last_error": None
+        })
+        frappe.db.commit()
+
+    except Exception:
+        frappe.db.rollback()
+        frappe.db.set_value("HR Suite Reminder Shard", shard, {
+            "status": "Failed",
+            "job_token": None,
+            "last_error": frappe.get_traceback()
+        })
+        frappe.db.commit()
+
+        if record.attempts >= MAX_ATTEMPTS:
+            frappe.log_error(f"Daily reminders failed for shard {shard}", "HR Suite Reminders")
+
+def get_batch(record, last_employee, batch_size):
+    """Next active employees of the shard's range after the checkpoint"""
+    filters = [
+        ["status", "=", "Active"],
+        ["company", "=", record.company]
+    ]
+    if last_employee:
+        filters.append(["name", ">", last_employee])
+    if record.to_employee:
+        filters.append(["name", "<=", record.to_employee])
+
+    return frappe.get_all("Employee",
+        filters=filters,
+        pluck="name",
+        order_by="name asc",
+        limit_page_length=batch_size
+    )
@@ -0,0 +1,164 @@
+import frappe
+from frappe.utils import today, add_days, get_first_day, get_last_day, getdate
+from hr_suite.api.lists import (
+    BIRTHDAY_BUCKET, PAGE_SIZE,
+    get_list_specs, make_page,
+    probation_ending_conditions, upcoming_birthdays_conditions
+)
+from hr_suite.api.performance import instrument
+
+# Dashboard stats engine
+#
+# Every counter that lives on the same table is computed by a single
+# conditional-aggregation query, so a full dashboard load costs one round-trip
+# per table (Employee, Leave Application, Attendance) instead of one per widget.
+
+@instrument
+def get_employee_stats(birthday_days=7, probation_days=30):
+    """
+    Headcounts plus the first page of each employee list in one query
+
+    The aggregate branch and the list branches are combined with UNION ALL and
+    told apart by the `section` column. List branches are capped at one page
+    and carry their sort values, so `hr_suite.api.lists` can continue from the
+    cursor handed out here.
+    """
+    specs = get_list_specs()
+    params = {}
+    probation_condition = probation_ending_conditions(params, probation_days)
+    birthday_condition = upcoming_birthdays_conditions(params, birthday_days)
+
+    rows = frappe.db.sql("""
+        SELECT
+            'summary' AS section,
+            NULL AS name, NULL AS employee_name, NULL AS designation, NULL AS department,
+            NULL AS date_of_birth, NULL AS event_date,
+            NULL AS sort_0, NULL AS sort_1, NULL AS sort_2,
+            COUNT(*) AS total,
+            SUM(CASE WHEN status = 'Active' THEN 1 ELSE 0 END) AS active,
+            SUM(CASE WHEN {probation} THEN 1 ELSE 0 END) AS probation,
+            SUM(CASE WHEN {birthday} THEN 1 ELSE 0 END) AS birthdays
+        FROM `tabEmployee`
+        UNION ALL
+        (SELECT
+            'probation_ending', name, employee_name, designation, department,
+            NULL, final_confirmation_date,
+            final_confirmation_date, name, NULL,
+            0, 0, 0, 0
+        FROM `tabEmployee`
+        WHERE {probation}
+        ORDER BY final_confirmation_date ASC, name ASC
+        LIMIT {limit})
+        UNION ALL
+        (SELECT
+            'upcoming_birthdays', name, employee_name, NULL, department,
+            date_of_birth, NULL,
+            {bucket}, birthday_key, name,
+            0, 0, 0, 0
+        FROM `tabEmployee`
+        WHERE {birthday}
+        ORDER BY {bucket} ASC, birthday_key ASC, name ASC
+        LIMIT {limit})
+    """.format(
+        probation=probation_condition,
+        birthday=birthday_condition,
+        bucket=BIRTHDAY_BUCKET,
+        limit=PAGE_SIZE + 1
+    ), params, as_dict=True)
+
+    summary = frappe._dict()
+    list_rows = {"probation_ending": [], "upcoming_birthdays": []}
+
+    for row in rows:
+        if row.section == "summary":
+            summary = row
+            continue
+
+        row.final_confirmation_date = row.event_date
+        list_rows[row.section].append(frappe._dict(
+            {field: row.get(field) for field in specs[row.section]["fields"]},
+            **{f"sort_{i}": row.get(f"sort_{i}") for i in range(3)}
+        ))
+
+    def get_list_summary(list_name, count):
+        page = make_page(specs[list_name], list_rows[list_name], PAGE_SIZE)
+        return {"count": int(count or 0), **page}
+
+    return {
+        "total_employees": int(summary.total or 0),
+        "active_employees": int(summary.active or 0),
+        "upcoming_birthdays": get_list_summary("upcoming_birthdays", summary.birthdays),
+        "probation_ending": get_list_summary("probation_ending", summary.probation)
+    }
+
+@instrument
+def get_leave_stats():
+    """
+    Pending and per leave type usage in one query
+
+    Leave crossing a month boundary counts for its share of days in this month,
+    as in `hr_suite.api.leave_analytics`.
+    """
+    current_date = getdate(today())
+    params = {
+        "first_day": get_first_day(current_date),
+        "last_day": get_last_day(current_date),
+    }
+
+    rows = frappe.db.sql("""
+        SELECT
+            leave_type,
+            SUM(CASE WHEN status = 'Open' AND docstatus = 0
+                THEN 1 ELSE 0 END) AS pending,
+            SUM(CASE WHEN status = 'Approved' AND docstatus = 1
+                THEN 1 ELSE 0 END) AS applications,
+            ROUND(SUM(CASE WHEN status = 'Approved' AND docstatus = 1
+                THEN total_leave_days
+                    * (DATEDIFF(LEAST(to_date, %(last_day)s), GREATEST(from_date, %(first_day)s)) + 1)
+                    / (DATEDIFF(to_date, from_date) + 1)
+                ELSE 0 END), 2) AS total_days
+        FROM `tabLeave Application`
+        WHERE (status = 'Open' AND docstatus = 0)
+        OR (status = 'Approved' AND docstatus = 1
+            AND to_date >= %(first_day)s AND from_date <= %(last_day)s)
+        GROUP BY leave_type
+    """, params, as_dict=True)
+
+    leave_type_usage = [
+        {"leave_type": row.leave_type, "applications": int(row.applications), "total_days": row.total_days}
+        for row in rows if row.applications
+    ]
+    leave_type_usage.sort(key=lambda d: d["total_days"] or 0, reverse=True)
+
+    return {
+        "pending_leave_applications": int(sum(row.pending or 0 for row in rows)),
+        "leave_type_usage": leave_type_usage
+    }
+
+@instrument
+def get_attendance_stats(days=30):
+    """
+    Today's present count and the N day status summary in one query
+
+    Read from the daily attendance rollup rather than raw attendance.
+    """
+    current_date = getdate(today())
+
+    rows = frappe.db.sql("""
+        SELECT
+            status,
+            SUM(count) AS count,
+            SUM(CASE WHEN attendance_date = %(today)s THEN count ELSE 0 END) AS today_count
+        FROM `tabHR Suite Attendance Rollup`
+        WHERE attendance_date >= %(from_date)s
+        AND attendance_date <= %(today)s
+        GROUP BY status
+        HAVING SUM(count) > 0
+    """, {"today": current_date, "from_date": getdate(add_days(current_date, -days))}, as_dict=True)
+
+    present_today = sum(row.today_count or 0 for row in rows if row.status == "Present")
+
+    return {
+        "present_today": int(present_today),
+        "attendance_summary": [{"status": row.status, "count": int(row.count)} for row in rows]
+    }
@@ -0,0 +1,319 @@
+import time
+
+import frappe
+from frappe import _
+from frappe.utils import now, cint, validate_email_address
+from hr_suite.api.performance import instrument
+
+# Bulk user provisioning
+#
+# Creates the User accounts of many employees at once. The employees, the
+# users that already exist and the users already linked to an employee are
+# read up front, every row is checked, and the valid ones are written batch by
+# batch: Users, Has Role and User Permission rows in one insert per table, and
+# Employee.user_id in one UPDATE, without loading or saving any document. A
+# batch that fails is rolled back to its savepoint and reported row by row.
+# Welcome emails go to a Redis list worked through by one background job,
+# a few at a time, so a migration does not flood the email queue.
+
+BATCH_SIZE = 200
+DEFAULT_ROLE = "Employee Self Service"
+EMAIL_BATCH_SIZE = 20
+EMAIL_INTERVAL_SECONDS = 30
+EMAIL_QUEUE_KEY = "hr_suite:welcome_emails"
+
+HAS_ROLE_FIELDS = ["name", "parent", "parenttype", "parentfield", "role", "idx",
+    "creation", "modified", "owner", "modified_by", "docstatus"]
+USER_PERMISSION_FIELDS = ["name", "user", "allow", "for_value", "apply_to_all_doctypes", "is_default",
+    "hide_descendants", "creation", "modified", "owner", "modified_by", "docstatus"]
+
+@instrument
+def provision_users(employees=None, company=None, role=DEFAULT_ROLE, send_welcome_email=True,
+        dry_run=False, batch_size=BATCH_SIZE, commit=False):
+    """
+    Create and link a User for every active employee without one
+
+    Employees are given as a list, or all of a company. The user is the
+    employee's company email; an existing User with that email is linked
+    instead of created, and keeps its roles: `role` is only given to the
+    Users created here. Employees with "Create User Permission" set are
+    restricted to their own Employee and Company, as HRMS does on save.
+
+    Returns {"planned": [...], "created": [...], "linked": [...],
+    "skipped": [...], "failed": [...]}, one row per employee.
+    """
+    if not employees and not company:
+        frappe.throw(_("Pass employees or a company"))
+
+    result = plan_users(get_employees_to_provision(employees, company))
+    result.update({"created": [], "linked": []})
+
+    if dry_run:
+        return result
+
+    provisioned = []
+    for start in range(0, len(result["planned"]), batch_size):
+        batch = result["planned"][start:start + batch_size]
+        if provision_batch(batch, role, result):
+            provisioned.extend(row["user"] for row in batch)
+
+        if commit:
+            frappe.db.commit()
+
+    if provisioned:
+        clear_portal_cache(provisioned)
+        if send_welcome_email:
+            queue_welcome_emails(provisioned)
+
+        if commit:
+            frappe.db.commit()
+
+    return result
+
+def get_employees_to_provision(employees=None, company=None):
+    filters = {"status": "Active", "user_id": ["is", "not set"]}
+    if employees:
+        filters["name"] = ["in", list(employees)]
+    if company:
+        filters["company"] = company
+
+    return frappe.get_all("Employee",
+        filters=filters,
+        fields=["name", "employee_name", "first_name", "last_name", "company", "company_email",
+            "create_user_permission"],
+        order_by="name asc"
+    )
+
+def plan_users(employees):
+    """Rows to provision, and the employees skipped or refused with the reason"""
+    emails = {emp.name: (emp.company_email or "").strip().lower() for emp in employees}
+    candidates = list({email for email in emails.values() if email})
+
+    existing_users = set()
+    linked_users = {}
+    if candidates:
+        existing_users = set(frappe.get_all("User", filters={"name": ["in", candidates]}, pluck="name"))
+        linked_users = dict(frappe.get_all("Employee",
+            filters={"user_id": ["in", candidates]},
+            fields=["user_id", "name"],
+            as_list=True
+        ))
+
+    result = {"planned": [], "skipped": [], "failed": []}
+    seen = set()
+
+    for emp in employees:
+        email = emails[emp.name]
+        row = {"employee": emp.name, "user": email or None}
+
+        if not email:
+            result["skipped"].append({**row, "error": _("No company email")})
+        elif not validate_email_address(email):
+            result["failed"].append({**row, "error": _("Invalid email address")})
+        elif email in linked_users:
+            result["failed"].append({**row, "error": _("User already linked to employee {0}").format(linked_users[email])})
+        elif email in seen:
+            result["failed"].append({**row, "error": _("Email shared with another employee")})
+        else:
+            seen.add(email)
+            result["planned"].append({
+                **row,
+                "first_name": emp.first_name or emp.employee_name,
+                "last_name": emp.last_name,
+                "full_name": emp.employee_name,
+                "company": emp.company,
+                "create_user_permission": cint(emp.create_user_permission),
+                "exists": email in existing_users
+            })
+
+    return result
+
+def provision_batch(rows, role, result):
+    """Write one batch, recording each row as created, linked or failed"""
+    savepoint = "hr_suite_user_provisioning"
+    frappe.db.savepoint(savepoint)
+
+    try:
+        new_rows = [row for row in rows if not row["exists"]]
+        create_users(new_rows)
+        add_roles([row["user"] for row in new_rows], role)
+        add_user_permissions([row for row in rows if row["create_user_permission"]])
+        link_employees(rows)
+
+    except Exception as e:
+        frappe.db.rollback(save_point=savepoint)
+        result["failed"].extend({"employee": row["employee"], "user": row["user"], "error": str(e)} for row in rows)
+        return False
+
+    for row in rows:
+        result["linked" if row["exists"] else "created"].append({"employee": row["employee"], "user": row["user"]})
+
+    return True
+
+def get_audit_values():
+    timestamp = now()
+    user = frappe.session.user
+    return timestamp, timestamp, user, user, 0
+
+def create_users(rows):
+    """Insert Users in one statement, with the User defaults filled in"""
+    if not rows:
+        return
+
+    from hr_suite.seed import bulk_insert_records
+
+    bulk_insert_records("User", "email", [
+        {
+            "email": row["user"],
+            "first_name": row["first_name"],
+            "last_name": row["last_name"],
+            "full_name": row["full_name"],
+            "enabled": 1,
+            "user_type": "System User",
+            "send_welcome_email": 0
+        }
+        for row in rows
+    ])
+
+def add_roles(users, role):
+    """Give the role to every user missing it"""
+    if not users:
+        return
+
+    state = {
+        parent: (cint(idx), cint(has_role))
+        for parent, idx, has_role in frappe.db.sql("""
+            SELECT parent, MAX(idx), MAX(role = %(role)s)
+            FROM `tabHas Role`
+            WHERE parenttype = 'User'
+            AND parent IN %(users)s
+            GROUP BY parent
+        """, {"role": role, "users": tuple(users)})
+    }
+
+    audit = get_audit_values()
+    rows = []
+    for user in users:
+        idx, has_role = state.get(user, (0, 0))
+        if not has_role:
+            rows.append((frappe.generate_hash(length=10), user, "User", "roles", role, idx + 1, *audit))
+
+    if rows:
+        frappe.db.bulk_insert("Has Role", HAS_ROLE_FIELDS, rows)
+
+def add_user_permissions(rows):
+    """Restrict users to their own Employee and Company"""
+    if not rows:
+        return
+
+    existing = set(frappe.db.sql("""
+        SELECT user, allow, for_value
+        FROM `tabUser Permission`
+        WHERE user IN %(users)s
+        AND allow IN ('Employee', 'Company')
+    """, {"users": tuple(row["user"] for row in rows)}))
+
+    audit = get_audit_values()
+    values = []
+    for row in rows:
+        for allow, for_value in (("Employee", row["employee"]), ("Company", row["company"])):
+            if for_value and (row["user"], allow, for_value) not in existing:
+                values.append((frappe.generate_hash(length=10), row["user"], allow, for_value, 1, 0, 0, *audit))
+
+    if values:
+        frappe.db.bulk_insert("User Permission", USER_PERMISSION_FIELDS, values)
+
+def link_employees(rows):
+    """Set Employee.user_id for the whole batch in one statement"""
+    cases = " ".join(["WHEN %s THEN %s"] * len(rows))
+    values = [value for row in rows for value in (row["employee"], row["user"])]
+    timestamp, _modified, user, _modified_by, _docstatus = get_audit_values()
+
+    frappe.db.sql(f"""
+        UPDATE `tabEmployee`
+        SET user_id = CASE name {cases} END,
+            modified = %s,
+            modified_by = %s
+        WHERE name IN %s
+    """, (*values, timestamp, user, tuple(row["employee"] for row in rows)))
+
+def clear_portal_cache(users):
+    """Users who opened the portal before being linked have an empty context cached"""
+    from hr_suite.api.portal import get_cache_key
+
+    keys = [get_cache_key(user) for user in users]
+
+    def delete():
+        frappe.cache().delete_value(keys)
+
+    delete()
+    frappe.db.after_commit.add(delete)
+
+def queue_welcome_emails(users):
+    """Add users to the welcome email queue once the transaction commits"""
+    def push():
+        cache = frappe.cache()
+        cache.rpush(cache.make_key(EMAIL_QUEUE_KEY), *users)
+        schedule_welcome_emails()
+
+    frappe.db.after_commit.add(push)
+
+def schedule_welcome_emails():
+    """Enqueue the sender unless it is already queued or running; also runs hourly"""
+    cache = frappe.cache()
+    if cache.llen(cache.make_key(EMAIL_QUEUE_KEY)):
+        frappe.enqueue(
+            "hr_suite.api.user_provisioning.send_welcome_emails",
+            queue="long",
+            timeout=6 * 3600,
+            job_id="hr_suite_welcome_emails",
+            deduplicate=True
+        )
+
+@instrument
+def send_welcome_emails(batch_size=EMAIL_BATCH_SIZE, interval=EMAIL_INTERVAL_SECONDS):
+    """
+    Background job: send queued welcome emails, `batch_size` every `interval` seconds
+
+    A batch leaves the queue only once sent, so a killed job resends at most
+    one batch.
+    """
+    cache = frappe.cache()
+    key = cache.make_key(EMAIL_QUEUE_KEY)
+
+    while True:
+        users = [frappe.safe_decode(user) for user in cache.lrange(key, 0, batch_size - 1)]
+        if not users:
+            break
+
+        for user in users:
+            try:
+                if frappe.db.get_value("User", user, "enabled"):
+                    frappe.get_doc("User", user).send_welcome_mail_to_user()
+                frappe.db.commit()
+            except Exception:
+                frappe.db.rollback()
+                frappe.log_error(f"Welcome email failed for {user}", "HR Suite User Provisioning")
+
+        cache.ltrim(key, len(users), -1)
+        if cache.llen(key):
+            time.sleep(interval)
+
+@frappe.whitelist()
+@instrument
+def provision_employee_users(employees=None, company=None, send_welcome_email=1, dry_run=0):
+    """
+    Create User accounts for employees without one
+
+    New users get the Employee Self Service role. See `provision_users`; for migrations of thousands of employees prefer
+    `bench provision-hr-users`, which commits batch by batch.
+    """
+    frappe.only_for(["HR Manager", "HR Manager Suite", "System Manager"])
+
+    return provision_users(
+        employees=frappe.parse_json(employees) if employees else None,
+        company=company,
+        role=DEFAULT_ROLE,
+        send_welcome_email=cint(send_welcome_email),
+        dry_run=cint(dry_run)
+    )
@@ -0,0 +1,335 @@
+import json
+import random
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+
+import frappe
+from frappe.utils import getdate, today, now, add_months, get_first_day, get_last_day
+
+# Dashboard benchmarks
+#
+# Seeds a throwaway site with synthetic Employees, Attendance and Leave
+# Applications through bulk inserts, times every dashboard function and the
+# daily tasks with cold and warm caches, and writes the results as JSON that a
+# later run can be compared against. Only runs on sites that opt in with
+# `hr_suite_allow_benchmark: 1` in site config.
+
+PREFIX = "HRBENCH"
+CHUNK_SIZE = 10000
+DEFAULT_VOLUMES = {
+    "employees": 1000,
+    "attendance": 50000,
+    "leave_applications": 5000
+}
+DEPARTMENTS = ["Human Resources", "Operations", "Finance", "Sales", "Marketing", "IT", "Administration", "Customer Support"]
+DESIGNATIONS = ["Manager", "Senior Developer", "Developer", "HR Executive", "Sales Executive", "Accountant"]
+ATTENDANCE_STATUSES = (["Present"] * 16) + ["Absent", "On Leave", "Half Day", "Work From Home"]
+LEAVE_STATUSES = ["Open", "Approved", "Approved", "Approved", "Rejected"]
+STANDARD_FIELDS = ["creation", "modified", "owner", "modified_by"]
+# Reminder shards are planned on a date no real run will reach
+REMINDER_DATE = "2099-12-31"
+# Benchmarks that commit writes, never run outside a benchmark site
+WRITING_BENCHMARKS = {"reminders.plan_and_run_shards"}
+
+def check_site():
+    if not frappe.conf.get("hr_suite_allow_benchmark"):
+        frappe.throw("Benchmarks write synthetic data. Set hr_suite_allow_benchmark in site config to run them.")
+
+def get_benchmarks():
+    """Benchmarked functions as name -> callable"""
+    from hr_suite.api import dashboard, headcount, leave_analytics, leave_calendar
+    from hr_suite.api.leave_balance import get_leave_balances
+    from hr_suite.api.lists import get_list_specs, get_list_page
+    from hr_suite.api.metrics import METRICS, get_metrics
+    from hr_suite.hr_suite_dashboard.page.hr_suite_dashboard import hr_suite_dashboard
+
+    benchmarks = {
+        "api.get_hr_stats": dashboard.get_hr_stats,
+        "page.get_hr_stats": hr_suite_dashboard.get_hr_stats,
+        "get_active_employees": dashboard.get_active_employees,
+        "get_on_leave_count": dashboard.get_on_leave_count,
+        "get_present_count": dashboard.get_present_count,
+        "get_pending_leaves": dashboard.get_pending_leaves,
+        "get_upcoming_birthdays": dashboard.get_upcoming_birthdays,
+        "get_department_wise_count": dashboard.get_department_wise_count,
+        "get_attendance_summary_30": lambda: dashboard.get_attendance_summary(days=30),
+        "get_attendance_summary_365": lambda: dashboard.get_attendance_summary(days=365, group_by="department,status"),
+        "get_leave_balances_department": lambda: get_leave_balances(department=DEPARTMENTS[0], aggregate=1),
+        "get_on_leave_month": lambda: leave_calendar.get_on_leave(from_date=get_first_day(today()), to_date=get_last_day(today())),
+        "get_team_absence_heatmap": leave_calendar.get_team_absence_heatmap,
+        "get_leave_usage_year": leave_analytics.get_leave_usage,
+        "get_headcount_history_5y": lambda: headcount.get_headcount_history(
+            from_date=add_months(today(), -60), by_department=1
+        ),
+        "reminders.plan_and_run_shards": run_reminder_shards
+    }
+
+    for name in METRICS:
+        benchmarks[f"metric.{name}"] = lambda name=name: get_metrics([name])
+
+    for name in get_list_specs():
+        benchmarks[f"list.{name}"] = lambda name=name: get_list_page(name, limit=50)
+
+    return benchmarks
+
+def run_reminder_shards(date=REMINDER_DATE):
+    """
+    Plan and run every reminder shard of a scratch date inline, then drop the shards
+
+    Jobs are not enqueued, and every run plans afresh instead of finding the
+    date already planned.
+    """
+    from hr_suite.api.reminders import plan_shards, run_shard
+
+    try:
+        plan_shards(date)
+        for shard in frappe.get_all("HR Suite Reminder Shard", filters={"reminder_date": date}, pluck="name"):
+            run_shard(shard)
+    finally:
+        frappe.db.delete("HR Suite Reminder Shard", {"reminder_date": date})
+        frappe.db.commit()
+
+@contextmanager
+def count_queries():
+    """Count and time every frappe.db.sql call made inside the block"""
+    stats = {"queries": 0, "query_time": 0.0}
+    original_sql = frappe.db.sql
+
+    def sql(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return original_sql(*args, **kwargs)
+        finally:
+            stats["queries"] += 1
+            stats["query_time"] += time.perf_counter() - start
+
+    frappe.db.sql = sql
+    try:
+        yield stats
+    finally:
+        frappe.db.sql = original_sql
+
+def clear_caches():
+    """Drop HR Suite caches so the next call runs cold"""
+    from hr_suite.api.cache import clear_stats_cache
+    from hr_suite.api.headcount import clear_headcount_history
+
+    clear_stats_cache()
+    clear_headcount_history()
+    frappe.local.cache = {}
+
+def measure(fn, repeat):
+    """Median wall time and the query stats of the median run"""
+    runs = []
+    for _i in range(repeat):
+        with count_queries() as stats:
+            start = time.perf_counter()
+            fn()
+            stats["wall_time"] = time.perf_counter() - start
+        runs.append(stats)
+
+    runs.sort(key=lambda run: run["wall_time"])
+    median = runs[len(runs) // 2]
+    return {
+        "wall_time": round(median["wall_time"], 6),
+        "query_time": round(median["query_time"], 6),
+        "queries": median["queries"]
+    }
+
+def run_benchmarks(repeat=5, only=None):
+    """
+    Time every benchmark cold (caches cleared before each run) and warm
+    """
+    frappe.set_user("Administrator")
+    results = {}
+
+    for name, fn in get_benchmarks().items():
+        if only and not any(pattern in name for pattern in only):
+            continue
+
+        def cold():
+            clear_caches()
+            fn()
+
+        fn()
+        results[name] = {
+            "cold": measure(cold, repeat),
+            "warm": measure(fn, repeat)
+        }
+        frappe.db.rollback()
+
+    return results
+
+def compare_results(results, baseline, tolerance=0.2):
+    """
+    Regressions against a baseline: slower by more than `tolerance` or more queries
+    """
+    regressions = []
+    for name, modes in results.items():
+        for mode, current in modes.items():
+            previous = baseline.get("results", {}).get(name, {}).get(mode)
+            if not previous:
+                continue
+
+            if current["queries"] > previous["queries"]:
+                regressions.append(f"{name} [{mode}]: {previous['queries']} -> {current['queries']} queries")
+
+            if current["wall_time"] > previous["wall_time"] * (1 + tolerance):
+                regressions.append(f"{name} [{mode}]: {previous['wall_time']:.4f}s -> {current['wall_time']:.4f}s")
+
+    return regressions
+
+def write_results(path, volumes, results):
+    data = {
+        "site": frappe.local.site,
+        "timestamp": now(),
+        "volumes": volumes,
+        "results": results
+    }
+    with open(path, "w") as f:
+        json.dump(data, f, indent=1, sort_keys=True)
+    return data
+
+def load_results(path):
+    with open(path) as f:
+        return json.load(f)
+
+def seed(employees=None, attendance=None, leave_applications=None, seed_value=42):
+    """
+    Bulk insert synthetic data and rebuild the derived HR Suite stores
+    """
+    check_site()
+    rng = random.Random(seed_value)
+    volumes = {
+        "employees": employees or DEFAULT_VOLUMES["employees"],
+        "attendance": attendance or DEFAULT_VOLUMES["attendance"],
+        "leave_applications": leave_applications or DEFAULT_VOLUMES["leave_applications"]
+    }
+
+    company = frappe.defaults.get_defaults().company or frappe.db.get_value("Company", {}, "name")
+    leave_types = frappe.get_all("Leave Type", pluck="name") or ["Casual Leave"]
+
+    employee_rows = list(seed_employees(rng, volumes["employees"], company))
+    seed_attendance(rng, employee_rows, volumes["attendance"], company)
+    seed_leave_applications(rng, employee_rows, volumes["leave_applications"], company, leave_types)
+
+    from hr_suite.hr_suite_dashboard.doctype.hr_suite_counter.hr_suite_counter import rebuild_counters
+    from hr_suite.hr_suite_dashboard.doctype.hr_suite_attendance_rollup.hr_suite_attendance_rollup import backfill_attendance_rollup
+    from hr_suite.hr_suite_dashboard.doctype.hr_suite_leave_day.hr_suite_leave_day import backfill_leave_calendar
+
+    rebuild_counters()
+    backfill_attendance_rollup()
+    backfill_leave_calendar()
+    frappe.db.commit()
+
+    return volumes
+
+def insert_chunks(doctype, fields, rows):
+    """Bulk insert a row iterator chunk by chunk, committing as it goes"""
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= CHUNK_SIZE:
+            frappe.db.bulk_insert(doctype, fields, chunk)
+            frappe.db.commit()
+            chunk = []
+
+    if chunk:
+        frappe.db.bulk_insert(doctype, fields, chunk)
+        frappe.db.commit()
+
+def get_standard_values():
+    timestamp = now()
+    return (timestamp, timestamp, "Administrator", "Administrator")
+
+def seed_employees(rng, count, company):
+    """Insert employees and yield (name, employee_name, department) for each"""
+    current_date = getdate(today())
+    fields = ["name", "first_name", "employee_name", "company", "status", "gender",
+        "date_of_birth", "birthday_key", "date_of_joining", "final_confirmation_date",
+        "department", "designation", "docstatus"] + STANDARD_FIELDS
+    seeded = []
+
+    def rows():
+        standard = get_standard_values()
+        for i in range(count):
+            name = f"{PREFIX}-EMP-{i:07d}"
+            employee_name = f"Bench Employee {i}"
+            department = rng.choice(DEPARTMENTS)
+            date_of_birth = current_date - timedelta(days=rng.randint(20 * 365, 60 * 365))
+            date_of_joining = current_date - timedelta(days=rng.randint(0, 15 * 365))
+            seeded.append((name, employee_name, department))
+            yield (
+                name, employee_name, employee_name, company,
+                "Active" if rng.random() < 0.9 else "Left",
+                rng.choice(["Male", "Female"]),
+                date_of_birth, date_of_birth.month * 100 + date_of_birth.day,
+                date_of_joining, date_of_joining + timedelta(days=180),
+                department, rng.choice(DESIGNATIONS), 0
+            ) + standard
+
+    insert_chunks("Employee", fields, rows())
+    return seeded
+
+def seed_attendance(rng, employees, count, company):
+    """Insert daily attendance going back from today until `count` rows exist"""
+    current_date = getdate(today())
+    fields = ["name", "employee", "employee_name", "department", "company",
+        "attendance_date", "status", "docstatus"] + STANDARD_FIELDS
+
+    def rows():
+        standard = get_standard_values()
+        produced = 0
+        day = 0
+        while produced < count:
+            attendance_date = current_date - timedelta(days=day)
+            for employee, employee_name, department in employees:
+                if produced >= count:
+                    break
+                yield (
+                    f"{PREFIX}-ATT-{produced:09d}", employee, employee_name, department, company,
+                    attendance_date, rng.choice(ATTENDANCE_STATUSES), 1
+                ) + standard
+                produced += 1
+            day += 1
+
+    insert_chunks("Attendance", fields, rows())
+
+def seed_leave_applications(rng, employees, count, company, leave_types):
+    """Insert leave applications spread over the past year and the next month"""
+    current_date = getdate(today())
+    fields = ["name", "employee", "employee_name", "department", "company", "leave_type",
+        "from_date", "to_date", "total_leave_days", "posting_date", "status", "docstatus"] + STANDARD_FIELDS
+
+    def rows():
+        standard = get_standard_values()
+        for i in range(count):
+            employee, employee_name, department = rng.choice(employees)
+            from_date = current_date + timedelta(days=rng.randint(-365, 30))
+            days = rng.randint(1, 5)
+            status = rng.choice(LEAVE_STATUSES)
+            yield (
+                f"{PREFIX}-LA-{i:08d}", employee, employee_name, department, company,
+                rng.choice(leave_types), from_date, from_date + timedelta(days=days - 1), days,
+                from_date, status, 0 if status == "Open" else 1
+            ) + standard
+
+    insert_chunks("Leave Application", fields, rows())
+
+def cleanup():
+    """Delete every synthetic row and rebuild the derived stores"""
+    check_site()
+
+    for doctype in ("Attendance", "Leave Application", "Employee"):
+        frappe.db.sql(f"DELETE FROM `tab{doctype}` WHERE name LIKE %s", f"{PREFIX}-%")
+        frappe.db.commit()
+
+    from hr_suite.hr_suite_dashboard.doctype.hr_suite_counter.hr_suite_counter import rebuild_counters
+    from hr_suite.hr_suite_dashboard.doctype.hr_suite_attendance_rollup.hr_suite_attendance_rollup import backfill_attendance_rollup
+    from hr_suite.hr_suite_dashboard.doctype.hr_suite_leave_day.hr_suite_leave_day import backfill_leave_calendar
+
+    rebuild_counters()
+    backfill_attendance_rollup()
+    backfill_leave_calendar()
+    frappe.db.commit()
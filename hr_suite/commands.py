@@ -0,0 +1,358 @@
+import click
+from frappe.commands import pass_context
+from frappe.exceptions import SiteNotSpecifiedError
+
+@click.command("rebuild-hr-counters")
+@click.option("--attendance-from", help="Only reconcile attendance counters from this date (YYYY-MM-DD)")
+@pass_context
+def rebuild_hr_counters(context, attendance_from=None):
+    """Rebuild HR Suite counters from scratch and report drift"""
+    import frappe
+    from hr_suite.hr_suite_dashboard.doctype.hr_suite_counter.hr_suite_counter import rebuild_counters
+
+    if not context.sites:
+        raise SiteNotSpecifiedError
+
+    for site in context.sites:
+        frappe.init(site=site)
+        frappe.connect()
+        try:
+            drift = rebuild_counters(attendance_from=attendance_from)
+            frappe.db.commit()
+
+            for row in drift:
+                click.echo(f"{site}: {row['counter']} {row['stored']} -> {row['expected']}")
+            click.echo(f"{site}: {len(drift)} counter(s) reconciled")
+        finally:
+            frappe.destroy()
+
+@click.command("allocate-hr-leaves")
+@click.option("--company", required=True, help="Company to allocate for")
+@click.option("--year", type=int, help="Leave year, defaults to the current year")
+@click.option("--dry-run", is_flag=True, default=False, help="Only print the allocations that would be created")
+@pass_context
+def allocate_hr_leaves(context, company, year=None, dry_run=False):
+    """Allocate a leave year for every active employee of a company"""
+    import frappe
+    from hr_suite.api.leave_allocation import allocate_company_leaves
+
+    if not context.sites:
+        raise SiteNotSpecifiedError
+
+    for site in context.sites:
+        frappe.init(site=site)
+        frappe.connect()
+        try:
+            result = allocate_company_leaves(company, year=year, dry_run=dry_run)
+
+            if dry_run:
+                for row in result["planned"]:
+                    click.echo(f"{site}: + {row['employee']} {row['leave_type']} "
+                        f"{row['from_date']}..{row['to_date']} {row['new_leaves_allocated']}")
+
+            for row in result["failed"]:
+                click.echo(f"{site}: ! {row['employee']} {row['leave_type']}: {row['error']}")
+
+            click.echo(f"{site}: {len(result['planned'])} planned, {len(result['created'])} created, "
+                f"{len(result['failed'])} failed, {result['existing']} already allocated")
+        finally:
+            frappe.destroy()
+
+@click.command("backfill-attendance-rollup")
+@click.option("--from-date", help="First attendance date to rebuild (YYYY-MM-DD)")
+@click.option("--to-date", help="Last attendance date to rebuild (YYYY-MM-DD)")
+@pass_context
+def backfill_attendance_rollup(context, from_date=None, to_date=None):
+    """Rebuild the daily attendance rollup from submitted Attendance"""
+    import frappe
+    from hr_suite.hr_suite_dashboard.doctype.hr_suite_attendance_rollup.hr_suite_attendance_rollup import (
+        backfill_attendance_rollup as backfill
+    )
+
+    if not context.sites:
+        raise SiteNotSpecifiedError
+
+    for site in context.sites:
+        frappe.init(site=site)
+        frappe.connect()
+        try:
+            rows = backfill(from_date=from_date, to_date=to_date)
+            frappe.db.commit()
+            click.echo(f"{site}: {rows} rollup row(s) written")
+        finally:
+            frappe.destroy()
+
+@click.command("run-hr-benchmarks")
+@click.option("--seed", "seed_data", is_flag=True, default=False, help="Bulk insert synthetic data before timing")
+@click.option("--employees", type=int, help="Synthetic employees to seed")
+@click.option("--attendance", type=int, help="Synthetic attendance rows to seed")
+@click.option("--leave-applications", type=int, help="Synthetic leave applications to seed")
+@click.option("--repeat", type=int, default=5, help="Runs per benchmark, the median is reported")
+@click.option("--only", multiple=True, help="Only run benchmarks whose name contains this")
+@click.option("--output", default="hr_suite_benchmarks.json", help="Write results to this JSON file")
+@click.option("--baseline", help="Compare against an earlier results file and fail on regressions")
+@click.option("--tolerance", type=float, default=0.2, help="Allowed slowdown against the baseline (0.2 = 20%)")
+@click.option("--cleanup", is_flag=True, default=False, help="Delete the synthetic data afterwards")
+@pass_context
+def run_hr_benchmarks(context, seed_data=False, employees=None, attendance=None, leave_applications=None,
+        repeat=5, only=None, output=None, baseline=None, tolerance=0.2, cleanup=False):
+    """Time the dashboard and daily tasks on a throwaway site"""
+    import frappe
+    from hr_suite import benchmark
+
+    if not context.sites:
+        raise SiteNotSpecifiedError
+
+    failed = False
+    for site in context.sites:
+        frappe.init(site=site)
+        frappe.connect()
+        try:
+            benchmark.check_site()
+
+            volumes = None
+            if seed_data:
+                volumes = benchmark.seed(employees, attendance, leave_applications)
+                click.echo(f"{site}: seeded {volumes}")
+
+            results = benchmark.run_benchmarks(repeat=repeat, only=only)
+            benchmark.write_results(output, volumes, results)
+
+            for name, modes in results.items():
+                click.echo(f"{site}: {name:<40} "
+                    f"cold {modes['cold']['wall_time'] * 1000:9.2f}ms {modes['cold']['queries']:4} queries  "
+                    f"warm {modes['warm']['wall_time'] * 1000:9.2f}ms {modes['warm']['queries']:4} queries")
+            click.echo(f"{site}: results written to {output}")
+
+            if baseline:
+                regressions = benchmark.compare_results(results, benchmark.load_results(baseline), tolerance)
+                for regression in regressions:
+                    click.echo(f"{site}: ! {regression}")
+                failed = failed or bool(regressions)
+
+            if cleanup:
+                benchmark.cleanup()
+        finally:
+            frappe.destroy()
+
+    if failed:
+        raise SystemExit(1)
+
+@click.command("hr-performance")
+@click.option("--reset", is_flag=True, default=False, help="Clear the recorded samples")
+@pass_context
+def hr_performance(context, reset=False):
+    """Show rolling latency and query stats of instrumented HR Suite functions"""
+    import frappe
+    from hr_suite.api.performance import get_stats, is_enabled, reset_stats
+
+    if not context.sites:
+        raise SiteNotSpecifiedError
+
+    for site in context.sites:
+        frappe.init(site=site)
+        frappe.connect()
+        try:
+            if reset:
+                click.echo(f"{site}: cleared samples of {reset_stats()} function(s)")
+                continue
+
+            if not is_enabled():
+                click.echo(f"{site}: instrumentation is off, set hr_suite_instrumentation in site config")
+
+            for row in get_stats():
+                click.echo(f"{site}: {row['function']:<55} {row['samples']:5} calls  "
+                    f"p50 {row['p50']:9.2f}ms  p95 {row['p95']:9.2f}ms  p99 {row['p99']:9.2f}ms  "
+                    f"{row['avg_queries']:6} queries {row['avg_query_time']:9.2f}ms  {row['avg_rows']:8} rows")
+        finally:
+            frappe.destroy()
+
+@click.command("ensure-hr-indexes")
+@click.option("--dry-run", is_flag=True, default=False, help="Only report missing indexes")
+@pass_context
+def ensure_hr_indexes(context, dry_run=False):
+    """Create the composite indexes HR Suite queries rely on"""
+    import frappe
+    from hr_suite.api.indexes import ensure_indexes
+
+    if not context.sites:
+        raise SiteNotSpecifiedError
+
+    for site in context.sites:
+        frappe.init(site=site)
+        frappe.connect()
+        try:
+            for row in ensure_indexes(dry_run=dry_run):
+                click.echo(f"{site}: {row['doctype']}.{row['index']} ({', '.join(row['columns'])}): {row['state']}")
+        finally:
+            frappe.destroy()
+
+@click.command("check-hr-queries")
+@click.option("--min-rows", type=int, default=10000, help="Flag full scans estimated to read at least this many rows")
+@click.option("--only", multiple=True, help="Only check functions whose name contains this")
+@pass_context
+def check_hr_queries(context, min_rows=10000, only=None):
+    """EXPLAIN the dashboard queries and flag full scans of large tables"""
+    import frappe
+    from hr_suite.api.indexes import check_queries
+
+    if not context.sites:
+        raise SiteNotSpecifiedError
+
+    failed = False
+    for site in context.sites:
+        frappe.init(site=site)
+        frappe.connect()
+        try:
+            findings = check_queries(min_rows=min_rows, only=only)
+            for row in findings:
+                click.echo(f"{site}: ! {row['function']}: full scan of {row['table']} (~{row['rows']} rows), "
+                    f"possible keys: {row['possible_keys'] or 'none'}")
+                click.echo(f"    {row['query']}")
+            click.echo(f"{site}: {len(findings)} full scan(s) found")
+            failed = failed or bool(findings)
+        finally:
+            frappe.destroy()
+
+    if failed:
+        raise SystemExit(1)
+
+@click.command("seed-hr-suite")
+@click.option("--dry-run", is_flag=True, default=False, help="Only report the records that would be created")
+@pass_context
+def seed_hr_suite(context, dry_run=False):
+    """Insert the HR Suite master records missing on a site"""
+    import frappe
+    from hr_suite.seed import apply_seed, format_report
+
+    if not context.sites:
+        raise SiteNotSpecifiedError
+
+    for site in context.sites:
+        frappe.init(site=site)
+        frappe.connect()
+        try:
+            report = apply_seed(dry_run=dry_run)
+            frappe.db.commit()
+
+            for line in format_report(report):
+                click.echo(f"{site}: {line}")
+        finally:
+            frappe.destroy()
+
+@click.command("hr-group-stats")
+@click.option("--processes", type=int, help="Sites computed in parallel, defaults to 8")
+@click.option("--cached", is_flag=True, default=False, help="Print the cached report if still fresh instead of recomputing")
+@click.option("--output", help="Also write the merged report to this JSON file")
+@pass_context
+def hr_group_stats(context, processes=None, cached=False, output=None):
+    """Merged HR stats across the given sites, or every site of the bench"""
+    import json
+    import os
+    from hr_suite.api.group_stats import collect_group_stats, read_cache, SCALAR_METRICS, COUNT_METRICS
+
+    # Bench runs commands from the sites directory
+    sites_path = os.path.abspath(".")
+    report, stale = read_cache(sites_path, ttl=900) if cached else (None, True)
+    if stale:
+        report = collect_group_stats(sites=context.sites or None, sites_path=sites_path, processes=processes)
+
+    for site, result in report["by_site"].items():
+        if result.get("stats"):
+            click.echo(f"{site}: " + ", ".join(f"{name} {result['stats'][name]}" for name in SCALAR_METRICS + COUNT_METRICS)
+                + f" ({result['elapsed']}s)")
+        else:
+            click.echo(f"{site}: ! {result.get('error') or result.get('skipped')}")
+
+    totals = report["totals"]
+    click.echo(f"group ({report['sites']} sites): " + ", ".join(f"{name} {totals[name]}" for name in SCALAR_METRICS + COUNT_METRICS))
+    for row in totals["department_wise_count"]:
+        click.echo(f"    {row['department'] or 'No Department'}: {row['count']}")
+
+    if output:
+        with open(output, "w") as f:
+            json.dump(report, f, indent=1, default=str)
+
+@click.command("backfill-leave-calendar")
+@click.option("--from-date", help="First leave date to rebuild (YYYY-MM-DD), everything by default")
+@pass_context
+def backfill_leave_calendar(context, from_date=None):
+    """Rebuild the leave calendar from approved Leave Applications"""
+    import frappe
+    from hr_suite.hr_suite_dashboard.doctype.hr_suite_leave_day.hr_suite_leave_day import (
+        backfill_leave_calendar as backfill
+    )
+
+    if not context.sites:
+        raise SiteNotSpecifiedError
+
+    for site in context.sites:
+        frappe.init(site=site)
+        frappe.connect()
+        try:
+            rows = backfill(from_date=from_date)
+            frappe.db.commit()
+            click.echo(f"{site}: {rows} leave day(s) written")
+        finally:
+            frappe.destroy()
+
+@click.command("provision-hr-users")
+@click.option("--company", help="Provision every active employee of this company without a user")
+@click.option("--employee", "employees", multiple=True, help="Employee to provision, can be repeated")
+@click.option("--role", default="Employee Self Service", help="Role given to the users created")
+@click.option("--batch-size", type=int, default=200, help="Employees written and committed per batch")
+@click.option("--no-welcome-email", is_flag=True, default=False, help="Do not queue welcome emails")
+@click.option("--dry-run", is_flag=True, default=False, help="Only report what would be provisioned")
+@pass_context
+def provision_hr_users(context, company=None, employees=None, role="Employee Self Service", batch_size=200,
+        no_welcome_email=False, dry_run=False):
+    """Create and link User accounts for employees without one"""
+    import frappe
+    from hr_suite.api.user_provisioning import provision_users
+
+    if not context.sites:
+        raise SiteNotSpecifiedError
+
+    if not company and not employees:
+        raise click.UsageError("Pass --company or --employee")
+
+    for site in context.sites:
+        frappe.init(site=site)
+        frappe.connect()
+        try:
+            result = provision_users(
+                employees=list(employees) or None,
+                company=company,
+                role=role,
+                send_welcome_email=not no_welcome_email,
+                dry_run=dry_run,
+                batch_size=batch_size,
+                commit=True
+            )
+
+            if dry_run:
+                for row in result["planned"]:
+                    action = "link" if row["exists"] else "create"
+                    click.echo(f"{site}: + {row['employee']} {action} {row['user']}")
+
+            for row in result["skipped"] + result["failed"]:
+                click.echo(f"{site}: ! {row['employee']} {row['user'] or ''}: {row['error']}")
+
+            click.echo(f"{site}: {len(result['planned'])} planned, {len(result['created'])} created, "
+                f"{len(result['linked'])} linked, {len(result['skipped'])} skipped, {len(result['failed'])} failed")
+        finally:
+            frappe.destroy()
+
+commands = [
+    rebuild_hr_counters,
+    allocate_hr_leaves,
+    backfill_attendance_rollup,
+    run_hr_benchmarks,
+    hr_performance,
+    ensure_hr_indexes,
+    check_hr_queries,
+    seed_hr_suite,
+    hr_group_stats,
+    backfill_leave_calendar,
+    provision_hr_users
+]
@@ -33,19 +33,100 @@ after_install = "hr_suite.install.after_install"
 
 # Scheduled tasks
 scheduler_events = {
+    "cron": {
+        "*/15 * * * *": [
+            "hr_suite.api.leave_notification.enqueue_leave_digests"
+        ]
+    },
+    "hourly": [
+        "hr_suite.api.onboarding.process_onboarding_queue",
+        "hr_suite.api.reminders.resume_reminders",
+        "hr_suite.api.user_provisioning.schedule_welcome_emails"
+    ],
     "daily": [
         "hr_suite.tasks.daily_hr_reminders"
     ]
 }
 
-# Whitelisted methods
+# Document events
 doc_events = {
     "Employee": {
-        "after_insert": "hr_suite.api.employee.after_employee_insert"
+        "validate": "hr_suite.api.birthday.set_birthday_key",
+        "after_insert": [
+            "hr_suite.api.employee.after_employee_insert",
+            "hr_suite.hr_suite_dashboard.doctype.hr_suite_counter.hr_suite_counter.update_counters"
+        ],
+        "on_update": "hr_suite.hr_suite_dashboard.doctype.hr_suite_counter.hr_suite_counter.update_counters",
+        "on_change": [
+            "hr_suite.api.cache.invalidate_stats_cache",
+            "hr_suite.api.portal.invalidate_portal_cache",
+            "hr_suite.api.headcount.update_headcount_history"
+        ],
+        "on_trash": [
+            "hr_suite.api.cache.invalidate_stats_cache",
+            "hr_suite.api.portal.invalidate_portal_cache",
+            "hr_suite.api.headcount.update_headcount_history",
+            "hr_suite.hr_suite_dashboard.doctype.hr_suite_counter.hr_suite_counter.update_counters"
+        ]
+    },
+    "Leave Application": {
+        "after_insert": [
+            "hr_suite.hr_suite_dashboard.doctype.hr_suite_counter.hr_suite_counter.update_counters",
+            "hr_suite.api.leave.on_leave_submit"
+        ],
+        "on_update": [
+            "hr_suite.hr_suite_dashboard.doctype.hr_suite_counter.hr_suite_counter.update_counters",
+            "hr_suite.api.leave.on_leave_update"
+        ],
+        "on_submit": [
+            "hr_suite.hr_suite_dashboard.doctype.hr_suite_counter.hr_suite_counter.update_counters",
+            "hr_suite.hr_suite_dashboard.doctype.hr_suite_leave_day.hr_suite_leave_day.update_leave_calendar",
+            "hr_suite.api.leave.notify_leave_status"
+        ],
+        "on_cancel": [
+            "hr_suite.hr_suite_dashboard.doctype.hr_suite_counter.hr_suite_counter.update_counters",
+            "hr_suite.hr_suite_dashboard.doctype.hr_suite_leave_day.hr_suite_leave_day.update_leave_calendar"
+        ],
+        "on_change": [
+            "hr_suite.api.cache.invalidate_stats_cache",
+            "hr_suite.api.portal.invalidate_portal_cache"
+        ],
+        "on_trash": [
+            "hr_suite.api.cache.invalidate_stats_cache",
+            "hr_suite.api.portal.invalidate_portal_cache",
+            "hr_suite.hr_suite_dashboard.doctype.hr_suite_counter.hr_suite_counter.update_counters"
+        ]
+    },
+    "Attendance": {
+        "after_insert": "hr_suite.hr_suite_dashboard.doctype.hr_suite_counter.hr_suite_counter.update_counters",
+        "on_update": "hr_suite.hr_suite_dashboard.doctype.hr_suite_counter.hr_suite_counter.update_counters",
+        "on_submit": [
+            "hr_suite.hr_suite_dashboard.doctype.hr_suite_counter.hr_suite_counter.update_counters",
+            "hr_suite.hr_suite_dashboard.doctype.hr_suite_attendance_rollup.hr_suite_attendance_rollup.update_attendance_rollup"
+        ],
+        "on_cancel": [
+            "hr_suite.hr_suite_dashboard.doctype.hr_suite_counter.hr_suite_counter.update_counters",
+            "hr_suite.hr_suite_dashboard.doctype.hr_suite_attendance_rollup.hr_suite_attendance_rollup.update_attendance_rollup"
+        ],
+        "on_change": [
+            "hr_suite.api.cache.invalidate_stats_cache",
+            "hr_suite.api.portal.invalidate_portal_cache"
+        ],
+        "on_trash": [
+            "hr_suite.api.cache.invalidate_stats_cache",
+            "hr_suite.api.portal.invalidate_portal_cache",
+            "hr_suite.hr_suite_dashboard.doctype.hr_suite_counter.hr_suite_counter.update_counters"
+        ]
+    },
+    "Leave Allocation": {
+        "on_change": "hr_suite.api.portal.invalidate_portal_cache",
+        "on_trash": "hr_suite.api.portal.invalidate_portal_cache"
+    },
+    "Leave Ledger Entry": {
+        "on_change": "hr_suite.api.portal.invalidate_portal_cache",
+        "on_trash": "hr_suite.api.portal.invalidate_portal_cache"
     }
 }
 
 # Website settings
-website_route_rules = [
-    {"from_route": "/hr-portal", "to_route": "HR Portal"}
-]
\ No newline at end of file
+# /hr-portal is served by www/hr-portal, see its get_context
@@ -0,0 +1,127 @@
+import frappe
+from frappe.model.document import Document
+from frappe.utils import now, getdate
+
+# Daily attendance rollup
+#
+# One row per attendance date, department and status, named
+# "<date>:<department>:<status>". Submitting an Attendance adds one to its row
+# and cancelling takes it off again, inside the same transaction. Summaries
+# over any window then read days x departments x statuses rows instead of the
+# raw attendance.
+
+GROUP_BY_COLUMNS = {
+    "date": "attendance_date",
+    "department": "department",
+    "status": "status"
+}
+
+class HRSuiteAttendanceRollup(Document):
+    pass
+
+def get_rollup_name(attendance_date, department, status):
+    return f"{getdate(attendance_date)}:{department or ''}:{status}"
+
+def update_attendance_rollup(doc, method=None):
+    """
+    Triggered on Attendance submit and cancel
+    """
+    delta = -1 if method == "on_cancel" else 1
+    add_to_rollup(doc.attendance_date, doc.department, doc.status, delta)
+
+def add_to_rollup(attendance_date, department, status, delta):
+    timestamp = now()
+    user = frappe.session.user
+
+    frappe.db.sql("""
+        INSERT INTO `tabHR Suite Attendance Rollup`
+            (name, attendance_date, department, status, count,
+            creation, modified, owner, modified_by, docstatus, idx)
+        VALUES (%(name)s, %(attendance_date)s, %(department)s, %(status)s, %(delta)s,
+            %(timestamp)s, %(timestamp)s, %(user)s, %(user)s, 0, 0)
+        ON DUPLICATE KEY UPDATE
+            count = count + %(delta)s,
+            modified = %(timestamp)s
+    """, {
+        "name": get_rollup_name(attendance_date, department, status),
+        "attendance_date": getdate(attendance_date),
+        "department": department,
+        "status": status,
+        "delta": delta,
+        "timestamp": timestamp,
+        "user": user,
+    })
+
+def backfill_attendance_rollup(from_date=None, to_date=None):
+    """
+    Rebuild the rollup from submitted Attendance, for a date range or everything
+
+    Returns the number of rollup rows written.
+    """
+    conditions = []
+    params = {"timestamp": now(), "user": frappe.session.user}
+
+    if from_date:
+        conditions.append("attendance_date >= %(from_date)s")
+        params["from_date"] = getdate(from_date)
+    if to_date:
+        conditions.append("attendance_date <= %(to_date)s")
+        params["to_date"] = getdate(to_date)
+
+    where = " AND ".join(conditions) or "1 = 1"
+
+    frappe.db.sql(f"""
+        DELETE FROM `tabHR Suite Attendance Rollup`
+        WHERE {where}
+    """, params)
+
+    frappe.db.sql(f"""
+        INSERT INTO `tabHR Suite Attendance Rollup`
+            (name, attendance_date, department, status, count,
+            creation, modified, owner, modified_by, docstatus, idx)
+        SELECT
+            CONCAT(attendance_date, ':', IFNULL(department, ''), ':', status),
+            attendance_date, department, status, COUNT(*),
+            %(timestamp)s, %(timestamp)s, %(user)s, %(user)s, 0, 0
+        FROM `tabAttendance`
+        WHERE docstatus = 1
+        AND {where}
+        GROUP BY attendance_date, department, status
+    """, params)
+
+    return frappe.db.sql(f"""
+        SELECT COUNT(*)
+        FROM `tabHR Suite Attendance Rollup`
+        WHERE {where}
+    """, params)[0][0]
+
+def get_rollup_summary(from_date, to_date, department=None, group_by=("status",)):
+    """
+    Attendance counts for a window, grouped by any of date, department and status
+    """
+    columns = []
+    for key in group_by:
+        if key not in GROUP_BY_COLUMNS:
+            frappe.throw(frappe._("Cannot group attendance by {0}").format(key))
+        columns.append(GROUP_BY_COLUMNS[key])
+
+    if not columns:
+        frappe.throw(frappe._("Group attendance by at least one of {0}").format(", ".join(GROUP_BY_COLUMNS)))
+
+    conditions = ["attendance_date BETWEEN %(from_date)s AND %(to_date)s"]
+    params = {"from_date": getdate(from_date), "to_date": getdate(to_date)}
+    if department:
+        conditions.append("department = %(department)s")
+        params["department"] = department
+
+    select = ", ".join(columns)
+    where = " AND ".join(conditions)
+
+    return frappe.db.sql(f"""
+        SELECT {select}, SUM(count) AS count
+        FROM `tabHR Suite Attendance Rollup`
+        WHERE {where}
+        GROUP BY {select}
+        HAVING SUM(count) > 0
+        ORDER BY {select}
+    """, params, as_dict=True)
@@ -0,0 +1,234 @@
+import frappe
+from frappe.model.document import Document
+from frappe.utils import now, getdate
+from hr_suite.api.realtime import queue_counter_deltas
+
+# Materialized HR counters
+#
+# One row per counter, named "<counter_type>:<counter_key>". Rows are moved by
+# deltas from document events inside the writing transaction, so a rollback
+# also rolls back the counter change. `rebuild_counters` recomputes everything
+# from the source tables and fixes any drift (e.g. from direct db updates).
+
+ACTIVE_HEADCOUNT = "active_headcount"
+DEPARTMENT_HEADCOUNT = "department_headcount"
+PENDING_LEAVES = "pending_leaves"
+ATTENDANCE = "attendance"
+JOININGS = "joinings"
+
+class HRSuiteCounter(Document):
+    pass
+
+def get_counter_name(counter_type, counter_key=None):
+    if counter_key is None:
+        return counter_type
+    return f"{counter_type}:{counter_key}"
+
+def get_attendance_key(attendance_date, status):
+    return f"{getdate(attendance_date)}:{status}"
+
+def get_joinings_key(date_of_joining):
+    return getdate(date_of_joining).strftime("%Y-%m")
+
+def get_counter(counter_type, counter_key=None):
+    """Read a single counter"""
+    return frappe.db.get_value("HR Suite Counter", get_counter_name(counter_type, counter_key), "value") or 0
+
+def get_counters(counter_type):
+    """Read every counter of a type as {counter_key: value}"""
+    rows = frappe.db.sql("""
+        SELECT counter_key, value
+        FROM `tabHR Suite Counter`
+        WHERE counter_type = %s
+    """, counter_type)
+    return dict(rows)
+
+def get_contributions(doc):
+    """
+    Counters a document adds to, as {(counter_type, counter_key): count}
+    """
+    contributions = {}
+    if not doc:
+        return contributions
+
+    if doc.doctype == "Employee":
+        if doc.status == "Active":
+            contributions[(ACTIVE_HEADCOUNT, None)] = 1
+            contributions[(DEPARTMENT_HEADCOUNT, doc.department or "")] = 1
+            if doc.date_of_joining:
+                contributions[(JOININGS, get_joinings_key(doc.date_of_joining))] = 1
+
+    elif doc.doctype == "Leave Application":
+        if doc.status == "Open" and doc.docstatus == 0:
+            contributions[(PENDING_LEAVES, None)] = 1
+
+    elif doc.doctype == "Attendance":
+        if doc.docstatus == 1 and doc.attendance_date and doc.status:
+            contributions[(ATTENDANCE, get_attendance_key(doc.attendance_date, doc.status))] = 1
+
+    return contributions
+
+def update_counters(doc, method=None):
+    """
+    Triggered on Employee, Leave Application and Attendance events
+
+    The contributions already applied are kept on the document flags, so the
+    several events fired by one save (after_insert + on_update, on_update +
+    on_submit) only apply the difference once.
+    """
+    applied = doc.flags.get("hr_suite_counters")
+    if applied is None:
+        if method == "on_trash":
+            applied = get_contributions(doc)
+        elif method == "after_insert":
+            applied = {}
+        else:
+            applied = get_contributions(doc.get_doc_before_save())
+
+    current = {} if method == "on_trash" else get_contributions(doc)
+
+    deltas = {}
+    for key in set(applied) | set(current):
+        delta = current.get(key, 0) - applied.get(key, 0)
+        if delta:
+            deltas[key] = delta
+
+    if deltas:
+        apply_deltas(deltas)
+        queue_counter_deltas(deltas)
+
+    doc.flags.hr_suite_counters = current
+
+def apply_deltas(deltas):
+    """Atomically add deltas to counters, creating missing rows"""
+    timestamp = now()
+    user = frappe.session.user
+
+    for (counter_type, counter_key), delta in deltas.items():
+        frappe.db.sql("""
+            INSERT INTO `tabHR Suite Counter`
+                (name, counter_name, counter_type, counter_key, value,
+                creation, modified, owner, modified_by, docstatus, idx)
+            VALUES (%(name)s, %(name)s, %(counter_type)s, %(counter_key)s, %(delta)s,
+                %(timestamp)s, %(timestamp)s, %(user)s, %(user)s, 0, 0)
+            ON DUPLICATE KEY UPDATE
+                value = value + %(delta)s,
+                modified = %(timestamp)s
+        """, {
+            "name": get_counter_name(counter_type, counter_key),
+            "counter_type": counter_type,
+            "counter_key": counter_key,
+            "delta": delta,
+            "timestamp": timestamp,
+            "user": user,
+        })
+
+def set_counter(counter_type, counter_key, value):
+    """Set a counter to an absolute value"""
+    timestamp = now()
+    user = frappe.session.user
+
+    frappe.db.sql("""
+        INSERT INTO `tabHR Suite Counter`
+            (name, counter_name, counter_type, counter_key, value,
+            creation, modified, owner, modified_by, docstatus, idx)
+        VALUES (%(name)s, %(name)s, %(counter_type)s, %(counter_key)s, %(value)s,
+            %(timestamp)s, %(timestamp)s, %(user)s, %(user)s, 0, 0)
+        ON DUPLICATE KEY UPDATE
+            value = %(value)s,
+            modified = %(timestamp)s
+    """, {
+        "name": get_counter_name(counter_type, counter_key),
+        "counter_type": counter_type,
+        "counter_key": counter_key,
+        "value": value,
+        "timestamp": timestamp,
+        "user": user,
+    })
+
+def compute_counters(attendance_from=None):
+    """
+    Recompute counters from the source tables
+
+    Returns {(counter_type, counter_key): value}.
+    """
+    expected = {}
+
+    departments = frappe.db.sql("""
+        SELECT department, COUNT(*)
+        FROM `tabEmployee`
+        WHERE status = 'Active'
+        GROUP BY department
+    """)
+    expected[(ACTIVE_HEADCOUNT, None)] = sum(count for _, count in departments)
+    for department, count in departments:
+        expected[(DEPARTMENT_HEADCOUNT, department or "")] = count
+
+    joinings = frappe.db.sql("""
+        SELECT LEFT(date_of_joining, 7), COUNT(*)
+        FROM `tabEmployee`
+        WHERE status = 'Active'
+        AND date_of_joining IS NOT NULL
+        GROUP BY LEFT(date_of_joining, 7)
+    """)
+    for month, count in joinings:
+        expected[(JOININGS, month)] = count
+
+    expected[(PENDING_LEAVES, None)] = frappe.db.sql("""
+        SELECT COUNT(*)
+        FROM `tabLeave Application`
+        WHERE status = 'Open'
+        AND docstatus = 0
+    """)[0][0]
+
+    date_condition = "AND attendance_date >= %(attendance_from)s" if attendance_from else ""
+    attendance = frappe.db.sql(f"""
+        SELECT attendance_date, status, COUNT(*)
+        FROM `tabAttendance`
+        WHERE docstatus = 1
+        {date_condition}
+        GROUP BY attendance_date, status
+    """, {"attendance_from": attendance_from})
+    for attendance_date, status, count in attendance:
+        expected[(ATTENDANCE, get_attendance_key(attendance_date, status))] = count
+
+    return expected
+
+def rebuild_counters(attendance_from=None):
+    """
+    Reconcile stored counters against the source tables
+
+    Attendance counters before `attendance_from` are left untouched when it is
+    given. Returns the drift that was corrected as a list of dicts.
+    """
+    if attendance_from:
+        attendance_from = getdate(attendance_from)
+
+    expected = compute_counters(attendance_from)
+
+    stored = {}
+    for counter_type, counter_key, value in frappe.db.sql("""
+        SELECT counter_type, counter_key, value
+        FROM `tabHR Suite Counter`
+    """):
+        if counter_type == ATTENDANCE and attendance_from:
+            if getdate(counter_key.split(":", 1)[0]) < attendance_from:
+                continue
+        stored[(counter_type, counter_key)] = value
+
+    drift = []
+    for key in set(expected) | set(stored):
+        expected_value = expected.get(key, 0)
+        stored_value = stored.get(key)
+        if stored_value == expected_value:
+            continue
+
+        counter_type, counter_key = key
+        set_counter(counter_type, counter_key, expected_value)
+        drift.append({
+            "counter": get_counter_name(counter_type, counter_key),
+            "stored": stored_value,
+            "expected": expected_value
+        })
+
+    return drift
@@ -0,0 +1,214 @@
+import calendar
+from datetime import timedelta
+
+import frappe
+from frappe.model.document import Document
+from frappe.utils import now, getdate, today
+from hr_suite.api.realtime import queue_dashboard_deltas
+
+# Leave calendar
+#
+# Approved leave expanded to one row per employee and day, named
+# "<leave application>:<date>". Rows are written when a Leave Application is
+# submitted as Approved and removed when it is cancelled, inside the same
+# transaction. "Who is on leave" on a date, over a range or in a department is
+# then an index lookup on leave_date instead of a range predicate over
+# from_date and to_date. Holidays are left out unless the leave type counts
+# them, as HRMS does.
+
+FIELDS = ["name", "leave_date", "employee", "employee_name", "department", "company",
+    "leave_type", "leave_application", "fraction", "creation", "modified", "owner", "modified_by"]
+BACKFILL_CHUNK_SIZE = 500
+
+class HRSuiteLeaveDay(Document):
+    pass
+
+def update_leave_calendar(doc, method=None):
+    """
+    Triggered on Leave Application submit and cancel
+    """
+    # The card counts employees, so only an employee's first or last leave today moves it
+    was_on_leave = is_on_leave_today(doc.employee)
+    remove_leave_days(doc.name)
+
+    if method == "on_submit" and doc.status == "Approved":
+        add_leave_days([doc])
+
+    on_leave = is_on_leave_today(doc.employee)
+    if on_leave != was_on_leave:
+        queue_dashboard_deltas({"on_leave_today": 1 if on_leave else -1})
+
+def is_on_leave_today(employee):
+    return bool(frappe.db.exists("HR Suite Leave Day", {
+        "employee": employee,
+        "leave_date": getdate(today())
+    }))
+
+def remove_leave_days(leave_application):
+    frappe.db.sql("""
+        DELETE FROM `tabHR Suite Leave Day`
+        WHERE leave_application = %s
+    """, leave_application)
+
+def add_leave_days(leaves, from_date=None):
+    """Write the calendar rows of approved leave applications, optionally only from a date"""
+    include_holiday = dict(frappe.get_all("Leave Type", fields=["name", "include_holiday"], as_list=True))
+    employee_holiday_lists = dict(frappe.get_all("Employee",
+        filters={"name": ["in", list({leave.employee for leave in leaves})]},
+        fields=["name", "holiday_list"],
+        as_list=True
+    ))
+    holiday_lists = {}
+    timestamp = now()
+    user = frappe.session.user
+    rows = []
+
+    for leave in leaves:
+        holiday_list = (employee_holiday_lists.get(leave.employee)
+            or frappe.get_cached_value("Company", leave.company, "default_holiday_list"))
+        if holiday_list not in holiday_lists:
+            holiday_lists[holiday_list] = get_holidays(holiday_list)
+        holidays = set() if include_holiday.get(leave.leave_type) else holiday_lists[holiday_list]
+
+        for leave_date, fraction in get_leave_dates(leave, holidays):
+            if from_date and leave_date < from_date:
+                continue
+            rows.append((
+                f"{leave.name}:{leave_date}", leave_date, leave.employee, leave.employee_name,
+                leave.department, leave.company, leave.leave_type, leave.name, fraction,
+                timestamp, timestamp, user, user
+            ))
+
+    if rows:
+        frappe.db.bulk_insert("HR Suite Leave Day", FIELDS, rows, ignore_duplicates=True)
+
+    return len(rows)
+
+def get_leave_dates(leave, holidays):
+    """(date, fraction) for each leave day, skipping the given holidays"""
+    from_date, to_date = getdate(leave.from_date), getdate(leave.to_date)
+    half_day_date = None
+    if leave.get("half_day"):
+        half_day_date = getdate(leave.half_day_date) if leave.get("half_day_date") else from_date
+
+    dates = []
+    leave_date = from_date
+    while leave_date <= to_date:
+        if leave_date not in holidays:
+            dates.append((leave_date, 0.5 if leave_date == half_day_date else 1))
+        leave_date += timedelta(days=1)
+
+    return dates
+
+def get_holidays(holiday_list):
+    if not holiday_list:
+        return set()
+    return {getdate(d) for d in frappe.get_all("Holiday", filters={"parent": holiday_list}, pluck="holiday_date")}
+
+def backfill_leave_calendar(from_date=None):
+    """
+    Rebuild the calendar from approved Leave Applications, from a date or entirely
+
+    Returns the number of rows written.
+    """
+    from_date = getdate(from_date) if from_date else None
+
+    if from_date:
+        frappe.db.sql("DELETE FROM `tabHR Suite Leave Day` WHERE leave_date >= %s", from_date)
+    else:
+        frappe.db.sql("DELETE FROM `tabHR Suite Leave Day`")
+
+    filters = {"status": "Approved", "docstatus": 1}
+    if from_date:
+        filters["to_date"] = [">=", from_date]
+
+    written = 0
+    start = 0
+    while True:
+        leaves = frappe.get_all("Leave Application",
+            filters=filters,
+            fields=["name", "employee", "employee_name", "department", "company", "leave_type",
+                "from_date", "to_date", "half_day", "half_day_date"],
+            order_by="name asc",
+            limit_start=start,
+            limit_page_length=BACKFILL_CHUNK_SIZE
+        )
+        if not leaves:
+            break
+
+        written += add_leave_days(leaves, from_date)
+        start += BACKFILL_CHUNK_SIZE
+
+    return written
+
+def get_conditions(params, department=None, company=None):
+    conditions = []
+    if department:
+        conditions.append("department = %(department)s")
+        params["department"] = department
+    if company:
+        conditions.append("company = %(company)s")
+        params["company"] = company
+    return "".join(f" AND {condition}" for condition in conditions)
+
+def get_on_leave_count(date=None, department=None, company=None):
+    """Number of employees on leave on a date"""
+    params = {"date": getdate(date or today())}
+    conditions = get_conditions(params, department, company)
+
+    return frappe.db.sql(f"""
+        SELECT COUNT(DISTINCT employee)
+        FROM `tabHR Suite Leave Day`
+        WHERE leave_date = %(date)s{conditions}
+    """, params)[0][0]
+
+def get_employees_on_leave(from_date=None, to_date=None, department=None, company=None):
+    """Leave days between two dates (a single day by default), by date then employee"""
+    params = {"from_date": getdate(from_date or today())}
+    params["to_date"] = getdate(to_date) if to_date else params["from_date"]
+    conditions = get_conditions(params, department, company)
+
+    return frappe.db.sql(f"""
+        SELECT leave_date, employee, employee_name, department, leave_type, leave_application, fraction
+        FROM `tabHR Suite Leave Day`
+        WHERE leave_date BETWEEN %(from_date)s AND %(to_date)s{conditions}
+        ORDER BY leave_date, employee
+    """, params, as_dict=True)
+
+def get_absence_heatmap(year, month, department=None, company=None):
+    """
+    Employees on leave per day of a month, per department
+
+    Returns the dates of the month, one row of daily counts per department and
+    the daily totals.
+    """
+    days_in_month = calendar.monthrange(year, month)[1]
+    first_day = getdate(f"{year}-{month:02d}-01")
+    dates = [first_day + timedelta(days=i) for i in range(days_in_month)]
+
+    params = {"from_date": dates[0], "to_date": dates[-1]}
+    conditions = get_conditions(params, department, company)
+
+    rows = frappe.db.sql(f"""
+        SELECT leave_date, department, COUNT(DISTINCT employee) AS count
+        FROM `tabHR Suite Leave Day`
+        WHERE leave_date BETWEEN %(from_date)s AND %(to_date)s{conditions}
+        GROUP BY leave_date, department
+    """, params, as_dict=True)
+
+    departments = {}
+    totals = [0] * days_in_month
+    for row in rows:
+        index = (getdate(row.leave_date) - first_day).days
+        counts = departments.setdefault(row.department or "", [0] * days_in_month)
+        counts[index] += row.count
+        totals[index] += row.count
+
+    return {
+        "dates": dates,
+        "departments": [
+            {"department": department or None, "counts": counts}
+            for department, counts in sorted(departments.items())
+        ],
+        "totals": totals
+    }
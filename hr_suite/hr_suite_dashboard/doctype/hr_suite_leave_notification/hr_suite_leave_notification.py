@@ -0,0 +1,4 @@
+from frappe.model.document import Document
+
+class HRSuiteLeaveNotification(Document):
+    pass
\ No newline at end of file
@@ -10,9 +10,38 @@ frappe.pages['hr-suite-dashboard'].on_page_load = function(wrapper) {
         loadDashboard();
     }, 'octicon octicon-sync');
     
+    // Cards are patched from counter deltas pushed by the server, so the page
+    // stays current without polling
+    const CARDS = {
+        active_employees: '#total-employees',
+        on_leave_today: '#on-leave-today',
+        pending_leave_applications: '#pending-applications',
+        new_joinings_this_month: '#new-joinings'
+    };
+    let loadedOn = frappe.datetime.get_today();
+    
+    // Deltas are only sent to the HR Suite Counter room
+    frappe.realtime.doctype_subscribe('HR Suite Counter');
+    frappe.realtime.on('hr_suite_dashboard_delta', function(data) {
+        // Counts for "today" and "this month" start over on a new day
+        if (data.date !== loadedOn) {
+            loadDashboard();
+            return;
+        }
+        
+        Object.keys(data.deltas || {}).forEach(function(card) {
+            if (!CARDS[card]) {
+                return;
+            }
+            let $value = $(page.body).find(CARDS[card]);
+            $value.text(cint($value.text()) + data.deltas[card]);
+        });
+    });
+    
     loadDashboard();
     
     function loadDashboard() {
+        loadedOn = frappe.datetime.get_today();
         frappe.call({
             method: 'hr_suite.hr_suite_dashboard.page.hr_suite_dashboard.hr_suite_dashboard.get_hr_stats',
             callback: function(r) {
@@ -53,6 +82,46 @@ frappe.pages['hr-suite-dashboard'].on_page_load = function(wrapper) {
                     </div>
                 </div>
                 
+                <div class="row">
+                    <div class="col-md-12">
+                        <h3>New Joinings (This Month)</h3>
+                        <table class="table table-bordered hr-new-joinings">
+                            <thead>
+                                <tr>
+                                    <th>Employee</th>
+                                    <th>Designation</th>
+                                    <th>Department</th>
+                                    <th>Date of Joining</th>
+                                </tr>
+                            </thead>
+                            <tbody></tbody>
+                        </table>
+                        <button class="btn btn-default btn-sm hr-load-more-joinings hidden">Load More</button>
+                    </div>
+                </div>
+                
+                <div class="row hr-performance hidden">
+                    <div class="col-md-12">
+                        <h3>Performance</h3>
+                        <p class="text-muted hr-performance-note"></p>
+                        <table class="table table-bordered">
+                            <thead>
+                                <tr>
+                                    <th>Function</th>
+                                    <th>Calls</th>
+                                    <th>p50 (ms)</th>
+                                    <th>p95 (ms)</th>
+                                    <th>p99 (ms)</th>
+                                    <th>Queries</th>
+                                    <th>Query Time (ms)</th>
+                                    <th>Rows</th>
+                                </tr>
+                            </thead>
+                            <tbody></tbody>
+                        </table>
+                    </div>
+                </div>
+                
                 <div class="row">
                     <div class="col-md-12">
                         <h3>Quick Actions</h3>
@@ -76,5 +145,86 @@ frappe.pages['hr-suite-dashboard'].on_page_load = function(wrapper) {
         `;
         
         $(page.body).html(html);
+        
+        renderNewJoinings(page, stats.new_joinings);
+        
+        if (frappe.user.has_role(['System Manager', 'HR Manager', 'HR Manager Suite'])) {
+            loadPerformance(page);
+        }
+    }
+    
+    function loadPerformance(page) {
+        frappe.call({
+            method: 'hr_suite.api.performance.get_performance_stats',
+            callback: function(r) {
+                if (r.message) {
+                    renderPerformance(page, r.message);
+                }
+            }
+        });
+    }
+    
+    function renderPerformance(page, perf) {
+        let $section = $(page.body).find('.hr-performance');
+        let $body = $section.find('tbody').empty();
+        
+        // Nothing to show until instrumentation has been switched on
+        if (!perf.enabled && !perf.functions.length) {
+            return;
+        }
+        
+        $section.find('.hr-performance-note').text(perf.enabled
+            ? __('Rolling stats over the last {0} calls per function', [perf.sample_size])
+            : __('Instrumentation is disabled, showing stats recorded earlier'));
+        
+        perf.functions.forEach(function(row) {
+            $body.append(`
+                <tr>
+                    <td>${frappe.utils.escape_html(row.function)}</td>
+                    <td>${row.samples}</td>
+                    <td>${row.p50}</td>
+                    <td>${row.p95}</td>
+                    <td>${row.p99}</td>
+                    <td>${row.avg_queries}</td>
+                    <td>${row.avg_query_time}</td>
+                    <td>${row.avg_rows}</td>
+                </tr>
+            `);
+        });
+        
+        $section.removeClass('hidden');
+    }
+    
+    function renderNewJoinings(page, list) {
+        let $body = $(page.body).find('.hr-new-joinings tbody');
+        let $more = $(page.body).find('.hr-load-more-joinings');
+        
+        (list.items || []).forEach(function(emp) {
+            $body.append(`
+                <tr>
+                    <td><a href="/app/employee/${encodeURIComponent(emp.name)}">${frappe.utils.escape_html(emp.employee_name || emp.name)}</a></td>
+                    <td>${frappe.utils.escape_html(emp.designation || '')}</td>
+                    <td>${frappe.utils.escape_html(emp.department || '')}</td>
+                    <td>${frappe.datetime.str_to_user(emp.date_of_joining)}</td>
+                </tr>
+            `);
+        });
+        
+        // Further pages are only fetched when asked for
+        $more.toggleClass('hidden', !list.next_cursor);
+        $more.off('click').on('click', function() {
+            frappe.call({
+                method: 'hr_suite.api.lists.get_list_page',
+                args: {
+                    list_name: 'new_joinings',
+                    cursor: list.next_cursor
+                },
+                callback: function(r) {
+                    if (r.message) {
+                        renderNewJoinings(page, r.message);
+                    }
+                }
+            });
+        });
     }
 }
\ No newline at end of file
@@ -1,43 +1,28 @@
 import frappe
-from frappe.utils import today, get_first_day, get_last_day
+from hr_suite.api.metrics import get_metrics
+from hr_suite.api.performance import instrument
+
+# Metrics rendered by the dashboard page
+PAGE_METRICS = [
+    "active_employees",
+    "on_leave_today",
+    "pending_leave_applications",
+    "new_joinings_this_month"
+]
 
 @frappe.whitelist()
+@instrument
 def get_hr_stats():
     """Get HR statistics for dashboard"""
     
+    metrics = get_metrics(PAGE_METRICS)
+    
     stats = {
-        "total_employees": frappe.db.count("Employee", {"status": "Active"}),
-        "on_leave_today": get_on_leave_count(),
-        "pending_leave_applications": frappe.db.count("Leave Application", 
-            {"status": "Open", "docstatus": 0}),
-        "new_joinings_this_month": get_new_joinings(),
-        "upcoming_birthdays": get_upcoming_birthdays(),
-        "probation_ending": get_probation_ending()
+        "total_employees": metrics["active_employees"],
+        "on_leave_today": metrics["on_leave_today"],
+        "pending_leave_applications": metrics["pending_leave_applications"],
+        "new_joinings_this_month": metrics["new_joinings_this_month"]["count"],
+        "new_joinings": metrics["new_joinings_this_month"]
     }
     
-    return stats
-
-def get_on_leave_count():
-    """Get employees on leave today"""
-    return frappe.db.count("Leave Application", {
-        "status": "Approved",
-        "from_date": ["<=", today()],
-        "to_date": [">=", today()]
-    })
-
-def get_new_joinings():
-    """Get new joinings this month"""
-    return frappe.db.count("Employee", {
-        "status": "Active",
-        "date_of_joining": ["between", [get_first_day(today()), get_last_day(today())]]
-    })
-
-def get_upcoming_birthdays():
-    """Get upcoming birthdays in next 7 days"""
-    # Implementation
-    return []
-
-def get_probation_ending():
-    """Get employees whose probation is ending soon"""
-    # Implementation
-    return []
\ No newline at end of file
+    return stats
\ No newline at end of file
@@ -1,7 +1,11 @@
 import frappe
 from frappe import _
+import json
 import subprocess
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 def before_install():
     """
@@ -70,44 +74,129 @@ def verify_dependencies_cloud():
         message = f"HR Suite requires {apps_list} to be installed first. Please install {apps_list} on your site, then install HR Suite."
         frappe.throw(message, title="Missing Dependencies")
 
+# Apps HR Suite depends on, in installation order
+DEPENDENCIES = [
+    {"app": "erpnext", "title": "ERPNext", "repo": "https://github.com/frappe/erpnext"},
+    {"app": "hrms", "title": "HRMS", "repo": "https://github.com/frappe/hrms"}
+]
+DEPENDENCY_BRANCH = "version-15"
+COMMAND_TIMEOUT = 1800
+
 def install_dependencies_self_hosted():
     """
     Auto-install ERPNext and HRMS on self-hosted
+    
+    Sources are cloned concurrently into a local app cache (a mirror of
+    pre-cloned repos when `hr_suite_app_mirror` is configured, so no network is
+    needed), then fetched into the bench and installed one app at a time.
+    Finished steps and their timings are checkpointed under the site, so a
+    failed run resumes where it stopped.
     """
     try:
         installed_apps = frappe.get_installed_apps()
-        bench_path = get_bench_path()
-        site_name = frappe.local.site
+        bench_apps = get_bench_apps()
+        pending = [dep for dep in DEPENDENCIES if dep["app"] not in installed_apps]
+        if not pending:
+            return
         
-        # Install ERPNext if missing
-        if "erpnext" not in installed_apps:
-            print("Installing ERPNext...")
-            
-            bench_apps = get_bench_apps()
-            if "erpnext" not in bench_apps:
-                run_command(f"cd {bench_path} && bench get-app erpnext --branch version-15")
-            
-            run_command(f"cd {bench_path} && bench --site {site_name} install-app erpnext")
-            print("ERPNext installed successfully!")
+        cache_path = get_app_cache_path()
+        checkpoint = load_checkpoint()
+        prune_checkpoint(checkpoint, pending, bench_apps, cache_path)
         
-        # Refresh installed apps
-        installed_apps = frappe.get_installed_apps()
+        # Fetch phase: network bound, all sources at once
+        to_fetch = [dep for dep in pending if dep["app"] not in bench_apps]
+        with ThreadPoolExecutor(max_workers=max(len(to_fetch), 1)) as executor:
+            for future in [executor.submit(cache_app_source, dep, cache_path, checkpoint) for dep in to_fetch]:
+                future.result()
         
-        # Install HRMS if missing
-        if "hrms" not in installed_apps:
-            print("Installing HRMS...")
-            
-            bench_apps = get_bench_apps()
-            if "hrms" not in bench_apps:
-                run_command(f"cd {bench_path} && bench get-app hrms --branch version-15")
+        # Install phase: bench get-app and install-app touch shared state, run in order
+        bench_path = get_bench_path()
+        site_name = frappe.local.site
+        for dep in pending:
+            if dep["app"] not in bench_apps:
+                source = os.path.join(cache_path, dep["app"])
+                run_step(checkpoint, f"get-app:{dep['app']}",
+                    f"bench get-app file://{source} --branch {DEPENDENCY_BRANCH}", cwd=bench_path)
             
-            run_command(f"cd {bench_path} && bench --site {site_name} install-app hrms")
-            print("HRMS installed successfully!")
+            print(f"Installing {dep['title']}...")
+            run_step(checkpoint, f"install-app:{dep['app']}",
+                f"bench --site {site_name} install-app {dep['app']}", cwd=bench_path)
+            print(f"{dep['title']} installed successfully!")
         
     except Exception as e:
         error_msg = f"Auto-install failed. Please install manually: bench get-app erpnext && bench get-app hrms && bench install-app erpnext && bench install-app hrms. Error: {str(e)[:100]}"
         frappe.throw(error_msg, title="Manual Installation Required")
 
+def get_app_cache_path():
+    """Directory holding app sources, a configured mirror or a cache under the bench"""
+    path = (frappe.conf.get("hr_suite_app_mirror") or os.environ.get("HR_SUITE_APP_MIRROR")
+        or os.path.join(get_bench_path(), ".hr_suite_app_cache"))
+    os.makedirs(path, exist_ok=True)
+    return path
+
+def cache_app_source(dep, cache_path, checkpoint):
+    """Clone an app into the cache unless a copy is already there"""
+    source = os.path.join(cache_path, dep["app"])
+    if os.path.isdir(os.path.join(source, ".git")):
+        return
+    
+    print(f"Fetching {dep['title']}...")
+    run_step(checkpoint, f"clone:{dep['app']}",
+        f"git clone --depth 1 --branch {DEPENDENCY_BRANCH} {dep['repo']} {source}")
+
+def load_checkpoint():
+    """
+    Completed install steps and their timings, from the last run
+    
+    Also carries what the fetch threads need from the site, as frappe.local is
+    not visible from them.
+    """
+    path = frappe.get_site_path("hr_suite_install.json")
+    try:
+        with open(path) as f:
+            checkpoint = json.load(f)
+    except:
+        checkpoint = {}
+    checkpoint.setdefault("completed", [])
+    checkpoint.setdefault("timings", {})
+    checkpoint["runtime"] = {
+        "path": path,
+        "timeout": frappe.conf.get("hr_suite_install_timeout") or COMMAND_TIMEOUT,
+        "lock": threading.Lock()
+    }
+    return checkpoint
+
+def prune_checkpoint(checkpoint, pending, bench_apps, cache_path):
+    """Forget steps whose result is gone, e.g. an app removed from the bench since"""
+    stale = set()
+    for dep in pending:
+        stale.add(f"install-app:{dep['app']}")
+        if dep["app"] not in bench_apps:
+            stale.add(f"get-app:{dep['app']}")
+        if not os.path.isdir(os.path.join(cache_path, dep["app"], ".git")):
+            stale.add(f"clone:{dep['app']}")
+    checkpoint["completed"] = [step for step in checkpoint["completed"] if step not in stale]
+
+def save_checkpoint(checkpoint):
+    with open(checkpoint["runtime"]["path"], "w") as f:
+        json.dump({key: value for key, value in checkpoint.items() if key != "runtime"}, f, indent=1)
+
+def run_step(checkpoint, step, command, cwd=None):
+    """Run a command once, recording its completion and duration"""
+    if step in checkpoint["completed"]:
+        print(f"{step}: already done, skipping")
+        return
+    
+    start = time.monotonic()
+    run_command(command, cwd=cwd, timeout=checkpoint["runtime"]["timeout"])
+    elapsed = round(time.monotonic() - start, 1)
+    print(f"{step}: done in {elapsed}s")
+    
+    with checkpoint["runtime"]["lock"]:
+        checkpoint["completed"].append(step)
+        checkpoint["timings"][step] = elapsed
+        save_checkpoint(checkpoint)
+
 def get_bench_path():
     """Get bench path"""
     try:
@@ -127,9 +216,9 @@ def get_bench_apps():
         pass
     return []
 
-def run_command(command):
+def run_command(command, cwd=None, timeout=COMMAND_TIMEOUT):
     """Run shell command"""
-    result = subprocess.run(command, shell=True, check=True, capture_output=True, text=True, timeout=300)
+    result = subprocess.run(command, shell=True, check=True, capture_output=True, text=True, timeout=timeout, cwd=cwd)
     return result.stdout
 
 def after_install():
@@ -138,30 +227,57 @@ def after_install():
     """
     print("Configuring HR Suite...")
     
-    create_hr_roles()
+    setup_custom_fields()
+    backfill_birthday_keys()
     setup_hr_settings()
-    create_default_departments()
-    create_default_designations()
-    setup_leave_types()
-    setup_attendance_settings()
-    setup_payroll_settings()
-    setup_email_templates()
-    create_hr_dashboard()
+    seed_master_data()
+    create_hr_indexes()
+    backfill_leave_calendar()
+    backfill_attendance_rollup()
+    rebuild_hr_counters()
     
     frappe.db.commit()
     print("HR Suite configured successfully!")
 
-def create_hr_roles():
-    """Create HR roles"""
-    roles = [
-        {"role_name": "HR Manager Suite", "desk_access": 1, "is_custom": 1},
-        {"role_name": "HR User Suite", "desk_access": 1, "is_custom": 1},
-        {"role_name": "Employee Self Service", "desk_access": 1, "is_custom": 1}
-    ]
+def seed_master_data():
+    """Insert the roles, departments, designations, leave types, shift,
+    salary components, email templates and dashboard HR Suite ships with"""
+    from hr_suite.seed import apply_seed, format_report
     
-    for role in roles:
-        if not frappe.db.exists("Role", role["role_name"]):
-            frappe.get_doc({"doctype": "Role", **role}).insert(ignore_permissions=True)
+    for line in format_report(apply_seed()):
+        print(line)
+
+def setup_custom_fields():
+    """Create HR Suite custom fields"""
+    from frappe.custom.doctype.custom_field.custom_field import create_custom_fields
+    
+    create_custom_fields(get_custom_fields(), ignore_validate=True)
+
+def get_custom_fields():
+    """Custom fields added by HR Suite"""
+    return {
+        "Employee": [
+            {
+                "fieldname": "birthday_key",
+                "label": "Birthday Key",
+                "fieldtype": "Int",
+                "insert_after": "date_of_birth",
+                "description": "Month and day of birth as MMDD, used for birthday lookups",
+                "hidden": 1,
+                "read_only": 1,
+                "no_copy": 1,
+                "search_index": 1
+            }
+        ]
+    }
+
+def backfill_birthday_keys():
+    """Fill Employee.birthday_key for employees that existed before install"""
+    try:
+        from hr_suite.api.birthday import backfill_birthday_keys
+        backfill_birthday_keys()
+    except Exception as e:
+        frappe.log_error(f"Birthday key error: {str(e)}")
 
 def setup_hr_settings():
     """Configure HR Settings"""
@@ -172,90 +288,41 @@ def setup_hr_settings():
         hr_settings.send_holiday_reminders = 1
         hr_settings.leave_approver_mandatory_in_leave_application = 1
         hr_settings.payroll_based_on = "Attendance"
-        hr_settings.send_leave_notification = 1
+        # Approvers get HR Suite digests instead, see hr_suite.api.leave_notification
+        hr_settings.send_leave_notification = 0
         hr_settings.email_salary_slip_to_employee = 1
         hr_settings.save(ignore_permissions=True)
     except Exception as e:
         frappe.log_error(f"HR Settings error: {str(e)}")
 
-def create_default_departments():
-    """Create default departments"""
-    departments = ["Human Resources", "Operations", "Finance", "Sales", "Marketing", "IT", "Administration", "Customer Support"]
-    
-    for dept in departments:
-        if not frappe.db.exists("Department", dept):
-            frappe.get_doc({"doctype": "Department", "department_name": dept, "is_group": 0}).insert(ignore_permissions=True)
-
-def create_default_designations():
-    """Create default designations"""
-    designations = ["CEO", "Manager", "Senior Developer", "Developer", "HR Manager", "HR Executive", "Sales Manager", "Sales Executive", "Marketing Manager", "Marketing Executive", "Accountant", "Admin"]
-    
-    for designation in designations:
-        if not frappe.db.exists("Designation", designation):
-            frappe.get_doc({"doctype": "Designation", "designation_name": designation}).insert(ignore_permissions=True)
-
-def setup_leave_types():
-    """Create leave types"""
-    leave_types = [
-        {"leave_type_name": "Annual Leave", "max_leaves_allowed": 21, "is_carry_forward": 1, "applicable_after": 90},
-        {"leave_type_name": "Sick Leave", "max_leaves_allowed": 12, "is_carry_forward": 0, "applicable_after": 0},
-        {"leave_type_name": "Casual Leave", "max_leaves_allowed": 7, "is_carry_forward": 0, "applicable_after": 0},
-        {"leave_type_name": "Leave Without Pay", "max_leaves_allowed": 0, "is_carry_forward": 0, "is_lwp": 1},
-        {"leave_type_name": "Maternity Leave", "max_leaves_allowed": 90, "is_carry_forward": 0, "applicable_after": 180},
-        {"leave_type_name": "Paternity Leave", "max_leaves_allowed": 5, "is_carry_forward": 0, "applicable_after": 180}
-    ]
-    
-    for leave in leave_types:
-        if not frappe.db.exists("Leave Type", leave["leave_type_name"]):
-            frappe.get_doc({"doctype": "Leave Type", **leave}).insert(ignore_permissions=True)
-
-def setup_attendance_settings():
-    """Setup attendance"""
+def create_hr_indexes():
+    """Create the indexes HR Suite queries rely on"""
     try:
-        if not frappe.db.exists("Shift Type", "General Shift"):
-            frappe.get_doc({
-                "doctype": "Shift Type",
-                "name": "General Shift",
-                "start_time": "09:00:00",
-                "end_time": "18:00:00",
-                "enable_auto_attendance": 1
-            }).insert(ignore_permissions=True)
+        from hr_suite.api.indexes import ensure_indexes
+        ensure_indexes()
     except Exception as e:
-        frappe.log_error(f"Attendance settings error: {str(e)}")
+        frappe.log_error(f"HR indexes error: {str(e)}")
 
-def setup_payroll_settings():
-    """Setup payroll"""
+def backfill_leave_calendar():
+    """Build the leave calendar from existing approved leave"""
     try:
-        components = [
-            {"salary_component": "Basic Salary", "type": "Earning", "is_tax_applicable": 1},
-            {"salary_component": "Housing Allowance", "type": "Earning", "is_tax_applicable": 1},
-            {"salary_component": "Transport Allowance", "type": "Earning", "is_tax_applicable": 1},
-            {"salary_component": "Medical Allowance", "type": "Earning", "is_tax_applicable": 0},
-            {"salary_component": "Income Tax", "type": "Deduction", "is_tax_applicable": 0},
-            {"salary_component": "Professional Tax", "type": "Deduction", "is_tax_applicable": 0}
-        ]
-        
-        for component in components:
-            if not frappe.db.exists("Salary Component", component["salary_component"]):
-                frappe.get_doc({"doctype": "Salary Component", **component}).insert(ignore_permissions=True)
+        from hr_suite.hr_suite_dashboard.doctype.hr_suite_leave_day.hr_suite_leave_day import backfill_leave_calendar
+        backfill_leave_calendar()
     except Exception as e:
-        frappe.log_error(f"Payroll settings error: {str(e)}")
+        frappe.log_error(f"Leave calendar error: {str(e)}")
 
-def setup_email_templates():
-    """Create email templates"""
-    templates = [
-        {"name": "Leave Approval Notification", "subject": "Leave Application Approved", "response": "<p>Dear {{ doc.employee_name }},</p><p>Your leave application has been approved.</p>"},
-        {"name": "Welcome Email", "subject": "Welcome to the Team", "response": "<p>Dear {{ doc.employee_name }},</p><p>Welcome to our organization!</p>"}
-    ]
-    
-    for template in templates:
-        if not frappe.db.exists("Email Template", template["name"]):
-            frappe.get_doc({"doctype": "Email Template", **template}).insert(ignore_permissions=True)
+def backfill_attendance_rollup():
+    """Build the attendance rollup from existing attendance"""
+    try:
+        from hr_suite.hr_suite_dashboard.doctype.hr_suite_attendance_rollup.hr_suite_attendance_rollup import backfill_attendance_rollup
+        backfill_attendance_rollup()
+    except Exception as e:
+        frappe.log_error(f"Attendance rollup error: {str(e)}")
 
-def create_hr_dashboard():
-    """Create HR dashboard"""
+def rebuild_hr_counters():
+    """Populate HR Suite counters from existing data"""
     try:
-        if not frappe.db.exists("Dashboard", "HR Suite Dashboard"):
-            frappe.get_doc({"doctype": "Dashboard", "dashboard_name": "HR Suite Dashboard", "module": "HR"}).insert(ignore_permissions=True)
+        from hr_suite.hr_suite_dashboard.doctype.hr_suite_counter.hr_suite_counter import rebuild_counters
+        rebuild_counters()
     except Exception as e:
-        frappe.log_error(f"Dashboard error: {str(e)}")
\ No newline at end of file
+        frappe.log_error(f"HR counters error: {str(e)}")
\ No newline at end of file
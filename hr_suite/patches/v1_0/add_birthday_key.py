@@ -0,0 +1,9 @@
+def execute():
+    """
+    Add the indexed Employee.birthday_key field and backfill it
+    """
+    from hr_suite.api.birthday import backfill_birthday_keys
+    from hr_suite.install import setup_custom_fields
+
+    setup_custom_fields()
+    backfill_birthday_keys()
\ No newline at end of file
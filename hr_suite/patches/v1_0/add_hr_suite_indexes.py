@@ -0,0 +1,7 @@
+def execute():
+    """
+    Create the composite indexes used by the HR Suite dashboard queries
+    """
+    from hr_suite.api.indexes import ensure_indexes
+
+    ensure_indexes()
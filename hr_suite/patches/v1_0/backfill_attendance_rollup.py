@@ -0,0 +1,10 @@
+import frappe
+
+def execute():
+    """
+    Build the daily attendance rollup for existing attendance
+    """
+    from hr_suite.hr_suite_dashboard.doctype.hr_suite_attendance_rollup.hr_suite_attendance_rollup import backfill_attendance_rollup
+
+    frappe.reload_doc("hr_suite_dashboard", "doctype", "hr_suite_attendance_rollup")
+    backfill_attendance_rollup()
\ No newline at end of file
@@ -0,0 +1,12 @@
+import frappe
+
+def execute():
+    """
+    Build the leave calendar for existing approved leave
+    """
+    from hr_suite.api.indexes import ensure_indexes
+    from hr_suite.hr_suite_dashboard.doctype.hr_suite_leave_day.hr_suite_leave_day import backfill_leave_calendar
+
+    frappe.reload_doc("hr_suite_dashboard", "doctype", "hr_suite_leave_day")
+    backfill_leave_calendar()
+    ensure_indexes()
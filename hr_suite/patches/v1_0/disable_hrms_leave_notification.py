@@ -0,0 +1,10 @@
+import frappe
+
+def execute():
+    """
+    Stop HRMS emailing approvers per application, HR Suite sends digests
+    """
+    if not frappe.db.exists("DocType", "HR Settings"):
+        return
+
+    frappe.db.set_single_value("HR Settings", "send_leave_notification", 0)
@@ -0,0 +1,8 @@
+def execute():
+    """
+    Attendance counters count submitted attendance only, as the rollup does;
+    drop the drafts counted before
+    """
+    from hr_suite.hr_suite_dashboard.doctype.hr_suite_counter.hr_suite_counter import rebuild_counters
+
+    rebuild_counters()
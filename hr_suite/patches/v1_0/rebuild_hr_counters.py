@@ -0,0 +1,10 @@
+import frappe
+
+def execute():
+    """
+    Populate the HR Suite Counter store for existing sites
+    """
+    from hr_suite.hr_suite_dashboard.doctype.hr_suite_counter.hr_suite_counter import rebuild_counters
+
+    frappe.reload_doc("hr_suite_dashboard", "doctype", "hr_suite_counter")
+    rebuild_counters()
\ No newline at end of file
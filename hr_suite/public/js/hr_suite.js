@@ -32,7 +32,7 @@ function handleQuickAction(action) {
 // Auto-refresh dashboard stats
 function refreshDashboardStats() {
     frappe.call({
-        method: 'hr_suite.hr_suite.page.hr_suite_dashboard.hr_suite_dashboard.get_hr_stats',
+        method: 'hr_suite.hr_suite_dashboard.page.hr_suite_dashboard.hr_suite_dashboard.get_hr_stats',
         callback: function(r) {
             if (r.message) {
                 updateDashboardUI(r.message);
@@ -0,0 +1,222 @@
+from datetime import timedelta
+
+import frappe
+from frappe.utils import now, cint, cstr, flt
+
+# Seed manifest
+#
+# Master records HR Suite ships with, declared per doctype. `apply_seed` reads
+# the existing names of each doctype in one query, inserts only the missing
+# records and reports what it found, so running it on every install and
+# migration is cheap once the site is seeded. Doctypes without side effects in
+# their controllers are written with a single bulk insert; the rest (trees,
+# leave types, salary components) go through the ORM, one missing record at a
+# time.
+
+def get_seed_manifest():
+    """
+    Seed entries in insertion order
+
+    Each entry gives the doctype, the field holding the record name, whether
+    the records may be bulk inserted and the records themselves.
+    """
+    return [
+        {
+            "doctype": "Role",
+            "key": "role_name",
+            "bulk": True,
+            "records": [
+                {"role_name": "HR Manager Suite", "desk_access": 1, "is_custom": 1},
+                {"role_name": "HR User Suite", "desk_access": 1, "is_custom": 1},
+                {"role_name": "Employee Self Service", "desk_access": 1, "is_custom": 1}
+            ]
+        },
+        {
+            "doctype": "Department",
+            "key": "department_name",
+            "records": [
+                {"department_name": name, "is_group": 0}
+                for name in ["Human Resources", "Operations", "Finance", "Sales", "Marketing", "IT", "Administration", "Customer Support"]
+            ]
+        },
+        {
+            "doctype": "Designation",
+            "key": "designation_name",
+            "bulk": True,
+            "records": [
+                {"designation_name": name}
+                for name in ["CEO", "Manager", "Senior Developer", "Developer", "HR Manager", "HR Executive", "Sales Manager",
+                    "Sales Executive", "Marketing Manager", "Marketing Executive", "Accountant", "Admin"]
+            ]
+        },
+        {
+            "doctype": "Leave Type",
+            "key": "leave_type_name",
+            "records": [
+                {"leave_type_name": "Annual Leave", "max_leaves_allowed": 21, "is_carry_forward": 1, "applicable_after": 90},
+                {"leave_type_name": "Sick Leave", "max_leaves_allowed": 12, "is_carry_forward": 0, "applicable_after": 0},
+                {"leave_type_name": "Casual Leave", "max_leaves_allowed": 7, "is_carry_forward": 0, "applicable_after": 0},
+                {"leave_type_name": "Leave Without Pay", "max_leaves_allowed": 0, "is_carry_forward": 0, "is_lwp": 1},
+                {"leave_type_name": "Maternity Leave", "max_leaves_allowed": 90, "is_carry_forward": 0, "applicable_after": 180},
+                {"leave_type_name": "Paternity Leave", "max_leaves_allowed": 5, "is_carry_forward": 0, "applicable_after": 180}
+            ]
+        },
+        {
+            "doctype": "Shift Type",
+            "key": "name",
+            "records": [
+                {"name": "General Shift", "start_time": "09:00:00", "end_time": "18:00:00", "enable_auto_attendance": 1}
+            ]
+        },
+        {
+            "doctype": "Salary Component",
+            "key": "salary_component",
+            "records": [
+                {"salary_component": "Basic Salary", "type": "Earning", "is_tax_applicable": 1},
+                {"salary_component": "Housing Allowance", "type": "Earning", "is_tax_applicable": 1},
+                {"salary_component": "Transport Allowance", "type": "Earning", "is_tax_applicable": 1},
+                {"salary_component": "Medical Allowance", "type": "Earning", "is_tax_applicable": 0},
+                {"salary_component": "Income Tax", "type": "Deduction", "is_tax_applicable": 0},
+                {"salary_component": "Professional Tax", "type": "Deduction", "is_tax_applicable": 0}
+            ]
+        },
+        {
+            "doctype": "Email Template",
+            "key": "name",
+            "bulk": True,
+            "records": [
+                {"name": "Leave Approval Notification", "subject": "Leave Application Approved",
+                    "response": "<p>Dear {{ doc.employee_name }},</p><p>Your leave application has been approved.</p>"},
+                {"name": "Welcome Email", "subject": "Welcome to the Team",
+                    "response": "<p>Dear {{ doc.employee_name }},</p><p>Welcome to our organization!</p>"}
+            ]
+        },
+        {
+            "doctype": "Dashboard",
+            "key": "dashboard_name",
+            "records": [
+                {"dashboard_name": "HR Suite Dashboard", "module": "HR"}
+            ]
+        }
+    ]
+
+def apply_seed(manifest=None, dry_run=False):
+    """
+    Insert the missing records of a seed manifest
+
+    Returns a diff per doctype: how many records already existed, the names
+    created (or to be created on a dry run), the names that failed, and the
+    declared fields whose stored value differs on existing records. Existing
+    records are never modified.
+    """
+    report = {}
+    for entry in manifest or get_seed_manifest():
+        doctype = entry["doctype"]
+
+        if not frappe.db.table_exists(doctype):
+            report[doctype] = {"skipped": True}
+            continue
+
+        existing = get_existing_records(entry)
+        missing = [record for record in entry["records"] if record[entry["key"]] not in existing]
+        diff = {
+            "existing": len(entry["records"]) - len(missing),
+            "created": [],
+            "failed": [],
+            "drift": get_drift(entry, existing)
+        }
+
+        if dry_run:
+            diff["created"] = [record[entry["key"]] for record in missing]
+        elif missing and entry.get("bulk"):
+            bulk_insert_records(doctype, entry["key"], missing)
+            diff["created"] = [record[entry["key"]] for record in missing]
+        else:
+            for record in missing:
+                try:
+                    frappe.get_doc({"doctype": doctype, **record}).insert(ignore_permissions=True)
+                    diff["created"].append(record[entry["key"]])
+                except Exception as e:
+                    frappe.log_error(f"HR Suite seed error ({doctype} {record[entry['key']]}): {str(e)}")
+                    diff["failed"].append(record[entry["key"]])
+
+        report[doctype] = diff
+
+    return report
+
+def get_existing_records(entry):
+    """Stored values of the declared fields for records already present, by name"""
+    names = [record[entry["key"]] for record in entry["records"]]
+    fields = sorted({field for record in entry["records"] for field in record if frappe.db.has_column(entry["doctype"], field)})
+
+    rows = frappe.get_all(entry["doctype"],
+        filters={"name": ["in", names]},
+        fields=list({"name", *fields})
+    )
+    return {row.name: row for row in rows}
+
+def get_drift(entry, existing):
+    """Declared fields whose stored value differs, as "name.field" strings"""
+    meta = frappe.get_meta(entry["doctype"])
+    drift = []
+    for record in entry["records"]:
+        stored = existing.get(record[entry["key"]])
+        if not stored:
+            continue
+
+        for field, value in record.items():
+            if field not in stored:
+                continue
+            df = meta.get_field(field)
+            fieldtype = df.fieldtype if df else None
+            if normalize(stored[field], fieldtype) != normalize(value, fieldtype):
+                drift.append(f"{record[entry['key']]}.{field}")
+
+    return drift
+
+def normalize(value, fieldtype=None):
+    """A value in the type of its field, e.g. 21.0 and "21" are the same Float"""
+    if fieldtype in ("Float", "Currency", "Percent"):
+        return flt(value)
+    if fieldtype in ("Int", "Check"):
+        return cint(value)
+    # Time fields come back as timedelta, e.g. 9:00:00 for "09:00:00"
+    if isinstance(value, timedelta):
+        return str(value).zfill(8)
+    return cstr(value)
+
+def bulk_insert_records(doctype, key, records):
+    """Insert records in one statement, with the doctype defaults filled in"""
+    timestamp = now()
+    user = frappe.session.user
+    rows = []
+
+    for record in records:
+        doc = frappe.new_doc(doctype)
+        doc.update(record)
+        doc.name = record[key]
+        doc.update({"creation": timestamp, "modified": timestamp, "owner": user, "modified_by": user, "docstatus": 0, "idx": 0})
+        rows.append(doc.get_valid_dict(convert_dates_to_str=True, ignore_nulls=True))
+
+    fields = sorted({field for row in rows for field in row})
+    frappe.db.bulk_insert(doctype, fields, [tuple(row.get(field) for field in fields) for row in rows])
+    frappe.clear_cache(doctype=doctype)
+
+def format_report(report):
+    """One line per doctype"""
+    lines = []
+    for doctype, diff in report.items():
+        if diff.get("skipped"):
+            lines.append(f"{doctype}: skipped, doctype not installed")
+            continue
+
+        line = f"{doctype}: {diff['existing']} existing, {len(diff['created'])} created"
+        if diff["created"]:
+            line += " (" + ", ".join(diff["created"]) + ")"
+        if diff["failed"]:
+            line += f", {len(diff['failed'])} failed (" + ", ".join(diff["failed"]) + ")"
+        if diff["drift"]:
+            line += ", differs: " + ", ".join(diff["drift"])
+        lines.append(line)
+
+    return lines
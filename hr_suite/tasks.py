@@ -1,53 +1,52 @@
 import frappe
-from frappe.utils import today, add_days
+from frappe.utils import add_days
+from hr_suite.api.performance import instrument
 
+@instrument
 def daily_hr_reminders():
     """Send daily HR reminders"""
     
-    # Birthday reminders
-    send_birthday_reminders()
+    # Birthday, probation ending and leave balance reminders run per shard of
+    # employees on the long queue, see hr_suite.api.reminders
+    from hr_suite.api.reminders import dispatch_reminders
     
-    # Probation ending reminders
-    send_probation_reminders()
-    
-    # Leave balance reminders
-    send_leave_balance_reminders()
+    dispatch_reminders()
 
-def send_birthday_reminders():
+@instrument
+def send_birthday_reminders(date, employees):
     """Send birthday wishes"""
-    from datetime import datetime
-    
-    today_date = datetime.now().strftime("%m-%d")
+    from hr_suite.api.birthday import get_birthdays
     
-    employees = frappe.get_all("Employee",
-        filters={
-            "status": "Active",
-            "date_of_birth": ["like", f"%{today_date}"]
-        },
-        fields=["name", "employee_name", "company_email"]
-    )
+    birthdays = get_birthdays(date, 0, fields=["name", "employee_name", "company_email"], employees=employees)
     
-    for emp in employees:
+    for emp in birthdays:
         # Send birthday email to HR and employee
         pass
+    
+    return len(birthdays)
 
-def send_probation_reminders():
+@instrument
+def send_probation_reminders(date, employees):
     """Remind HR about probation ending"""
-    upcoming_date = add_days(today(), 7)
+    upcoming_date = add_days(date, 7)
     
-    employees = frappe.get_all("Employee",
+    probation_ending = frappe.get_all("Employee",
         filters={
+            "name": ["in", employees],
             "status": "Active",
             "final_confirmation_date": upcoming_date
         },
         fields=["name", "employee_name"]
     )
     
-    if employees:
+    if probation_ending:
         # Notify HR Manager
         pass
+    
+    return len(probation_ending)
 
-def send_leave_balance_reminders():
+@instrument
+def send_leave_balance_reminders(date, employees):
     """Remind employees about leave balance"""
     # Logic to send quarterly leave balance reminders
-    pass
\ No newline at end of file
+    return 0
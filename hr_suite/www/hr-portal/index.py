@@ -0,0 +1,17 @@
+import frappe
+from frappe import _
+from hr_suite.api.portal import get_portal_data
+
+no_cache = 1
+
+def get_context(context):
+    if frappe.session.user == "Guest":
+        frappe.local.flags.redirect_location = "/login?redirect-to=/hr-portal"
+        raise frappe.Redirect
+
+    # Same cached context as the `get_portal_context` API
+    portal = get_portal_data()
+    context.portal = portal["data"]
+    context.etag = portal["etag"]
+    context.title = _("Employee Portal")
+    return context